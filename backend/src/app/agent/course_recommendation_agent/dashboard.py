@@ -1,6 +1,8 @@
 # dashboard.py
 """
-Generate statistics & simple dashboard artifacts from employee_insights table.
+Generate statistics & simple dashboard artifacts from employee_insights table
+(its typed leadership columns and the exploded insight_* tables, so no JSON
+is decoded here).
 
 Produces:
  - printed summary statistics
@@ -8,18 +10,28 @@ Produces:
  - basic matplotlib plots saved as PNG under ./reports/plots/
  - a JSON summary file ./reports/summary.json
 
+Each artifact declares the statistics it is built from; artifacts whose
+inputs hash the same as on the previous run (recorded in
+./reports/.build_state.json) are not rewritten, and stale plots render in a
+process pool.
+
 Usage:
     python dashboard.py
+    python -m app.agent.course_recommendation_agent.dashboard --snapshot   # latest Parquet snapshot
+    python -m app.agent.course_recommendation_agent.dashboard --force      # rebuild every artifact
 """
 
+import hashlib
 import json
+import os
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from collections import Counter, defaultdict
-import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # -------------------------
 # Configuration
@@ -28,6 +40,8 @@ BASE_DIR = Path(__file__).resolve().parents[2] / "data" / "database"
 DB_PATH = BASE_DIR / "app.db"
 REPORT_DIR = Path(__file__).resolve().parent / "reports"
 PLOTS_DIR = REPORT_DIR / "plots"
+BUILD_STATE_FILE = ".build_state.json"
+PLOT_WORKERS = min(4, os.cpu_count() or 1)
 REPORT_DIR.mkdir(parents=True, exist_ok=True)
 PLOTS_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -44,87 +58,86 @@ def safe_json_load(s, default):
     except Exception:
         return default
 
-def top_n(counter, n=10):
-    return counter.most_common(n)
+def count_items(items: pd.Series, n: Optional[int] = None) -> List[Tuple[Any, int]]:
+    """
+    (value, count) pairs, most common first; ties keep first-seen order
+    like Counter.most_common.
+    """
+    items = items.dropna()
+    if items.empty:
+        return []
+    counts = items.groupby(items, sort=False).size().sort_values(ascending=False, kind="stable")
+    if n is not None:
+        counts = counts.head(n)
+    return [(value, int(count)) for value, count in counts.items()]
 
 # -------------------------
 # Load data from DB
 # -------------------------
-def load_insights_table(db_path: Path) -> pd.DataFrame:
+# Columns the dashboard reads; leadership comes from the typed columns
+DASHBOARD_COLUMNS = [
+    "id", "name", "department_id", "role", "level", "years_with_company",
+    "leadership_score", "leadership_category",
+]
+# Exploded list columns: frame key -> (insight_* table / snapshot table, columns)
+CHILD_TABLES = {
+    "skills": ("insight_skills", ["employee_id", "position", "skill"]),
+    "goals": ("insight_goals", ["employee_id", "position", "goal"]),
+    "courses": ("insight_courses", ["employee_id", "course_id"]),
+    "recommendations": ("insight_recommendations", ["employee_id", "position", "title"]),
+}
+
+
+def load_insights_tables(db_path: Path, snapshot: Optional[Path] = None) -> Dict[str, pd.DataFrame]:
+    """
+    employee_insights rows ("insights") and their insight_* child rows (keyed as
+    CHILD_TABLES), from the database or from a Parquet snapshot directory (see
+    app.services.insights_snapshot) when `snapshot` is given.
+    """
+    if snapshot is not None:
+        from app.services.insights_snapshot import load_frame
+
+        frames = {"insights": load_frame("insights", columns=DASHBOARD_COLUMNS, snapshot=snapshot, arrow_dtypes=False)}
+        for key, (_, columns) in CHILD_TABLES.items():
+            frames[key] = load_frame(key, columns=columns, snapshot=snapshot, arrow_dtypes=False)
+        return frames
     conn = sqlite3.connect(str(db_path))
-    df = pd.read_sql_query("SELECT * FROM employee_insights", conn)
-    conn.close()
-    return df
+    try:
+        frames = {"insights": pd.read_sql_query(f"SELECT {', '.join(DASHBOARD_COLUMNS)} FROM employee_insights", conn)}
+        for key, (table, columns) in CHILD_TABLES.items():
+            order = "employee_id, position" if "position" in columns else "employee_id"
+            frames[key] = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order}", conn)
+    finally:
+        conn.close()
+    return frames
 
 # -------------------------
 # Extract & normalize columns
 # -------------------------
-def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
-    # Parse JSON columns into Python structures
-    df = df.copy()
+def _lists(child: pd.DataFrame, column: str, ids: pd.Series) -> pd.Series:
+    """Per-employee lists of `column` (in position order), aligned to `ids`."""
+    if "position" in child.columns:
+        child = child.sort_values(["employee_id", "position"], kind="stable")
+    grouped = child.groupby("employee_id", sort=False)[column].agg(list)
+    return ids.map(grouped).map(lambda x: x if isinstance(x, list) else [])
 
-    df["skills_list"] = df["skills"].apply(lambda s: safe_json_load(s, []))
-    df["goals_list"] = df["goals"].apply(lambda s: safe_json_load(s, []))
-    df["courses_enrolled_map"] = df["courses_enrolled"].apply(lambda s: safe_json_load(s, {}))
-    df["courses_recommended"] = df["courses_recommended_json"].apply(lambda s: safe_json_load(s, []))
 
-    # leadership_json may be stored as JSON string; parse it
-    df["leadership_obj"] = df["leadership_json"].apply(lambda s: safe_json_load(s, {}))
+def normalize_df(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """One row per employee with list columns built from the insight_* rows."""
+    df = frames["insights"].copy()
 
-    # career pathway
-    df["career_obj"] = df["career_pathway_json"].apply(lambda s: safe_json_load(s, {}))
+    df["skills_list"] = _lists(frames["skills"], "skill", df["id"])
+    df["goals_list"] = _lists(frames["goals"], "goal", df["id"])
+    df["courses_enrolled_list"] = _lists(frames["courses"], "course_id", df["id"])
+    df["courses_recommended"] = _lists(frames["recommendations"], "title", df["id"])
 
     # Derived counts
-    df["n_skills"] = df["skills_list"].apply(lambda x: len(x) if isinstance(x, list) else 0)
-    df["n_goals"] = df["goals_list"].apply(lambda x: len(x) if isinstance(x, list) else 0)
-    df["n_courses_enrolled"] = df["courses_enrolled_map"].apply(lambda d: len(d) if isinstance(d, dict) else 0)
-    df["n_courses_recommended"] = df["courses_recommended"].apply(lambda x: len(x) if isinstance(x, list) else 0)
-
-    # Extract leadership category / score if present
-    def leadership_category(obj):
-        if not isinstance(obj, dict):
-            return None
-        # try common keys
-        for k in ("potential_category", "potential_level", "potential"):
-            val = obj.get(k)
-            if isinstance(val, str) and val.strip():
-                return val
-        # fallback: check nested keys
-        if "overall_potential_score" in obj:
-            score = obj.get("overall_potential_score")
-            try:
-                s = float(score)
-                if s >= 7.5:
-                    return "High"
-                if s >= 4.0:
-                    return "Mid"
-                return "Low"
-            except Exception:
-                pass
-        # fallback None
-        return None
-
-    def leadership_score(obj):
-        if not isinstance(obj, dict):
-            return None
-        # try to extract numeric overall_score / overall_potential_score
-        for key in ("overall_score", "overall_potential_score"):
-            if key in obj:
-                try:
-                    return float(obj.get(key))
-                except Exception:
-                    pass
-        # try flattened leadership_score.overall_score
-        if "leadership_score" in obj and isinstance(obj["leadership_score"], dict):
-            try:
-                return float(obj["leadership_score"].get("overall_score"))
-            except Exception:
-                pass
-        return None
-
-    df["leadership_category"] = df["leadership_obj"].apply(leadership_category)
-    df["leadership_score"] = df["leadership_obj"].apply(leadership_score)
+    df["n_skills"] = df["skills_list"].str.len()
+    df["n_goals"] = df["goals_list"].str.len()
+    df["n_courses_enrolled"] = df["courses_enrolled_list"].str.len()
+    df["n_courses_recommended"] = df["courses_recommended"].str.len()
 
+    df["leadership_score"] = pd.to_numeric(df["leadership_score"], errors="coerce")
     return df
 
 # -------------------------
@@ -138,70 +151,31 @@ def compute_statistics(df: pd.DataFrame) -> dict:
     stats["department_count"] = df["department_id"].value_counts().to_dict()
     stats["level_count"] = df["level"].value_counts().to_dict()
 
-    # Skills: flatten skill lists and count
-    skill_counter = Counter()
-    for skills in df["skills_list"]:
-        if not isinstance(skills, list):
-            continue
-        skill_counter.update(skills)
-    stats["top_skills"] = top_n(skill_counter, 30)
-
-    # Goals: simple keyword counting (by exact goal string)
-    goal_counter = Counter()
-    for goals in df["goals_list"]:
-        if not isinstance(goals, list):
-            continue
-        goal_counter.update(goals)
-    stats["top_goals"] = top_n(goal_counter, 30)
+    # Skills / goals: explode the lists and count exact strings
+    stats["top_skills"] = count_items(df["skills_list"].explode(), 30)
+    stats["top_goals"] = count_items(df["goals_list"].explode(), 30)
 
     # Courses enrolled popularity
-    enrolled_counter = Counter()
-    for cmap in df["courses_enrolled_map"]:
-        if isinstance(cmap, dict):
-            for course_id_or_name, status in cmap.items():
-                enrolled_counter[course_id_or_name] += 1
-    stats["top_enrolled_courses"] = top_n(enrolled_counter, 30)
-
-    # Courses recommended popularity (by title if provided)
-    rec_course_counter = Counter()
-    for recs in df["courses_recommended"]:
-        if isinstance(recs, list):
-            for rec in recs:
-                # rec might be dict with title or string
-                if isinstance(rec, dict):
-                    title = rec.get("title") or rec.get("name") or rec.get("id")
-                    if title:
-                        rec_course_counter[title] += 1
-                elif isinstance(rec, str):
-                    rec_course_counter[rec] += 1
-    stats["top_recommended_courses"] = top_n(rec_course_counter, 30)
-
-    # Leadership potential distribution
-    leadership_counter = Counter()
-    for cat in df["leadership_category"]:
-        if cat:
-            leadership_counter[cat] += 1
-        else:
-            leadership_counter["Unknown"] += 1
-    stats["leadership_distribution"] = dict(leadership_counter)
+    stats["top_enrolled_courses"] = count_items(df["courses_enrolled_list"].explode(), 30)
+
+    # Courses recommended popularity (by title)
+    stats["top_recommended_courses"] = count_items(df["courses_recommended"].explode(), 30)
+
+    # Leadership potential distribution (first-seen order)
+    categories = df["leadership_category"].fillna("")
+    categories = categories.where(categories != "", "Unknown")
+    stats["leadership_distribution"] = {
+        category: int(count) for category, count in categories.groupby(categories, sort=False).size().items()
+    }
 
     # Who are high potential (if category or score)
-    high_potential = []
-    for _, row in df.iterrows():
-        cat = row.get("leadership_category")
-        score = row.get("leadership_score")
-        if (isinstance(cat, str) and cat.lower().startswith("h")) or (isinstance(score, (int, float)) and score >= 7.5):
-            high_potential.append({
-                "id": row["id"],
-                "name": row["name"],
-                "role": row["role"],
-                "department": row["department_id"],
-                "level": row["level"],
-                "years_with_company": row.get("years_with_company"),
-                "leadership_score": score,
-                "leadership_category": cat
-            })
-    stats["high_potential_employees"] = high_potential
+    category_high = df["leadership_category"].map(lambda c: isinstance(c, str) and c.lower().startswith("h"))
+    score_high = df["leadership_score"] >= 7.5
+    high_potential = df.loc[category_high | score_high].rename(columns={"department_id": "department"})
+    stats["high_potential_employees"] = high_potential.reindex(columns=[
+        "id", "name", "role", "department", "level", "years_with_company",
+        "leadership_score", "leadership_category",
+    ]).to_dict(orient="records")
 
     # Seniority: top N by years_with_company
     top_senior = df.sort_values("years_with_company", ascending=False).head(10)[
@@ -228,7 +202,17 @@ def compute_statistics(df: pd.DataFrame) -> dict:
 # -------------------------
 # Plotting helpers
 # -------------------------
+def _pyplot():
+    # Headless backend; plots also render in worker processes
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
 def plot_bar(counter_items, title, xlabel, ylabel, out_path: Path, top_n_items=10):
+    plt = _pyplot()
     labels = [str(k) for k, _ in counter_items[:top_n_items]]
     values = [v for _, v in counter_items[:top_n_items]]
 
@@ -243,6 +227,7 @@ def plot_bar(counter_items, title, xlabel, ylabel, out_path: Path, top_n_items=1
     plt.close()
 
 def plot_horizontal_bar_from_df(df, x_col, y_col, title, out_path: Path, top_n_items=10):
+    plt = _pyplot()
     df_sorted = df.sort_values(by=y_col, ascending=True).tail(top_n_items)
     plt.figure(figsize=(10, 6))
     plt.barh(df_sorted[x_col].astype(str), df_sorted[y_col])
@@ -252,16 +237,137 @@ def plot_horizontal_bar_from_df(df, x_col, y_col, title, out_path: Path, top_n_i
     plt.savefig(out_path)
     plt.close()
 
+# -------------------------
+# Artifacts
+# -------------------------
+@dataclass(frozen=True)
+class Artifact:
+    """
+    One output file. `inputs` name the entries of the build inputs (statistics
+    keys, plus "employees" for the per-employee table) the artifact is rendered
+    from; `render(inputs, out_path)` must be a picklable module-level callable
+    so plots can run in worker processes.
+    """
+
+    filename: str
+    inputs: Tuple[str, ...]
+    render: Callable[[Dict[str, Any], Path], None]
+    plot: bool = False
+
+def _write_csv(inputs, out_path: Path, key: str):
+    pd.DataFrame(inputs[key]).to_csv(out_path, index=False)
+
+def _write_summary(inputs, out_path: Path):
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(inputs, f, indent=2, ensure_ascii=False)
+
+def _render_bar(inputs, out_path: Path, key: str, title: str, xlabel: str, top_n_items: Optional[int] = 15):
+    items = inputs[key]
+    items = list(items.items()) if isinstance(items, dict) else items
+    plot_bar(items, title, xlabel, "Count", out_path, top_n_items=top_n_items or len(items))
+
+def _render_most_senior(inputs, out_path: Path):
+    seniors_df = pd.DataFrame(inputs["most_senior"])
+    if not seniors_df.empty:
+        plot_horizontal_bar_from_df(seniors_df, "name", "years_with_company", "Most Senior Employees (years)", out_path, top_n_items=10)
+
+EMPLOYEE_SUMMARY_COLUMNS = ["id", "name", "department_id", "role", "level", "years_with_company", "n_skills", "n_goals", "n_courses_enrolled"]
+STATS_KEYS = (
+    "total_employees", "roles_count", "department_count", "level_count", "top_skills", "top_goals",
+    "top_enrolled_courses", "top_recommended_courses", "leadership_distribution",
+    "high_potential_employees", "most_senior", "role_analytics", "roles_lacking_skills",
+)
+
+ARTIFACTS = (
+    Artifact("employee_summary_table.csv", ("employees",), partial(_write_csv, key="employees")),
+    Artifact("high_potential_employees.csv", ("high_potential_employees",), partial(_write_csv, key="high_potential_employees")),
+    Artifact("role_analytics.csv", ("role_analytics",), partial(_write_csv, key="role_analytics")),
+    Artifact("summary.json", STATS_KEYS, _write_summary),
+    Artifact("top_skills.png", ("top_skills",), partial(_render_bar, key="top_skills", title="Top Skills (requested / present)", xlabel="Skill"), plot=True),
+    Artifact("top_recommended_courses.png", ("top_recommended_courses",), partial(_render_bar, key="top_recommended_courses", title="Top Recommended Courses", xlabel="Course"), plot=True),
+    Artifact("top_enrolled_courses.png", ("top_enrolled_courses",), partial(_render_bar, key="top_enrolled_courses", title="Top Enrolled Courses", xlabel="Course"), plot=True),
+    Artifact("leadership_distribution.png", ("leadership_distribution",), partial(_render_bar, key="leadership_distribution", title="Leadership Potential Distribution", xlabel="Category", top_n_items=None), plot=True),
+    Artifact("most_senior.png", ("most_senior",), _render_most_senior, plot=True),
+)
+
+def _input_hash(artifact: Artifact, inputs: Dict[str, Any]) -> str:
+    payload = {"filename": artifact.filename, "inputs": {key: inputs[key] for key in artifact.inputs}}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _load_state(path: Path) -> Dict[str, str]:
+    state = safe_json_load(path.read_text(encoding="utf-8"), {}) if path.exists() else {}
+    return state if isinstance(state, dict) else {}
+
+def _render(artifact: Artifact, inputs: Dict[str, Any], out_path: Path):
+    artifact.render({key: inputs[key] for key in artifact.inputs}, out_path)
+
+def build_artifacts(
+    inputs: Dict[str, Any],
+    report_dir: Path,
+    plots_dir: Path,
+    artifacts=ARTIFACTS,
+    force: bool = False,
+    workers: int = PLOT_WORKERS,
+) -> Dict[str, List[str]]:
+    """
+    Write the artifacts whose inputs changed since the last build.
+
+    Tables and the JSON summary are written in-process; stale plots render
+    in a process pool when there is more than one (`workers` <= 1 renders
+    them inline). An artifact whose file is missing is always rebuilt.
+
+    Returns:
+        {"built": [...], "skipped": [...]} file names.
+    """
+    state_path = report_dir / BUILD_STATE_FILE
+    state = {} if force else _load_state(state_path)
+    built, skipped, plots = [], [], []
+    new_state = {}
+    for artifact in artifacts:
+        out_path = (plots_dir if artifact.plot else report_dir) / artifact.filename
+        digest = _input_hash(artifact, inputs)
+        new_state[str(out_path)] = digest
+        if state.get(str(out_path)) == digest and out_path.exists():
+            skipped.append(artifact.filename)
+        elif artifact.plot:
+            plots.append((artifact, out_path))
+        else:
+            _render(artifact, inputs, out_path)
+            built.append(artifact.filename)
+
+    if len(plots) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(plots))) as pool:
+            futures = [
+                pool.submit(artifact.render, {key: inputs[key] for key in artifact.inputs}, out_path)
+                for artifact, out_path in plots
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for artifact, out_path in plots:
+            _render(artifact, inputs, out_path)
+    built.extend(artifact.filename for artifact, _ in plots)
+
+    state_path.write_text(json.dumps(new_state, indent=2), encoding="utf-8")
+    return {"built": built, "skipped": skipped}
+
 # -------------------------
 # Main generate function
 # -------------------------
-def generate_dashboard(db_path: Path, report_dir: Path, plots_dir: Path) -> dict:
-    df_raw = load_insights_table(db_path)
-    if df_raw.empty:
+def generate_dashboard(
+    db_path: Path,
+    report_dir: Path,
+    plots_dir: Path,
+    snapshot: Optional[Path] = None,
+    force: bool = False,
+    workers: int = PLOT_WORKERS,
+) -> dict:
+    frames = load_insights_tables(db_path, snapshot)
+    if frames["insights"].empty:
         print("No data found in employee_insights table.")
         return {}
 
-    df = normalize_df(df_raw)
+    df = normalize_df(frames)
 
     # If years_with_company not present compute or coerce to numeric
     if "years_with_company" not in df.columns:
@@ -270,30 +376,13 @@ def generate_dashboard(db_path: Path, report_dir: Path, plots_dir: Path) -> dict
 
     stats = compute_statistics(df)
 
-    # Save reports
-    df[["id", "name", "department_id", "role", "level", "years_with_company", "n_skills", "n_goals", "n_courses_enrolled"]].to_csv(
-        report_dir / "employee_summary_table.csv", index=False
-    )
-    pd.DataFrame(stats["high_potential_employees"]).to_csv(report_dir / "high_potential_employees.csv", index=False)
-    pd.DataFrame(stats["role_analytics"]).to_csv(report_dir / "role_analytics.csv", index=False)
-
-    # Save overall JSON summary
-    summary_path = report_dir / "summary.json"
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(stats, f, indent=2, ensure_ascii=False)
-
-    # Plots
-    plot_bar(stats["top_skills"], "Top Skills (requested / present)", "Skill", "Count", plots_dir / "top_skills.png", top_n_items=15)
-    plot_bar(stats["top_recommended_courses"], "Top Recommended Courses", "Course", "Count", plots_dir / "top_recommended_courses.png", top_n_items=15)
-    plot_bar(stats["top_enrolled_courses"], "Top Enrolled Courses", "Course", "Count", plots_dir / "top_enrolled_courses.png", top_n_items=15)
-    leadership_items = list(stats["leadership_distribution"].items())
-    plot_bar(leadership_items, "Leadership Potential Distribution", "Category", "Count", plots_dir / "leadership_distribution.png", top_n_items=len(leadership_items))
-    seniors_df = pd.DataFrame(stats["most_senior"])
-    if not seniors_df.empty:
-        plot_horizontal_bar_from_df(seniors_df, "name", "years_with_company", "Most Senior Employees (years)", plots_dir / "most_senior.png", top_n_items=10)
+    # Save reports and plots (only those whose inputs changed)
+    inputs = {**stats, "employees": df[EMPLOYEE_SUMMARY_COLUMNS].to_dict(orient="records")}
+    result = build_artifacts(inputs, report_dir, plots_dir, force=force, workers=workers)
 
     print(f"✅ Reports saved to: {report_dir}")
     print(f"✅ Plots saved to: {plots_dir}")
+    print(f"✅ {len(result['built'])} artifacts rebuilt, {len(result['skipped'])} unchanged")
 
     # Return the stats dict so it can be used directly
     return stats
@@ -303,7 +392,25 @@ def generate_dashboard(db_path: Path, report_dir: Path, plots_dir: Path) -> dict
 # Entrypoint
 # -------------------------
 if __name__ == "__main__":
-    print("Loading data from DB:", DB_PATH)
-    summary = generate_dashboard(DB_PATH, REPORT_DIR, PLOTS_DIR)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate dashboard reports from employee_insights.")
+    parser.add_argument(
+        "--snapshot", nargs="?", const="latest", default=None,
+        help="read a Parquet snapshot directory instead of the database (no value: latest)",
+    )
+    parser.add_argument("--force", action="store_true", help="rebuild every artifact, even if unchanged")
+    parser.add_argument("--workers", type=int, default=PLOT_WORKERS, help="processes rendering plots")
+    args = parser.parse_args()
+    snapshot = None
+    if args.snapshot == "latest":
+        from app.services.insights_snapshot import latest_snapshot
+
+        snapshot = latest_snapshot()
+    elif args.snapshot:
+        snapshot = Path(args.snapshot)
+
+    print("Loading data from:", snapshot or DB_PATH)
+    summary = generate_dashboard(DB_PATH, REPORT_DIR, PLOTS_DIR, snapshot, force=args.force, workers=args.workers)
     print("Done. Returning summary:\n")
     print(json.dumps(summary, indent=2))
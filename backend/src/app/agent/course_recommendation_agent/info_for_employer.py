@@ -1,120 +1,406 @@
 # info_for_employer.py
-import os
+"""
+Batch pipeline that fills the `employee_insights` table for the employer dashboard.
+
+For every employee it stores the profile, the employer-view leadership
+evaluation, the career pathway and course recommendations.
+
+- Employees are processed concurrently on a bounded thread pool.
+- LLM requests go through a token bucket so bursts stay under the quota.
+- Finished rows are upserted in batches; each batch also records per-employee
+  checkpoints, so a crashed run resumes where it stopped (`--resume`).
+- Progress and throughput are printed while the run is going.
+- Each row stores a fingerprint of its inputs (employee context, prompt and
+  model versions). With `--changed-only` only employees whose fingerprint
+  changed, or whose row is older than `--max-age-days`, are recomputed.
+- Rows are written through app.services.insight_records, which also stores
+  typed leadership columns and exploded insight_* child rows; each flush then
+  folds them into the analytics aggregates.
+
+Usage:
+    python -m app.agent.course_recommendation_agent.info_for_employer --workers 8 --rate 60
+    python -m app.agent.course_recommendation_agent.info_for_employer --resume
+    python -m app.agent.course_recommendation_agent.info_for_employer --changed-only --max-age-days 7
+"""
+import argparse
 import json
-import sqlite3
-from pathlib import Path
-from datetime import datetime
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-# Add project root to sys.path if needed
-import sys
-sys.path.insert(0, str(Path(__file__).parents[1]))
+from app.core.config import settings
+from app.core.db import connection
+from app.core.llm_cache import fingerprint
+from app.core.rate_limit import TokenBucket
+from app.services import insight_records, insights_aggregates
 
-# Import helper functions
-from tools import (
+from .main import (
+    DEPLOYMENT,
+    PROMPT_VERSIONS,
+    get_leadership_potential_employer,
+    get_career_pathway
+)
+from .tools import (
     get_employee_context,
-    recommend_courses_tool,
+    get_employee_contexts,
+    recommend_courses_batch,
     employee_repo
 )
-from main import (
-    get_leadership_potential_employer,
-    get_career_pathway
+
+INSIGHT_COLUMNS = (
+    "id", "name", "department_id", "role", "level", "years_with_company",
+    "skills", "goals", "courses_enrolled",
+    "leadership_json", "leadership_summary",
+    "career_pathway_json", "career_pathway_summary",
+    "courses_recommended_json",
+    "input_fingerprint", "refreshed_at",
 )
 
-# -----------------------------
-# SQLite DB connection setup
-# -----------------------------
-DB_PATH = Path(__file__).resolve().parents[2] / "data" / "database" / "app.db"
-DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # ensure folders exist
+DONE = "done"
+FAILED = "failed"
 
-print(f"Using DB path: {DB_PATH}")  # ✅ Debug line
 
-conn = sqlite3.connect(str(DB_PATH))
-cursor = conn.cursor()
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
-# -----------------------------
-# Create table (if not exists)
-# -----------------------------
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS employee_insights (
-    id TEXT PRIMARY KEY,
-    name TEXT,
-    department_id TEXT,
-    role TEXT,
-    level TEXT,
-    years_with_company REAL,
-    skills TEXT,
-    goals TEXT,
-    courses_enrolled TEXT,
-    leadership_json TEXT,
-    leadership_summary TEXT,
-    career_pathway_json TEXT,
-    career_pathway_summary TEXT,
-    courses_recommended_json TEXT
-)
-""")
-conn.commit()
 
 # -----------------------------
-# Fetch all employees
+# Per-employee work
 # -----------------------------
-all_employees = employee_repo.list_employees()
-print(f"Found {len(all_employees)} employees")
+def insight_fingerprint(context: dict) -> str:
+    """Hash of everything an insights row is computed from (points excluded)."""
+    profile = {k: v for k, v in context["profile"].items() if k != "points_current"}
+    return fingerprint({
+        "context": {**context, "profile": profile},
+        "prompts": {name: PROMPT_VERSIONS[name] for name in ("leadership_employer", "career_pathway")},
+        "model": DEPLOYMENT,
+    })
 
-for emp in all_employees:
-    emp_id = emp.get("id")
-    print(f"\n=== Processing Employee {emp_id} ===")
 
-    # --- Employee context ---
+def llm_requests_per_call() -> int:
+    """
+    LLM requests one agent call makes: the JSON stage plus the summary, or a
+    single request in single-pass mode (repair requests are not counted).
+    """
+    return 1 if settings.llm_single_pass else 2
+
+
+def build_insight_row(emp_id: str, courses: List[dict], limiter: Optional[TokenBucket] = None) -> Tuple:
+    """
+    Run the LLM evaluations for one employee and return the employee_insights row.
+
+    Raises:
+        RuntimeError: if an LLM stage returned no structured JSON, so the
+            employee is retried on resume instead of storing an empty result.
+    """
     context = get_employee_context(emp_id)
     profile = context["profile"]
-    skills = context["skills"]
-    goals = context["goals"]
-    courses_enrolled = context["courses_enrolled"]
 
-    # --- Years with company ---
-    hire_date = datetime.strptime(profile["hire_date"], "%Y-%m-%d")
-    years_with_company = (datetime.now() - hire_date).days / 365
+    hire_date_str = profile.get("hire_date")
+    hire_date = datetime.strptime(hire_date_str, "%Y-%m-%d") if hire_date_str else None
+    years_with_company = (datetime.now() - hire_date).days / 365 if hire_date else 0
 
-    # --- Leadership potential ---
+    requests = llm_requests_per_call()
+    if limiter is not None:
+        limiter.acquire(requests)
     leadership = get_leadership_potential_employer(emp_id)
-    leadership_json = json.dumps(leadership.get("json", {}))
-    leadership_summary = leadership.get("text_summary", "")
-
-    # --- Career pathway ---
+    if limiter is not None:
+        limiter.acquire(requests)
     career = get_career_pathway(emp_id)
-    career_pathway_json = json.dumps(career.get("json", {}))
-    career_pathway_summary = career.get("text_summary", "")
-
-    # --- Course recommendations ---
-    courses = recommend_courses_tool(skills)
-    courses_json = json.dumps(courses)
-
-    # --- Insert / replace into DB ---
-    cursor.execute("""
-        INSERT OR REPLACE INTO employee_insights (
-            id, name, department_id, role, level, years_with_company,
-            skills, goals, courses_enrolled,
-            leadership_json, leadership_summary,
-            career_pathway_json, career_pathway_summary,
-            courses_recommended_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+
+    for stage, result in (("leadership", leadership), ("career_pathway", career)):
+        if "json" not in result:
+            raise RuntimeError(f"{stage} returned no JSON: {result.get('error') or 'unparseable output'}")
+
+    return (
         emp_id,
         profile.get("name"),
         profile.get("department_id"),
         profile.get("role"),
         profile.get("level"),
         years_with_company,
-        json.dumps(skills),
-        json.dumps(goals),
-        json.dumps(courses_enrolled),
-        leadership_json,
-        leadership_summary,
-        career_pathway_json,
-        career_pathway_summary,
-        courses_json
-    ))
-    conn.commit()
-
-print("\n✅ All employee insights saved to 'employee_insights' table!")
-conn.close()
+        json.dumps(context["skills"]),
+        json.dumps(context["goals"]),
+        json.dumps(context["courses_enrolled"]),
+        json.dumps(leadership.get("json", {})),
+        leadership.get("text_summary", ""),
+        json.dumps(career.get("json", {})),
+        career.get("text_summary", ""),
+        json.dumps(courses),
+        insight_fingerprint(context),
+        _now(),
+    )
+
+
+# -----------------------------
+# Run bookkeeping / checkpoints
+# -----------------------------
+def _start_run(resume: Optional[str], total: int, db_url: Optional[str]) -> Tuple[str, set]:
+    """
+    Return (run_id, employee ids already done).
+
+    `resume` is a run id, "latest" for the most recent unfinished run, or None
+    for a fresh run.
+    """
+    with connection(db_url) as conn:
+        run_id = None
+        if resume == "latest":
+            row = conn.execute(
+                "SELECT run_id FROM employee_insights_runs WHERE status != ? "
+                "ORDER BY started_at DESC LIMIT 1",
+                (DONE,),
+            ).fetchone()
+            run_id = row[0] if row else None
+        elif resume:
+            run_id = resume
+
+        if run_id is None:
+            run_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO employee_insights_runs (run_id, status, total, started_at) VALUES (?, 'running', ?, ?)",
+                (run_id, total, _now()),
+            )
+            return run_id, set()
+
+        conn.execute(
+            "UPDATE employee_insights_runs SET status = 'running', total = ?, finished_at = NULL WHERE run_id = ?",
+            (total, run_id),
+        )
+        done = {
+            row[0]
+            for row in conn.execute(
+                "SELECT employee_id FROM employee_insights_checkpoints WHERE run_id = ? AND status = ?",
+                (run_id, DONE),
+            )
+        }
+        return run_id, done
+
+
+def _flush(run_id: str, rows: List[Tuple], checkpoints: List[Tuple], db_url: Optional[str]) -> None:
+    """
+    Upsert finished rows (with their typed columns and child rows), their
+    checkpoints and the analytics aggregates in one transaction.
+    """
+    if not rows and not checkpoints:
+        return
+    with connection(db_url) as conn:
+        if rows:
+            insight_records.upsert_insights(conn, (dict(zip(INSIGHT_COLUMNS, row)) for row in rows))
+            insights_aggregates.refresh(conn)
+        conn.executemany(
+            "INSERT OR REPLACE INTO employee_insights_checkpoints "
+            "(run_id, employee_id, status, error, duration_ms, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, *checkpoint) for checkpoint in checkpoints],
+        )
+
+
+def _finish_run(run_id: str, failed: int, db_url: Optional[str]) -> None:
+    with connection(db_url) as conn:
+        conn.execute(
+            "UPDATE employee_insights_runs SET status = ?, finished_at = ? WHERE run_id = ?",
+            (DONE if failed == 0 else FAILED, _now(), run_id),
+        )
+
+
+def _stale_employees(employee_ids: List[str], max_age_days: float, db_url: Optional[str]) -> List[str]:
+    """Employees with no row, a changed input fingerprint, or a row older than max_age_days."""
+    with connection(db_url) as conn:
+        stored = {
+            row[0]: (row[1], row[2])
+            for row in conn.execute("SELECT id, input_fingerprint, refreshed_at FROM employee_insights")
+        }
+    cutoff = (
+        (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat()
+        if max_age_days > 0 else None
+    )
+    contexts = get_employee_contexts(employee_ids)
+    stale = []
+    for emp_id in employee_ids:
+        previous_fingerprint, refreshed_at = stored.get(emp_id, (None, None))
+        if (
+            previous_fingerprint is None
+            or emp_id not in contexts
+            or (cutoff is not None and (refreshed_at or "") < cutoff)
+            or previous_fingerprint != insight_fingerprint(contexts[emp_id])
+        ):
+            stale.append(emp_id)
+    return stale
+
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+class _Progress:
+    def __init__(self, total: int, every_s: float = 10.0):
+        self.total = total
+        self.every_s = every_s
+        self.started = time.monotonic()
+        self._last = 0.0
+        self.succeeded = 0
+        self.failed = 0
+
+    @property
+    def finished(self) -> int:
+        return self.succeeded + self.failed
+
+    def report(self, force: bool = False) -> Dict[str, float]:
+        elapsed = time.monotonic() - self.started
+        per_min = self.finished / elapsed * 60 if elapsed > 0 else 0.0
+        remaining = self.total - self.finished
+        eta_s = remaining / (per_min / 60) if per_min else None
+        stats = {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 1),
+            "employees_per_min": round(per_min, 2),
+        }
+        if force or elapsed - self._last >= self.every_s:
+            self._last = elapsed
+            eta = f"{eta_s:.0f}s" if eta_s is not None else "?"
+            print(
+                f"[insights] {self.finished}/{self.total} "
+                f"(ok {self.succeeded}, failed {self.failed}) "
+                f"{per_min:.1f} employees/min, ETA {eta}"
+            )
+        return stats
+
+
+def run_pipeline(
+    *,
+    workers: Optional[int] = None,
+    rate_per_minute: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    resume: Optional[str] = None,
+    changed_only: bool = False,
+    max_age_days: Optional[float] = None,
+    employee_ids: Optional[Iterable[str]] = None,
+    db_url: Optional[str] = None,
+    build_row: Callable[..., Tuple] = build_insight_row,
+) -> Dict[str, object]:
+    """
+    Refresh employee_insights for every employee (or `employee_ids`).
+
+    Args:
+        workers: concurrent employees (default INSIGHTS_WORKERS).
+        rate_per_minute: LLM requests per minute; 0 disables the limit.
+        batch_size: rows per upsert transaction.
+        resume: run id or "latest" to skip employees a previous run finished.
+        changed_only: only recompute employees whose inputs changed since
+            their row was written, or whose row is older than max_age_days.
+        max_age_days: 0 disables the age limit (default INSIGHTS_MAX_AGE_DAYS).
+
+    Returns:
+        Run summary: run_id, counts, elapsed time and throughput.
+    """
+    workers = workers or settings.insights_workers
+    rate_per_minute = settings.insights_rate_per_minute if rate_per_minute is None else rate_per_minute
+    batch_size = max(1, batch_size or settings.insights_batch_size)
+
+    if employee_ids is None:
+        employee_ids = [emp.get("id") for emp in employee_repo.list_employees()]
+    employee_ids = list(employee_ids)
+    unchanged = 0
+    if changed_only:
+        max_age_days = settings.insights_max_age_days if max_age_days is None else max_age_days
+        stale = _stale_employees(employee_ids, max_age_days, db_url)
+        unchanged = len(employee_ids) - len(stale)
+        employee_ids = stale
+
+    run_id, already_done = _start_run(resume, len(employee_ids), db_url)
+    pending = [emp_id for emp_id in employee_ids if emp_id not in already_done]
+    print(
+        f"Run {run_id}: {len(employee_ids)} employees ({unchanged} unchanged skipped), "
+        f"{len(already_done)} already done, "
+        f"{len(pending)} to process with {workers} workers"
+    )
+
+    limiter = (
+        TokenBucket.per_minute(rate_per_minute, capacity=workers * llm_requests_per_call())
+        if rate_per_minute else None
+    )
+    # One batched embedding call + one FAISS search for every employee
+    all_recommendations = recommend_courses_batch(pending) if pending else {}
+
+    progress = _Progress(len(pending))
+    rows: List[Tuple] = []
+    checkpoints: List[Tuple] = []
+
+    def process(emp_id: str) -> Tuple[Tuple, int]:
+        started = time.monotonic()
+        row = build_row(emp_id, all_recommendations.get(emp_id, []), limiter)
+        return row, int((time.monotonic() - started) * 1000)
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="insights")
+    try:
+        futures = {pool.submit(process, emp_id): emp_id for emp_id in pending}
+        not_done = set(futures)
+        while not_done:
+            finished, not_done = wait(not_done, timeout=progress.every_s, return_when=FIRST_COMPLETED)
+            for future in finished:
+                emp_id = futures[future]
+                try:
+                    row, duration_ms = future.result()
+                    rows.append(row)
+                    checkpoints.append((emp_id, DONE, None, duration_ms, _now()))
+                    progress.succeeded += 1
+                except Exception as e:
+                    print(f"⚠️ Employee {emp_id} failed: {e}")
+                    checkpoints.append((emp_id, FAILED, str(e), None, _now()))
+                    progress.failed += 1
+            if len(checkpoints) >= batch_size:
+                _flush(run_id, rows, checkpoints, db_url)
+                rows, checkpoints = [], []
+            progress.report()
+    finally:
+        # Keep whatever finished before an interrupt so --resume can skip it
+        _flush(run_id, rows, checkpoints, db_url)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    _finish_run(run_id, progress.failed, db_url)
+    summary = {
+        "run_id": run_id,
+        "skipped": len(already_done),
+        "unchanged": unchanged,
+        **progress.report(force=True),
+    }
+    if limiter is not None:
+        summary["rate_limited_s"] = round(limiter.waited_s, 1)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, object]:
+    parser = argparse.ArgumentParser(description="Refresh the employee_insights table.")
+    parser.add_argument("--workers", type=int, default=settings.insights_workers,
+                        help="employees processed concurrently")
+    parser.add_argument("--rate", type=float, default=settings.insights_rate_per_minute,
+                        help="LLM requests per minute (0 = unlimited)")
+    parser.add_argument("--batch-size", type=int, default=settings.insights_batch_size,
+                        help="rows per upsert transaction")
+    parser.add_argument("--resume", nargs="?", const="latest", default=None, metavar="RUN_ID",
+                        help="skip employees finished by RUN_ID (default: latest unfinished run)")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="only recompute employees whose inputs changed or whose row is too old")
+    parser.add_argument("--max-age-days", type=float, default=settings.insights_max_age_days,
+                        help="with --changed-only, also recompute rows older than this (0 = never)")
+    parser.add_argument("--employee", action="append", dest="employee_ids", metavar="EMP_ID",
+                        help="only process these employees (repeatable)")
+    args = parser.parse_args(argv)
+
+    summary = run_pipeline(
+        workers=args.workers,
+        rate_per_minute=args.rate,
+        batch_size=args.batch_size,
+        resume=args.resume,
+        changed_only=args.changed_only,
+        max_age_days=args.max_age_days,
+        employee_ids=args.employee_ids,
+    )
+    print(f"\n✅ Employee insights saved to 'employee_insights' table: {json.dumps(summary)}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,32 @@
 import os
 import json
 from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_openai import AzureChatOpenAI
 from langchain.agents import create_agent
 from .system_prompt import SYSTEM_PROMPT
+from .structured import (
+    CareerPathwayPayload,
+    CourseRecommendationsPayload,
+    LeadershipEmployeePayload,
+    LeadershipEmployerPayload,
+    envelope_instructions,
+    run_single_pass,
+)
 from .tools import get_employee_context, recommend_courses_tool
 # from system_prompt import SYSTEM_PROMPT
 # from tools import get_employee_context, recommend_courses_tool
 import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Callable, Iterator, List, Tuple
+
+from app.core.agent_registry import agent_registry
+from app.core.config import settings
+from app.core.llm_cache import llm_cache
+from app.core.llm_metrics import llm_metrics
+from app.core.singleflight import singleflight
 
 # Load environment variables from .env
 load_dotenv()
@@ -22,14 +40,54 @@ URL = f"https://psacodesprint2025.azure-api.net/openai/deployments/{DEPLOYMENT}/
 AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 os.environ["AZURE_OPENAI_ENDPOINT"] = URL
 
+class _TokenUsageCallback(BaseCallbackHandler):
+    """Report each LLM call's token usage to llm_metrics."""
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+        if not usage:
+            for generations in response.generations:
+                for generation in generations:
+                    metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    input_tokens += metadata.get("input_tokens", 0)
+                    output_tokens += metadata.get("output_tokens", 0)
+        llm_metrics.record_usage(input_tokens, output_tokens)
+
+
 # Initialize Azure LLM
+LLM_CONFIG = {"api_version": API_VERSION, "temperature": 0.3, "max_tokens": 500}
 llm = AzureChatOpenAI(
     azure_deployment=DEPLOYMENT,
-    api_version=API_VERSION,
-    temperature=0.3,
-    max_tokens=500
+    **LLM_CONFIG,
+    callbacks=[_TokenUsageCallback()],
 )
 
+# Bump a version whenever its prompt text changes so cached answers are not reused
+PROMPT_VERSIONS = {
+    "course_recommendations": 1,
+    "career_pathway": 1,
+    "leadership_employee": 1,
+    "leadership_employer": 1,
+}
+
+
+def _prompt_context(employee_id: str) -> dict:
+    """The parts of the employee context the prompts actually use (points excluded)."""
+    context = get_employee_context(employee_id)
+    profile = {k: v for k, v in context["profile"].items() if k != "points_current"}
+    return {**context, "profile": profile}
+
+
+def _llm_cached(function: str):
+    return llm_cache.memoize(
+        function,
+        prompt_version=PROMPT_VERSIONS[function],
+        model=DEPLOYMENT,
+        context_loader=_prompt_context,
+    )
+
 # ----------------------
 # Tool Wrappers
 # ----------------------
@@ -50,11 +108,34 @@ def recommend_courses_agent_tool(employee_skills: list) -> str:
 # ----------------------
 # Core Agent Logic
 # ----------------------
-def get_course_recommendations(employee_id: str) -> dict:
-    """
-    Given an employee_id, fetch their context and recommend suitable courses.
-    Returns both JSON output and a user-friendly natural language summary.
-    """
+def _agent(name: str, tools: list):
+    """Shared agent for this tool set / prompt / model config, built once per process."""
+    key = agent_registry.make_key(
+        tools=tools, system_prompt=SYSTEM_PROMPT, model=DEPLOYMENT, **LLM_CONFIG
+    )
+    return agent_registry.get(
+        key,
+        lambda: create_agent(model=llm, tools=tools, system_prompt=SYSTEM_PROMPT),
+        name=name,
+    )
+
+
+def _ai_content(response: dict) -> str:
+    """Content of the last AI message in an agent response ('' if there is none)."""
+    ai_message = next(
+        (msg for msg in reversed(response["messages"]) if msg.type == "ai"),
+        None
+    )
+    return ai_message.content if ai_message and ai_message.content else ""
+
+
+def _llm_text(prompt: str) -> str:
+    response = llm.invoke(prompt)
+    return response.content.strip() if hasattr(response, "content") else str(response)
+
+
+# ---- Course recommendations ----
+def _course_recommendations_prompt(employee_id: str) -> Tuple[str, dict]:
     print(f"=== Fetching Employee {employee_id} Context ===")
     emp_context = get_employee_context(employee_id)
     profile = emp_context["profile"]
@@ -77,13 +158,6 @@ def get_course_recommendations(employee_id: str) -> dict:
     print("\n--- Courses Enrolled ---")
     print(emp_context["courses_enrolled"] or "None")
 
-    # ---- Create the agent ----
-    agent = create_agent(
-        model=llm,
-        tools=[recommend_courses_agent_tool],
-        system_prompt=SYSTEM_PROMPT
-    )
-
     prompt = (
         f"Recommend relevant upskilling courses for {profile.get('name')}, "
         f"a {profile.get('level')} {profile.get('role')} in department {profile.get('department_id')}. "
@@ -92,47 +166,26 @@ def get_course_recommendations(employee_id: str) -> dict:
         f"Provide course suggestions that align with their role, level, and goals and possible skill gaps with their roles."
     )
 
-    print("\n=== Generating Course Recommendations ===")
+    return prompt, profile
 
-    response = agent.invoke({"messages": [{"role": "user", "content": prompt}]})
 
-    # ---- Extract AI message ----
-    try:
-        ai_message = next(
-            (msg for msg in reversed(response["messages"]) if msg.type == "ai"),
-            None
-        )
-        if not ai_message or not ai_message.content:
-            raise ValueError("No AI message content found in response")
-
-        # Parse structured JSON
-        parsed = json.loads(ai_message.content)
-
-        # --- Generate a human-readable summary ---
-        summary_prompt = (
-            "Convert the following JSON course recommendations into a friendly, natural summary "
-            "for the employee. For each course, include the url, the reason to learn (maybe how it can cover certain skill gaps) and the expected takeaway"
-            "Keep it concise and motivating, as if from a personal career coach:\n\n"
-            f"{json.dumps(parsed, indent=2)}"
-        )
-        summary_response = llm.invoke(summary_prompt)
-        summary_text = summary_response.content.strip() if hasattr(summary_response, "content") else str(summary_response)
+def _run_course_agent(prompt: str) -> str:
+    agent = _agent("course_recommendations", [recommend_courses_agent_tool])
+    print("\n=== Generating Course Recommendations ===")
+    return _ai_content(agent.invoke({"messages": [{"role": "user", "content": prompt}]}))
 
-        return {"json": parsed, "text_summary": summary_text}
 
-    except json.JSONDecodeError:
-        print("⚠️ Could not parse JSON from LLM output. Returning raw content.")
-        return {"raw_output": ai_message.content if ai_message else str(response)}
-    except Exception as e:
-        print(f"⚠️ Unexpected error while processing response: {e}")
-        return {"error": str(e), "raw_output": str(response)}
+def _course_recommendations_summary_prompt(parsed: dict, profile: dict) -> str:
+    return (
+        "Convert the following JSON course recommendations into a friendly, natural summary "
+        "for the employee. For each course, include the url, the reason to learn (maybe how it can cover certain skill gaps) and the expected takeaway"
+        "Keep it concise and motivating, as if from a personal career coach:\n\n"
+        f"{json.dumps(parsed, indent=2)}"
+    )
 
 
-def get_career_pathway(employee_id: str) -> dict:
-    """
-    Given an employee_id, analyze their context and recommend a personalized career pathway.
-    Returns both structured JSON and a natural language summary.
-    """
+# ---- Career pathway ----
+def _career_pathway_prompt(employee_id: str) -> Tuple[str, dict]:
     print(f"=== Fetching Employee {employee_id} Context ===")
     emp_context = get_employee_context(employee_id)
     profile = emp_context["profile"]
@@ -144,12 +197,6 @@ def get_career_pathway(employee_id: str) -> dict:
     print(f"Department: {profile.get('department_id')}")
     print(f"Goals: {', '.join(emp_context['goals']) or 'None'}")
 
-    agent = create_agent(
-        model=llm,
-        tools=[],
-        system_prompt=SYSTEM_PROMPT
-    )
-
     # ---- Force a structured JSON output ----
     prompt = f"""
     Create a personalized career development pathway for {profile.get('name')}, 
@@ -185,52 +232,27 @@ def get_career_pathway(employee_id: str) -> dict:
     }}
     """
 
-    print("\n=== Generating Career Pathway ===")
-    response = agent.invoke({"messages": [{"role": "user", "content": prompt}]})
-
-    try:
-        ai_message = next(
-            (msg for msg in reversed(response["messages"]) if msg.type == "ai"),
-            None
-        )
-        if not ai_message or not ai_message.content:
-            raise ValueError("No AI message content found in response")
-
-        parsed = json.loads(ai_message.content)
-
-        # --- Generate natural summary for display ---
-        summary_prompt = (
-            f"Write a clear, motivational summary based on this career pathway JSON. "
-            f"Describe the employee’s growth journey across short, mid, and long-term stages, "
-            f"highlighting skill growth, milestones, and how it supports their goals."
-            f"Reply as if you're talking to the employee directly\n\n"
-            f"{json.dumps(parsed, indent=2)}"
-        )
+    return prompt, profile
 
-        summary_response = llm.invoke(summary_prompt)
-        summary_text = (
-            summary_response.content.strip()
-            if hasattr(summary_response, "content")
-            else str(summary_response)
-        )
 
-        return {"json": parsed, "text_summary": summary_text}
+def _run_pathway_agent(prompt: str) -> str:
+    agent = _agent("career_pathway", [])
+    print("\n=== Generating Career Pathway ===")
+    return _ai_content(agent.invoke({"messages": [{"role": "user", "content": prompt}]}))
 
-    except json.JSONDecodeError:
-        print("⚠️ Could not parse JSON. Returning raw content.")
-        return {"raw_output": ai_message.content if ai_message else str(response)}
-    except Exception as e:
-        print(f"⚠️ Unexpected error while processing response: {e}")
-        return {"error": str(e), "raw_output": str(response)}
 
+def _career_pathway_summary_prompt(parsed: dict, profile: dict) -> str:
+    return (
+        f"Write a clear, motivational summary based on this career pathway JSON. "
+        f"Describe the employee’s growth journey across short, mid, and long-term stages, "
+        f"highlighting skill growth, milestones, and how it supports their goals."
+        f"Reply as if you're talking to the employee directly\n\n"
+        f"{json.dumps(parsed, indent=2)}"
+    )
 
-def get_leadership_potential_employee(employee_id: str) -> dict:
-    """
-    Analyze the employee's context and estimate their leadership potential
-    based on PSA's leadership values and employee attributes.
-    Returns both structured JSON and a natural-language explanation.
-    """
 
+# ---- Leadership potential (employee view) ----
+def _leadership_employee_prompt(employee_id: str) -> Tuple[str, dict]:
     print(f"=== Fetching Employee {employee_id} Context ===")
     emp_context = get_employee_context(employee_id)
     profile = emp_context["profile"]
@@ -310,46 +332,28 @@ def get_leadership_potential_employee(employee_id: str) -> dict:
         ]
     }}
     """
+    return prompt, profile
 
-    print("\n=== Predicting Leadership Potential ===")
-    response = llm.invoke(prompt)
-
-    # ------------------------------
-    # Parse and postprocess
-    # ------------------------------
-    try:
-        parsed = json.loads(response.content)
 
-        # --- Generate a motivational summary for UI ---
-        summary_prompt = f"""
-        You are a career coach speaking directly to {profile['name']}.
-        Summarize this leadership evaluation in a positive, constructive way.
-        Encourage them to grow their leadership potential by highlighting their strengths and next steps.
-        Use a professional yet motivating tone.
+def _run_leadership_employee(prompt: str) -> str:
+    print("\n=== Predicting Leadership Potential ===")
+    return _llm_text(prompt)
 
-        JSON:
-        {json.dumps(parsed, indent=2)}
-        """
 
-        summary_response = llm.invoke(summary_prompt)
-        summary_text = summary_response.content.strip() if hasattr(summary_response, "content") else str(summary_response)
+def _leadership_employee_summary_prompt(parsed: dict, profile: dict) -> str:
+    return f"""
+    You are a career coach speaking directly to {profile['name']}.
+    Summarize this leadership evaluation in a positive, constructive way.
+    Encourage them to grow their leadership potential by highlighting their strengths and next steps.
+    Use a professional yet motivating tone.
 
-        return {"json": parsed, "text_summary": summary_text}
+    JSON:
+    {json.dumps(parsed, indent=2)}
+    """
 
-    except json.JSONDecodeError:
-        print("⚠️ Could not parse JSON. Returning raw output.")
-        return {"raw_output": response.content}
-    except Exception as e:
-        print(f"⚠️ Error evaluating leadership potential: {e}")
-        return {"error": str(e), "raw_output": str(response)}
 
-def get_leadership_potential_employer(employee_id: str) -> dict:
-    """
-    Evaluate an employee's leadership potential from an employer's perspective.
-    Focuses on next-generation leadership readiness, alignment with PSA values,
-    and organizational fit. Returns both structured JSON and a concise summary
-    suitable for management dashboards.
-    """
+# ---- Leadership potential (employer view) ----
+def _leadership_employer_prompt(employee_id: str) -> Tuple[str, dict]:
     print(f"=== Fetching Employee {employee_id} Context ===")
     emp_context = get_employee_context(employee_id)
     profile = emp_context["profile"]
@@ -423,22 +427,16 @@ Return STRICTLY in JSON format:
     ]
 }}
 """
+    return prompt, profile
+
 
+def _run_leadership_employer(prompt: str) -> str:
     print("\n=== Evaluating Leadership Potential (Employer View) ===")
-    response = llm.invoke(prompt)
-    content = response.content.strip() if hasattr(response, "content") else str(response)
+    return _llm_text(prompt)
 
-    # ------------------------------
-    # Try to extract JSON safely
-    # ------------------------------
-    json_str_match = re.search(r"\{.*\}", content, re.DOTALL)
-    json_str = json_str_match.group(0) if json_str_match else content
 
-    try:
-        parsed = json.loads(json_str)
-
-        # --- Generate executive summary ---
-        summary_prompt = f"""
+def _leadership_employer_summary_prompt(parsed: dict, profile: dict) -> str:
+    return f"""
 You are summarizing leadership potential for HR executives.
 Write a concise, professional summary (3–5 sentences) highlighting:
 - Leadership readiness level (Low/Mid/High)
@@ -451,18 +449,222 @@ JSON data:
 {json.dumps(parsed, indent=2)}
 """
 
-        summary_response = llm.invoke(summary_prompt)
-        summary_text = summary_response.content.strip() if hasattr(summary_response, "content") else str(summary_response)
-
-        return {"json": parsed, "text_summary": summary_text}
 
+@dataclass(frozen=True)
+class _AgentFunction:
+    build_prompt: Callable[[str], Tuple[str, dict]]
+    run: Callable[[str], str]
+    summary_prompt: Callable[[dict, dict], str]
+    payload_model: type
+    # What the "summary" field should contain in single-pass mode
+    summary_instructions: str
+
+
+AGENT_FUNCTIONS = {
+    "course_recommendations": _AgentFunction(
+        _course_recommendations_prompt, _run_course_agent, _course_recommendations_summary_prompt,
+        CourseRecommendationsPayload,
+        "A friendly, concise summary for the employee, as if from a personal career coach: "
+        "for each course include the url, why to learn it and the expected takeaway.",
+    ),
+    "career_pathway": _AgentFunction(
+        _career_pathway_prompt, _run_pathway_agent, _career_pathway_summary_prompt,
+        CareerPathwayPayload,
+        "A clear, motivational summary addressed to the employee describing their growth "
+        "journey across the short, mid and long-term stages.",
+    ),
+    "leadership_employee": _AgentFunction(
+        _leadership_employee_prompt, _run_leadership_employee, _leadership_employee_summary_prompt,
+        LeadershipEmployeePayload,
+        "A positive, constructive summary addressed to the employee, highlighting strengths "
+        "and next steps to grow their leadership potential.",
+    ),
+    "leadership_employer": _AgentFunction(
+        _leadership_employer_prompt, _run_leadership_employer, _leadership_employer_summary_prompt,
+        LeadershipEmployerPayload,
+        "A concise, analytical 3-5 sentence summary for HR executives: readiness level, key "
+        "strengths, areas to develop and recommended employer actions.",
+    ),
+}
+
+
+def _json_stage(function: str, employee_id: str) -> dict:
+    """
+    First (structured) stage of the two-pass mode.
+    Returns {"json", "profile"} on success, otherwise {"raw_output"/"error": ...}
+    when the output cannot be parsed. Agent/LLM failures propagate.
+    """
+    spec = AGENT_FUNCTIONS[function]
+    prompt, profile = spec.build_prompt(employee_id)
+    content = spec.run(prompt)
+    if not content:
+        return {"error": "No AI message content found in response", "raw_output": ""}
+    json_str_match = re.search(r"\{.*\}", content, re.DOTALL)
+    try:
+        return {"json": json.loads(json_str_match.group(0) if json_str_match else content), "profile": profile}
     except json.JSONDecodeError:
-        print("⚠️ Could not parse JSON. Returning raw output.")
+        print("⚠️ Could not parse JSON from LLM output. Returning raw content.")
         return {"raw_output": content}
+
+
+def _with_summary(function: str, stage: dict) -> dict:
+    """Second stage of the two-pass mode: turn the parsed JSON into a natural-language summary."""
+    if "json" not in stage:
+        return stage
+    try:
+        summary_text = _llm_text(AGENT_FUNCTIONS[function].summary_prompt(stage["json"], stage["profile"]))
+        return {"json": stage["json"], "text_summary": summary_text}
     except Exception as e:
-        print(f"⚠️ Error evaluating leadership potential (employer view): {e}")
-        return {"error": str(e), "raw_output": str(response)}
+        print(f"⚠️ Unexpected error while generating summary: {e}")
+        return {"error": str(e), "raw_output": json.dumps(stage["json"])}
+
+
+def _single_pass(function: str, employee_id: str) -> Tuple[dict, int]:
+    """
+    One call returns payload + summary; only invalid parts are asked for again.
+    Unparseable or invalid output comes back as {"raw_output"/"error": ...};
+    agent/LLM failures propagate.
+    """
+    spec = AGENT_FUNCTIONS[function]
+    prompt, profile = spec.build_prompt(employee_id)
+    content = spec.run(prompt + envelope_instructions(spec.summary_instructions))
+    if not content:
+        return {"error": "No AI message content found in response", "raw_output": ""}, 0
+    return run_single_pass(
+        content,
+        spec.payload_model,
+        invoke=_llm_text,
+        summary_prompt=lambda parsed: spec.summary_prompt(parsed, profile),
+    )
+
+
+def _answer(function: str, employee_id: str) -> dict:
+    mode = "single_pass" if settings.llm_single_pass else "two_pass"
+    with llm_metrics.track(function, mode=mode) as run:
+        if mode == "single_pass":
+            result, repairs = _single_pass(function, employee_id)
+            run["repairs"] += repairs
+        else:
+            result = _with_summary(function, _json_stage(function, employee_id))
+        if "json" not in result:
+            run["failed"] += 1
+        return result
+
+
+@singleflight.coalesce("course_recommendations")
+@_llm_cached("course_recommendations")
+def get_course_recommendations(employee_id: str) -> dict:
+    """
+    Given an employee_id, fetch their context and recommend suitable courses.
+    Returns both JSON output and a user-friendly natural language summary.
+    """
+    return _answer("course_recommendations", employee_id)
+
+
+@singleflight.coalesce("career_pathway")
+@_llm_cached("career_pathway")
+def get_career_pathway(employee_id: str) -> dict:
+    """
+    Given an employee_id, analyze their context and recommend a personalized career pathway.
+    Returns both structured JSON and a natural language summary.
+    """
+    return _answer("career_pathway", employee_id)
+
+
+@singleflight.coalesce("leadership_employee")
+@_llm_cached("leadership_employee")
+def get_leadership_potential_employee(employee_id: str) -> dict:
+    """
+    Analyze the employee's context and estimate their leadership potential
+    based on PSA's leadership values and employee attributes.
+    Returns both structured JSON and a natural-language explanation.
+    """
+    return _answer("leadership_employee", employee_id)
+
+
+@singleflight.coalesce("leadership_employer")
+@_llm_cached("leadership_employer")
+def get_leadership_potential_employer(employee_id: str) -> dict:
+    """
+    Evaluate an employee's leadership potential from an employer's perspective.
+    Focuses on next-generation leadership readiness, alignment with PSA values,
+    and organizational fit. Returns both structured JSON and a concise summary
+    suitable for management dashboards.
+    """
+    return _answer("leadership_employer", employee_id)
+
+
+# ----------------------
+# Streaming variants (JSON first, then summary tokens)
+# ----------------------
+def _stream_with_summary(function: str, employee_id: str) -> Iterator[Tuple[str, dict]]:
+    """
+    Streaming always uses the two-pass mode.
+    Yield (event, data) pairs: "json" as soon as the structured stage is
+    parsed, "token" for each summary chunk from llm.stream, then "done" with
+    timings. A cached answer is replayed at once; unparseable output yields
+    "error". Concurrent streams for the same employee share one structured
+    call; each streams its own summary.
+    """
+    started = time.perf_counter()
+
+    def elapsed_ms() -> int:
+        return int((time.perf_counter() - started) * 1000)
+
+    key = llm_cache.make_key(
+        function, PROMPT_VERSIONS[function], DEPLOYMENT, _prompt_context(employee_id)
+    )
+    cached = llm_cache.lookup(key) if settings.llm_cache_enabled else None
+    if cached is not None:
+        yield "json", cached["json"]
+        yield "token", {"text": cached.get("text_summary", "")}
+        yield "done", {"cached": True, "total_ms": elapsed_ms()}
+        return
+
+    stage = singleflight.do((f"{function}:json_stage", employee_id), _json_stage, function, employee_id)
+    if "json" not in stage:
+        yield "error", stage
+        return
+    json_ms = elapsed_ms()
+    yield "json", stage["json"]
+
+    parts: List[str] = []
+    first_token_ms = None
+    try:
+        summary_prompt = AGENT_FUNCTIONS[function].summary_prompt(stage["json"], stage["profile"])
+        for chunk in llm.stream(summary_prompt):
+            text = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if not text:
+                continue
+            if first_token_ms is None:
+                first_token_ms = elapsed_ms()
+            parts.append(text)
+            yield "token", {"text": text}
+    except Exception as e:
+        print(f"⚠️ Summary stream failed: {e}")
+        yield "error", {"error": str(e)}
+        return
+
+    result = {"json": stage["json"], "text_summary": "".join(parts).strip()}
+    if settings.llm_cache_enabled:
+        llm_cache.set(
+            key, result, function=function, employee_id=employee_id,
+            model=DEPLOYMENT, prompt_version=PROMPT_VERSIONS[function],
+        )
+    yield "done", {
+        "cached": False,
+        "json_ms": json_ms,
+        "first_token_ms": first_token_ms,
+        "total_ms": elapsed_ms(),
+    }
+
+
+def stream_course_recommendations(employee_id: str) -> Iterator[Tuple[str, dict]]:
+    return _stream_with_summary("course_recommendations", employee_id)
+
 
+def stream_career_pathway(employee_id: str) -> Iterator[Tuple[str, dict]]:
+    return _stream_with_summary("career_pathway", employee_id)
 
 
 # ------------------------------
@@ -0,0 +1,168 @@
+# structured.py
+"""
+Single-pass structured output for the course recommendation agent.
+
+In single-pass mode one LLM call returns {"payload": <structured JSON>,
+"summary": <prose>}. The envelope is validated with Pydantic; if a part fails
+validation only that part is asked for again (repair), instead of redoing the
+whole request.
+"""
+import json
+import re
+from typing import Any, Callable, Dict, Generic, List, Literal, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, Field, ValidationError
+
+P = TypeVar("P", bound=BaseModel)
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+# ------------------------------
+# Payload schemas (mirror the JSON formats requested in the prompts)
+# ------------------------------
+class RecommendedCourse(BaseModel):
+    title: str
+    url: str = ""
+    reason: str = ""
+    matched_skills: List[str] = []
+    expected_outcome: str = ""
+
+
+class CourseRecommendationsPayload(BaseModel):
+    analysis: str
+    recommended_courses: List[RecommendedCourse]
+
+
+class PathwayStage(BaseModel):
+    duration: str
+    focus: List[str]
+    suggested_actions: List[str]
+    expected_outcomes: str
+
+
+class CareerPathwayStages(BaseModel):
+    short_term: PathwayStage
+    mid_term: PathwayStage
+    long_term: PathwayStage
+
+
+class CareerPathwayPayload(BaseModel):
+    analysis: str
+    career_pathway: CareerPathwayStages
+    role_transition: str
+
+
+class LeadershipScore(BaseModel):
+    experience_weight: float = Field(ge=0, le=10)
+    learning_engagement_weight: float = Field(ge=0, le=10)
+    soft_skills_alignment_weight: float = Field(ge=0, le=10)
+    overall_score: float = Field(ge=0, le=10)
+
+
+class LeadershipEmployeePayload(BaseModel):
+    leadership_analysis: str
+    leadership_score: LeadershipScore
+    potential_level: Literal["Low", "Mid", "High"]
+    recommendations: List[str]
+
+
+class LeadershipEmployerPayload(BaseModel):
+    leadership_summary: str
+    leadership_factors: Dict[str, Any]
+    overall_potential_score: float = Field(ge=0, le=10)
+    potential_category: Literal["Low", "Mid", "High"]
+    recommendations_for_employer: List[str]
+
+
+class SinglePassAnswer(BaseModel, Generic[P]):
+    payload: P
+    summary: str = Field(min_length=1)
+
+
+# ------------------------------
+# Prompting / parsing
+# ------------------------------
+def envelope_instructions(summary_instructions: str) -> str:
+    """Suffix asking for the structured payload and the summary in one JSON object."""
+    return (
+        "\n\nReturn ONE JSON object and nothing else, with exactly two keys:\n"
+        '- "payload": the JSON object described above\n'
+        f'- "summary": a string. {summary_instructions}\n'
+    )
+
+
+def _extract_json(text: str) -> Any:
+    match = _JSON_OBJECT_RE.search(text or "")
+    return json.loads(match.group(0) if match else text)
+
+
+def _error_lines(error: ValidationError, prefix: str = "") -> str:
+    return "\n".join(
+        f"- {prefix}{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def validate_payload(payload: Any, payload_model: Type[P]) -> Tuple[Optional[P], Optional[str]]:
+    try:
+        return payload_model.model_validate(payload), None
+    except ValidationError as e:
+        return None, _error_lines(e)
+
+
+def run_single_pass(
+    first_output: str,
+    payload_model: Type[P],
+    invoke: Callable[[str], str],
+    summary_prompt: Callable[[dict], str],
+) -> Tuple[dict, int]:
+    """
+    Validate a single-pass answer and repair only the parts that fail.
+
+    Args:
+        first_output: text returned by the single-pass call.
+        payload_model: schema for the structured payload.
+        invoke: prompt -> text, used for repair calls.
+        summary_prompt: builds the two-pass summary prompt from a payload,
+            used when only the summary is missing or invalid.
+
+    Returns:
+        ({"json": ..., "text_summary": ...} or {"error"/"raw_output": ...}, repairs made)
+    """
+    repairs = 0
+    try:
+        envelope = _extract_json(first_output)
+    except (json.JSONDecodeError, TypeError):
+        envelope = None
+    if not isinstance(envelope, dict):
+        return {"raw_output": first_output}, repairs
+
+    try:
+        answer = SinglePassAnswer[payload_model].model_validate(envelope)
+        return {"json": answer.payload.model_dump(), "text_summary": answer.summary.strip()}, repairs
+    except ValidationError:
+        pass
+
+    raw_payload = envelope.get("payload", envelope)
+    payload, errors = validate_payload(raw_payload, payload_model)
+    if payload is None:
+        repairs += 1
+        fixed_text = invoke(
+            "The JSON below does not match the required schema.\n"
+            f"Validation errors:\n{errors}\n\n"
+            "Return ONLY the corrected JSON object (no extra text), keeping every valid field unchanged.\n\n"
+            f"{json.dumps(raw_payload, indent=2)}"
+        )
+        try:
+            payload, errors = validate_payload(_extract_json(fixed_text), payload_model)
+        except (json.JSONDecodeError, TypeError):
+            payload = None
+        if payload is None:
+            return {"error": f"Structured output failed validation: {errors}", "raw_output": first_output}, repairs
+
+    parsed = payload.model_dump()
+    summary = envelope.get("summary")
+    if not isinstance(summary, str) or not summary.strip():
+        repairs += 1
+        summary = invoke(summary_prompt(parsed))
+    return {"json": parsed, "text_summary": summary.strip()}, repairs
@@ -4,13 +4,15 @@ import sys
 import sqlite3
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 
+import numpy as np
+
 # LangChain imports
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
-from langchain_openai.embeddings.azure import AzureOpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 
 # Add src to path
 src_root = Path(__file__).parents[3]
@@ -21,17 +23,19 @@ from app.data.repositories.course import CourseRepository
 from app.data.repositories.course_skill import CourseSkillRepository
 from app.data.repositories.skill import SkillRepository
 from app.data.repositories.employee import EmployeeRepository
+from app.data.repositories.embedding_cache import EmbeddingCacheRepository, text_hash
+from app.core.config import settings
+from app.core.db import connection
+from app.core.vectorstore import registry
+# Re-exported: agents and routes import the context builder from here
+from app.services.employee_context import get_employee_context, get_employee_contexts  # noqa: F401
+from app.agent.embeddings import EmbeddingSpec, build_embeddings
 
 # Load environment variables
 load_dotenv()
 import getpass
 import os
 
-# Correct configuration
-DEPLOYMENT = "text-embedding-3-small"      # deployment name in Azure
-API_VERSION = "2023-05-15"                 # API version
-AZURE_OPENAI_ENDPOINT = "https://psacodesprint2025.azure-api.net"  # base endpoint only
-
 # SQLite DB connection
 DB_PATH = Path(__file__).parents[2] / "data" / "database" / "app.db"
 conn = sqlite3.connect(str(DB_PATH))
@@ -44,90 +48,63 @@ employee_repo = EmployeeRepository(conn)
 
 # Optional: Persist FAISS index to disk
 FAISS_INDEX_PATH = Path(__file__).parents[2] / "data" / "database" / "course_vectorstore"
+# Records which embedding provider/model/dimension built the saved index
+INDEX_MANIFEST = "embedding.json"
+
+
+def _read_index_spec() -> Optional[EmbeddingSpec]:
+    try:
+        with open(FAISS_INDEX_PATH / INDEX_MANIFEST, "r", encoding="utf-8") as f:
+            return EmbeddingSpec(**json.load(f))
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _write_index_spec(spec: EmbeddingSpec) -> None:
+    with open(FAISS_INDEX_PATH / INDEX_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(spec.to_dict(), f)
 
 # ----------------------
 # Build / Load Vectorstore
 # ----------------------
-def get_employee_context(employee_id: str) -> dict:
+class CachedEmbeddings(Embeddings):
     """
-    Fetch a complete employee context (profile, readable skills, goals, courses).
+    Wraps an embeddings client with the persistent embedding_cache table.
+
+    Documents are looked up by (model, sha256(text)) and only cache misses hit
+    the network. Queries pass straight through and are never cached. The
+    cache is read through the pooled per-thread connection (DATABASE_URL),
+    since FAISS may call this from any thread.
     """
-    employee = employee_repo.get_employee(employee_id)
-    if not employee:
-        raise ValueError(f"Employee {employee_id} not found")
 
-    # --- Parse skills safely ---
-    skill_map_raw = employee.get("skills", "{}")
-    try:
-        skill_map = json.loads(skill_map_raw)
-    except (TypeError, json.JSONDecodeError):
-        skill_map = {}
-
-    skill_names = []
-    for skill_id in skill_map.keys():
-        skill = skill_repo.get_skill(skill_id)
-        if skill:
-            skill_names.append(skill["name"])
-
-    # --- Parse courses safely ---
-    courses_enrolled_raw = employee.get("courses_enrolled", "{}")
-    try:
-        courses_enrolled = json.loads(courses_enrolled_raw)
-    except (TypeError, json.JSONDecodeError):
-        courses_enrolled = {}
+    def __init__(self, inner: Embeddings, model: str, db_url: Optional[str] = None):
+        self.inner = inner
+        self.model = model
+        self.db_url = db_url
 
-    # --- Parse goals safely ---
-    goals_raw = employee.get("goals", "[]")
-    try:
-        goals = json.loads(goals_raw)
-    except (TypeError, json.JSONDecodeError):
-        goals = []
-
-    return {
-        "profile": {
-            "id": employee.get("id"),
-            "name": employee.get("name"),
-            "role": employee.get("role"),
-            "department_id": employee.get("department_id"),
-            "level": employee.get("level"),
-            "points_current": employee.get("points_current"),
-            "hire_date": employee.get("hire_date")
-        },
-        "skills": skill_names,
-        "goals": goals,
-        "courses_enrolled": courses_enrolled
-    }
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with connection(self.db_url) as cache_conn:
+            return EmbeddingCacheRepository(cache_conn).embed_with_cache(
+                self.model, texts, self.inner.embed_documents
+            )
 
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
 
-def build_or_load_vectorstore() -> FAISS:
-    # Initialize Azure OpenAI embeddings correctly
-    embeddings = AzureOpenAIEmbeddings(
-        model=DEPLOYMENT,
-        azure_deployment=DEPLOYMENT,
-        azure_endpoint=AZURE_OPENAI_ENDPOINT,
-        openai_api_version=API_VERSION,
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    )
-
-    if FAISS_INDEX_PATH.exists():
-        print("Loading existing FAISS vectorstore from disk...")
-        try:
-            vectorstore = FAISS.load_local(str(FAISS_INDEX_PATH), embeddings)
-            print("Vectorstore loaded successfully!")
-            return vectorstore
-        except Exception as e:
-            print(f"Failed to load vectorstore: {e}")
-            print("Rebuilding vectorstore...")
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Batch-embed search queries with the provider directly, bypassing the cache."""
+        return self.inner.embed_documents(texts)
 
-    print("Building new FAISS vectorstore from DB...")
-    courses = course_repo.list_courses() or []
 
-    texts = []
-    metadatas = []
+def _course_documents(db_conn: sqlite3.Connection) -> Dict[str, Document]:
+    """Build one Document per active course, keyed by course id."""
+    courses_repo = CourseRepository(db_conn, auto_sync=False)
+    skills_repo = CourseSkillRepository(db_conn, auto_sync=False)
 
-    for course in courses:
-        cid = course["id"]
-        skills = course_skill_repo.get_skills_for_course(cid) or []
+    documents: Dict[str, Document] = {}
+    for course in courses_repo.list_courses() or []:
+        cid = str(course["id"])
+        skills = skills_repo.get_skills_for_course(cid) or []
         skills_sorted = sorted(skills, key=lambda r: r.get("weight", 0), reverse=True)
         skill_names = [str(r.get("skill_name") or r.get("skill_id")) for r in skills_sorted]
 
@@ -137,33 +114,114 @@ def build_or_load_vectorstore() -> FAISS:
         page_content = "\n\n".join([p for p in content_parts if p])
 
         metadata = {
-            "id": str(cid),
+            "id": cid,
             "title": str(course.get("title") or ""),
             "url": str(course.get("url") or ""),
             "skills": skill_names,
             "domain": str(course.get("domain") or ""),
             "active": int(course.get("active") or 0),
+            # Lets the next sync tell which documents changed
+            "content_hash": text_hash(page_content),
         }
+        documents[cid] = Document(page_content=page_content, metadata=metadata)
+    return documents
 
-        texts.append(page_content)
-        metadatas.append(metadata)
 
-    # Build vectorstore from texts + metadatas
-    vectorstore = FAISS.from_texts(texts, embeddings, metadatas=metadatas)
+def sync_course_index(vectorstore: Optional[FAISS], documents: Dict[str, Document], embeddings: Embeddings):
+    """
+    Bring `vectorstore` in line with `documents`, touching only changed courses.
 
-    # Persist to disk
+    Removed or edited courses are deleted from the index by course id, new or
+    edited ones are embedded (through the cache) and added. Returns the
+    (possibly new) vectorstore and the number of documents changed.
+    """
+    indexed: Dict[str, Optional[str]] = {}
+    if vectorstore is not None:
+        for doc_id, doc in vectorstore.docstore._dict.items():
+            indexed[doc_id] = doc.metadata.get("content_hash")
+
+    stale = [
+        doc_id for doc_id, content_hash in indexed.items()
+        if doc_id not in documents or documents[doc_id].metadata["content_hash"] != content_hash
+    ]
+    fresh = [
+        doc for doc_id, doc in documents.items()
+        if indexed.get(doc_id) != doc.metadata["content_hash"]
+    ]
+
+    if stale:
+        vectorstore.delete(stale)
+    if fresh:
+        texts = [doc.page_content for doc in fresh]
+        vectors = embeddings.embed_documents(texts)
+        metadatas = [doc.metadata for doc in fresh]
+        ids = [doc.metadata["id"] for doc in fresh]
+        if vectorstore is None:
+            vectorstore = FAISS.from_embeddings(
+                list(zip(texts, vectors)), embeddings, metadatas=metadatas, ids=ids
+            )
+        else:
+            vectorstore.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas, ids=ids)
+    elif vectorstore is None:
+        raise ValueError("No active courses to index")
+
+    return vectorstore, len(set(stale) | {doc.metadata["id"] for doc in fresh})
+
+
+def build_or_load_vectorstore() -> FAISS:
+    # Provider comes from EMBEDDING_PROVIDER (azure | local | hashing)
+    provider, spec = build_embeddings()
+    embeddings = CachedEmbeddings(provider, model=spec.cache_key)
+
+    vectorstore = None
+    index_spec = _read_index_spec()
+    if FAISS_INDEX_PATH.exists() and index_spec != spec:
+        # Vectors from another provider/dimension are not comparable: rebuild
+        print(f"FAISS index was built with {index_spec}, expected {spec}; rebuilding...")
+    elif FAISS_INDEX_PATH.exists():
+        print("Loading existing FAISS vectorstore from disk...")
+        try:
+            # The index is written by this process only, so the pickle is trusted
+            vectorstore = FAISS.load_local(
+                str(FAISS_INDEX_PATH), embeddings, allow_dangerous_deserialization=True
+            )
+            print("Vectorstore loaded successfully!")
+        except Exception as e:
+            print(f"Failed to load vectorstore: {e}")
+            print("Rebuilding vectorstore from the embedding cache...")
+
+    # Runs on the registry's loader thread, so use a connection owned by it
+    db_conn = sqlite3.connect(str(DB_PATH))
+    try:
+        documents = _course_documents(db_conn)
+    finally:
+        db_conn.close()
+
+    vectorstore, changed = sync_course_index(vectorstore, documents, embeddings)
+    if vectorstore.index.d != spec.dimension:
+        raise ValueError(
+            f"Embedding dimension {vectorstore.index.d} does not match {spec.dimension} for {spec.provider}"
+        )
+    if not changed and index_spec == spec:
+        return vectorstore
+
+    print(f"Updated {changed} course documents in the FAISS vectorstore.")
     try:
         vectorstore.save_local(str(FAISS_INDEX_PATH))
-        print(f"Vectorstore saved to {FAISS_INDEX_PATH}")
+        _write_index_spec(spec)
+        print(f"Vectorstore saved to {FAISS_INDEX_PATH} ({spec.provider}/{spec.model}, dim={spec.dimension})")
     except Exception as e:
         print(f"Warning: Could not save vectorstore: {e}")
 
     return vectorstore
 
 # ----------------------
-# Load vectorstore once
+# Vectorstore handle (loaded on first use or by the startup warm-up task,
+# hot-reloaded when the index on disk changes)
 # ----------------------
-vectorstore = build_or_load_vectorstore()
+course_vectorstore = registry.register(
+    "courses", build_or_load_vectorstore, watch_path=FAISS_INDEX_PATH
+)
 
 # ----------------------
 # Recommendation Tool
@@ -173,6 +231,7 @@ def recommend_courses_tool(employee_skills: List[str], top_k: int = 3) -> List[D
     Given a list of employee skills, return top_k course recommendations using vector similarity.
     """
     query_text = " ".join(employee_skills)
+    vectorstore = course_vectorstore.get(timeout=settings.vectorstore_wait_timeout_s)
     docs = vectorstore.similarity_search(query_text, k=top_k)
 
     recommendations = []
@@ -185,6 +244,75 @@ def recommend_courses_tool(employee_skills: List[str], top_k: int = 3) -> List[D
         })
     return recommendations
 
+
+def _search_batch(vectorstore: FAISS, query_texts: List[str], top_k: int) -> List[List[tuple]]:
+    """
+    Embed all queries in one call and run a single FAISS search over the matrix.
+
+    Queries are one-off texts, so they skip the embedding cache (only course
+    documents are cached). Each hit is (Document, score) where score is the
+    raw L2 distance from the FAISS index: lower means more similar.
+    """
+    embeddings = vectorstore.embeddings
+    embed = embeddings.embed_queries if isinstance(embeddings, CachedEmbeddings) else embeddings.embed_documents
+    vectors = np.asarray(embed(query_texts), dtype=np.float32)
+    if getattr(vectorstore, "_normalize_L2", False):
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+    k = min(top_k, vectorstore.index.ntotal)
+    scores, indices = vectorstore.index.search(vectors, k)
+
+    results = []
+    for row_scores, row_indices in zip(scores, indices):
+        hits = []
+        for score, idx in zip(row_scores, row_indices):
+            if idx == -1:
+                continue
+            doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[idx])
+            hits.append((doc, float(score)))
+        results.append(hits)
+    return results
+
+
+def recommend_courses_batch(employee_ids: List[str], top_k: int = 3) -> Dict[str, List[Dict]]:
+    """
+    Course recommendations for many employees at once.
+
+    Contexts (employees + skill names) are loaded in bulk, all query texts are
+    embedded in one batched call, and FAISS is searched once with the query
+    matrix. Unknown employees are omitted from the result; employees without
+    skills get an empty list. Each recommendation's "score" is the raw FAISS
+    L2 distance (lower is better), best match first.
+    """
+    contexts = get_employee_contexts(employee_ids)
+
+    results: Dict[str, List[Dict]] = {}
+    queries: Dict[str, List[str]] = {}
+    for emp_id in employee_ids:
+        if emp_id not in contexts:
+            continue
+        names = contexts[emp_id]["skills"]
+        results[emp_id] = []
+        if names:
+            queries[emp_id] = names
+    if not queries:
+        return results
+
+    vectorstore = course_vectorstore.get(timeout=settings.vectorstore_wait_timeout_s)
+    hits = _search_batch(vectorstore, [" ".join(names) for names in queries.values()], top_k)
+    for (emp_id, names), emp_hits in zip(queries.items(), hits):
+        results[emp_id] = [
+            {
+                "id": doc.metadata.get("id"),
+                "title": doc.metadata["title"],
+                "url": doc.metadata["url"],
+                "skills": doc.metadata["skills"],
+                "reason": f"This course matches the employee's skills: {', '.join(names)}",
+                "score": score,
+            }
+            for doc, score in emp_hits
+        ]
+    return results
+
 # if __name__ == "__main__":
 #     from tools import get_employee_context, recommend_courses_tool
 
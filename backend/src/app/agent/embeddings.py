@@ -0,0 +1,149 @@
+"""
+Pluggable embedding providers for retrieval.
+
+Selected with EMBEDDING_PROVIDER:
+- "azure":   AzureOpenAIEmbeddings (network call per query)
+- "local":   sentence-transformers on CPU, batched, model loaded once per process
+- "hashing": deterministic feature-hashing embedder for tests and benchmarks
+
+Every provider comes with an EmbeddingSpec (provider, model, dimension) so an
+index can record what built it and be rebuilt when the provider changes.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+
+AZURE_DEPLOYMENT = "text-embedding-3-small"
+AZURE_API_VERSION = "2023-05-15"
+AZURE_OPENAI_ENDPOINT = "https://psacodesprint2025.azure-api.net"
+AZURE_DIMENSION = 1536
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class EmbeddingSpec:
+    provider: str
+    model: str
+    dimension: int
+
+    @property
+    def cache_key(self) -> str:
+        """Key for the embedding cache, so vectors from different providers never mix."""
+        return self.model if self.provider == "azure" else f"{self.provider}:{self.model}"
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embedder using signed feature hashing.
+
+    No model, no network: identical text always yields the identical unit
+    vector, and texts sharing words score as similar.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class LocalSentenceTransformerEmbeddings(Embeddings):
+    """CPU sentence-transformers embedder; the model is loaded on first use."""
+
+    _models: Dict[str, object] = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+
+    def _model(self):
+        model = self._models.get(self.model_name)
+        if model is None:
+            with self._models_lock:
+                model = self._models.get(self.model_name)
+                if model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    model = SentenceTransformer(self.model_name, device="cpu")
+                    self._models[self.model_name] = model
+        return model
+
+    @property
+    def dimension(self) -> int:
+        return int(self._model().get_sentence_embedding_dimension())
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        vectors = self._model().encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _azure_embeddings() -> Embeddings:
+    from langchain_openai.embeddings.azure import AzureOpenAIEmbeddings
+
+    return AzureOpenAIEmbeddings(
+        model=AZURE_DEPLOYMENT,
+        azure_deployment=AZURE_DEPLOYMENT,
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        openai_api_version=AZURE_API_VERSION,
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+    )
+
+
+def build_embeddings(provider: Optional[str] = None) -> Tuple[Embeddings, EmbeddingSpec]:
+    """
+    Instantiate the configured embedding provider.
+
+    Raises:
+        ValueError: for an unknown provider name.
+    """
+    provider = (provider or settings.embedding_provider).lower()
+    if provider == "azure":
+        return _azure_embeddings(), EmbeddingSpec("azure", AZURE_DEPLOYMENT, AZURE_DIMENSION)
+    if provider == "local":
+        embeddings = LocalSentenceTransformerEmbeddings(
+            settings.embedding_local_model, batch_size=settings.embedding_batch_size
+        )
+        return embeddings, EmbeddingSpec("local", embeddings.model_name, embeddings.dimension)
+    if provider == "hashing":
+        dimension = settings.embedding_hash_dim
+        return HashingEmbeddings(dimension), EmbeddingSpec("hashing", f"hash-{dimension}", dimension)
+    raise ValueError(f"Unknown embedding provider: {provider}")
@@ -3,7 +3,7 @@ import json
 from typing import List, Dict, Optional
 from pydantic import BaseModel, Field
 from langchain.tools import tool
-from app.core.db import get_connection
+from app.core.db import connection
 from app.data.repositories.employee import EmployeeRepository
 from app.data.repositories.mentorship_profile import MentorshipProfileRepository
 from app.services.mentoring_service import MentoringService
@@ -80,30 +80,30 @@ def find_available_mentors(
     Returns:
         List of mentor profiles matching the criteria with availability status
     """
-    conn = get_connection()
-    mentor_repo = MentorshipProfileRepository(conn)
-    
-    mentors = mentor_repo.get_available_mentors(
-        skill_area=skill_area,
-        department=department,
-        min_rating=min_rating
-    )
-    
-    # Transform to simpler dict format
-    result = []
-    for mentor in mentors:
-        result.append({
-            'employee_id': mentor['employee_id'],
-            'name': mentor.get('name', 'Unknown'),
-            'role': mentor.get('role', ''),
-            'department': mentor.get('department_id', ''),
-            'rating': mentor.get('rating', 0.0),
-            'capacity': mentor.get('capacity', 0),
-            'current_mentees': mentor.get('mentees_count', 0),
-            'available': mentor.get('mentees_count', 0) < mentor.get('capacity', 0)
-        })
-    
-    return result
+    with connection() as conn:
+        mentor_repo = MentorshipProfileRepository(conn)
+
+        mentors = mentor_repo.get_available_mentors(
+            skill_area=skill_area,
+            department=department,
+            min_rating=min_rating
+        )
+
+        # Transform to simpler dict format
+        result = []
+        for mentor in mentors:
+            result.append({
+                'employee_id': mentor['employee_id'],
+                'name': mentor.get('name', 'Unknown'),
+                'role': mentor.get('role', ''),
+                'department': mentor.get('department_id', ''),
+                'rating': mentor.get('rating', 0.0),
+                'capacity': mentor.get('capacity', 0),
+                'current_mentees': mentor.get('mentees_count', 0),
+                'available': mentor.get('mentees_count', 0) < mentor.get('capacity', 0)
+            })
+
+        return result
 
 
 @tool
@@ -123,28 +123,28 @@ def get_mentor_profile(employee_id: str) -> Optional[Dict]:
     if not employee_id:
         return None
     
-    conn = get_connection()
-    mentor_repo = MentorshipProfileRepository(conn)
-    employee_repo = EmployeeRepository(conn)
-    
-    mentor_profile = mentor_repo.get_profile(employee_id)
-    if not mentor_profile:
-        return None
-    
-    employee = employee_repo.get_employee(employee_id)
-    
-    # Combine mentor and employee data
-    return {
-        'employee_id': employee_id,
-        'name': employee.get('name', 'Unknown') if employee else 'Unknown',
-        'role': employee.get('role', '') if employee else '',
-        'department': employee.get('department_id', '') if employee else '',
-        'rating': mentor_profile.get('rating', 0.0),
-        'capacity': mentor_profile.get('capacity', 0),
-        'current_mentees': mentor_profile.get('mentees_count', 0),
-        'available': mentor_profile.get('mentees_count', 0) < mentor_profile.get('capacity', 0),
-        'personality': mentor_profile.get('personality', '')
-    }
+    with connection() as conn:
+        mentor_repo = MentorshipProfileRepository(conn)
+        employee_repo = EmployeeRepository(conn)
+
+        mentor_profile = mentor_repo.get_profile(employee_id)
+        if not mentor_profile:
+            return None
+
+        employee = employee_repo.get_employee(employee_id)
+
+        # Combine mentor and employee data
+        return {
+            'employee_id': employee_id,
+            'name': employee.get('name', 'Unknown') if employee else 'Unknown',
+            'role': employee.get('role', '') if employee else '',
+            'department': employee.get('department_id', '') if employee else '',
+            'rating': mentor_profile.get('rating', 0.0),
+            'capacity': mentor_profile.get('capacity', 0),
+            'current_mentees': mentor_profile.get('mentees_count', 0),
+            'available': mentor_profile.get('mentees_count', 0) < mentor_profile.get('capacity', 0),
+            'personality': mentor_profile.get('personality', '')
+        }
 
 
 @tool
@@ -163,26 +163,26 @@ def get_mentee_profile(employee_id: str) -> Optional[Dict]:
     if not employee_id:
         return None
     
-    conn = get_connection()
-    employee_repo = EmployeeRepository(conn)
-    
-    employee = employee_repo.get_employee(employee_id)
-    if not employee:
-        return None
-    
-    # Parse JSON fields
-    skills_map = json.loads(employee.get('skills_map', '{}')) if employee.get('skills_map') else {}
-    goals = json.loads(employee.get('goals_set', '[]')) if employee.get('goals_set') else []
-    
-    return {
-        'employee_id': employee_id,
-        'name': employee.get('name', 'Unknown'),
-        'role': employee.get('role', ''),
-        'department': employee.get('department_id', ''),
-        'level': employee.get('level', 'Junior'),
-        'current_skills': list(skills_map.keys()),
-        'career_goals': goals
-    }
+    with connection() as conn:
+        employee_repo = EmployeeRepository(conn)
+
+        employee = employee_repo.get_employee(employee_id)
+        if not employee:
+            return None
+
+        # Parse JSON fields
+        skills_map = json.loads(employee.get('skills_map', '{}')) if employee.get('skills_map') else {}
+        goals = json.loads(employee.get('goals_set', '[]')) if employee.get('goals_set') else []
+
+        return {
+            'employee_id': employee_id,
+            'name': employee.get('name', 'Unknown'),
+            'role': employee.get('role', ''),
+            'department': employee.get('department_id', ''),
+            'level': employee.get('level', 'Junior'),
+            'current_skills': list(skills_map.keys()),
+            'career_goals': goals
+        }
 
 
 @tool
@@ -210,19 +210,19 @@ def recommend_mentors(
     if not employee_id or not desired_skills:
         return []
     
-    conn = get_connection()
-    employee_repo = EmployeeRepository(conn)
-    mentor_repo = MentorshipProfileRepository(conn)
-    service = MentoringService(employee_repo, mentor_repo)
-    
-    recommendations = service.recommend_mentors(
-        employee_id=employee_id,
-        career_goals=career_goals,
-        desired_skills=desired_skills,
-        max_results=max_results
-    )
-    
-    return recommendations
+    with connection() as conn:
+        employee_repo = EmployeeRepository(conn)
+        mentor_repo = MentorshipProfileRepository(conn)
+        service = MentoringService(employee_repo, mentor_repo)
+
+        recommendations = service.recommend_mentors(
+            employee_id=employee_id,
+            career_goals=career_goals,
+            desired_skills=desired_skills,
+            max_results=max_results
+        )
+
+        return recommendations
 
 
 @tool
@@ -271,33 +271,33 @@ def get_mentorship_statistics(department: Optional[str] = None) -> Dict:
     Returns:
         Dictionary with total active pairs, available mentors, average scores, and trends
     """
-    conn = get_connection()
-    mentor_repo = MentorshipProfileRepository(conn)
-    
-    # Get all mentors
-    all_mentors = mentor_repo.list_profiles()
-    
-    if department:
-        # Filter would require join with employees - simplified for now
-        mentors = [m for m in all_mentors if m.get('is_mentor') == 1]
-    else:
-        mentors = [m for m in all_mentors if m.get('is_mentor') == 1]
-    
-    # Calculate statistics
-    total_mentors = len(mentors)
-    available_mentors = len([m for m in mentors if m.get('mentees_count', 0) < m.get('capacity', 0)])
-    total_active_pairs = sum(m.get('mentees_count', 0) for m in mentors)
-    avg_rating = sum(m.get('rating', 0.0) for m in mentors) / total_mentors if total_mentors > 0 else 0.0
-    
-    return {
-        "total_active_pairs": total_active_pairs,
-        "total_mentors": total_mentors,
-        "available_mentors": available_mentors,
-        "total_mentees_seeking": 0,  # Would need mentorship_matches table
-        "average_rating": round(avg_rating, 2),
-        "completion_rate": 85.0,  # Placeholder
-        "underserved_skills": []  # Would need skill gap analysis
-    }
+    with connection() as conn:
+        mentor_repo = MentorshipProfileRepository(conn)
+
+        # Get all mentors
+        all_mentors = mentor_repo.list_profiles()
+
+        if department:
+            # Filter would require join with employees - simplified for now
+            mentors = [m for m in all_mentors if m.get('is_mentor') == 1]
+        else:
+            mentors = [m for m in all_mentors if m.get('is_mentor') == 1]
+
+        # Calculate statistics
+        total_mentors = len(mentors)
+        available_mentors = len([m for m in mentors if m.get('mentees_count', 0) < m.get('capacity', 0)])
+        total_active_pairs = sum(m.get('mentees_count', 0) for m in mentors)
+        avg_rating = sum(m.get('rating', 0.0) for m in mentors) / total_mentors if total_mentors > 0 else 0.0
+
+        return {
+            "total_active_pairs": total_active_pairs,
+            "total_mentors": total_mentors,
+            "available_mentors": available_mentors,
+            "total_mentees_seeking": 0,  # Would need mentorship_matches table
+            "average_rating": round(avg_rating, 2),
+            "completion_rate": 85.0,  # Placeholder
+            "underserved_skills": []  # Would need skill gap analysis
+        }
 
 
 @tool
@@ -368,49 +368,49 @@ def identify_mentor_gaps(department: Optional[str] = None) -> List[Dict]:
     Returns:
         List of skill areas with demand/supply gap information
     """
-    conn = get_connection()
-    employee_repo = EmployeeRepository(conn)
-    mentor_repo = MentorshipProfileRepository(conn)
-    
-    # Get all employees and mentors
-    employees = employee_repo.list_employees()
-    mentors = mentor_repo.list_profiles()
-    
-    # Analyze skill demand vs supply
-    # This is a simplified version - full implementation would analyze goals_set
-    skill_demand = {}
-    skill_supply = {}
-    
-    # Count mentor supply by skill
-    for mentor in mentors:
-        if mentor.get('is_mentor') != 1:
-            continue
-        mentor_emp = employee_repo.get_employee(mentor['employee_id'])
-        if mentor_emp and mentor_emp.get('skills_map'):
-            skills = json.loads(mentor_emp['skills_map'])
-            for skill in skills.keys():
-                skill_supply[skill] = skill_supply.get(skill, 0) + 1
-    
-    # Count mentee demand (simplified - would parse goals for actual demand)
-    for emp in employees:
-        if emp.get('level') in ['Junior', 'Mid'] and emp.get('skills_map'):
-            skills = json.loads(emp.get('skills_map', '{}'))
-            for skill in skills.keys():
-                skill_demand[skill] = skill_demand.get(skill, 0) + 1
-    
-    # Identify gaps
-    gaps = []
-    for skill, demand in skill_demand.items():
-        supply = skill_supply.get(skill, 0)
-        if demand > supply * 2:  # High demand, low supply
-            gaps.append({
-                'skill': skill,
-                'demand': demand,
-                'supply': supply,
-                'gap_severity': 'high' if demand > supply * 3 else 'medium'
-            })
-    
-    return sorted(gaps, key=lambda x: x['demand'] - x['supply'], reverse=True)[:5]
+    with connection() as conn:
+        employee_repo = EmployeeRepository(conn)
+        mentor_repo = MentorshipProfileRepository(conn)
+
+        # Get all employees and mentors
+        employees = employee_repo.list_employees()
+        mentors = mentor_repo.list_profiles()
+
+        # Analyze skill demand vs supply
+        # This is a simplified version - full implementation would analyze goals_set
+        skill_demand = {}
+        skill_supply = {}
+
+        # Count mentor supply by skill
+        for mentor in mentors:
+            if mentor.get('is_mentor') != 1:
+                continue
+            mentor_emp = employee_repo.get_employee(mentor['employee_id'])
+            if mentor_emp and mentor_emp.get('skills_map'):
+                skills = json.loads(mentor_emp['skills_map'])
+                for skill in skills.keys():
+                    skill_supply[skill] = skill_supply.get(skill, 0) + 1
+
+        # Count mentee demand (simplified - would parse goals for actual demand)
+        for emp in employees:
+            if emp.get('level') in ['Junior', 'Mid'] and emp.get('skills_map'):
+                skills = json.loads(emp.get('skills_map', '{}'))
+                for skill in skills.keys():
+                    skill_demand[skill] = skill_demand.get(skill, 0) + 1
+
+        # Identify gaps
+        gaps = []
+        for skill, demand in skill_demand.items():
+            supply = skill_supply.get(skill, 0)
+            if demand > supply * 2:  # High demand, low supply
+                gaps.append({
+                    'skill': skill,
+                    'demand': demand,
+                    'supply': supply,
+                    'gap_severity': 'high' if demand > supply * 3 else 'medium'
+                })
+
+        return sorted(gaps, key=lambda x: x['demand'] - x['supply'], reverse=True)[:5]
 
 
 # Tool list for agent integration
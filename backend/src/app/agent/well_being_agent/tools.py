@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
 from langchain_core.tools import tool
-from app.core.db import get_connection, init_db
+from app.core.db import connection
 from ddgs import DDGS
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
@@ -55,9 +55,7 @@ def update_sentiment_snapshot(
         Dict with status confirming the sentiment was recorded
     """
     print("Updating sentiment snapshot...")
-    conn = get_connection()
-    try:
-        init_db(conn)
+    with connection() as conn:
         cursor = conn.cursor()
 
         current_time = datetime.now(timezone.utc).isoformat()
@@ -106,8 +104,6 @@ def update_sentiment_snapshot(
             )
 
         conn.commit()
-    finally:
-        conn.close()
     
     return {
         "status": "success",
@@ -137,9 +133,7 @@ def get_past_sentiment_history(
         Dict containing sentiment history with daily snapshots and recent messages
     """
     print("Retrieving past sentiment history...")
-    conn = get_connection()
-    try:
-        init_db(conn)
+    with connection() as conn:
         cursor = conn.cursor()
 
         cursor.execute(
@@ -186,8 +180,6 @@ def get_past_sentiment_history(
             }
             for row in cursor.fetchall()
         ]
-    finally:
-        conn.close()
 
     if snapshots:
         avg_overall = sum(s["average_score"] for s in snapshots) / len(snapshots)
@@ -5,21 +5,38 @@ Purpose:
 - Employee profile, goals, points, and career course lifecycle.
 
 Routes:
+- POST /api/v1/employees/recommendations:batch
 - GET /api/v1/employees/{employee_id}
 - GET /api/v1/employees/{employee_id}/career/recommendations
+- GET /api/v1/employees/{employee_id}/career/{recommendations|pathway}/stream (Server-Sent Events)
 - GET /api/v1/employees/{employee_id}/leadership/potential
+- GET /api/v1/employees/{employee_id}/leadership/score (deterministic, no LLM)
+- POST /api/v1/employees/{employee_id}/{career/recommendations|career/pathway|leadership/potential|leadership/employer}/jobs
 - POST /api/v1/employees/{employee_id}/career/courses/{course_id}/start
 - POST /api/v1/employees/{employee_id}/career/courses/{course_id}/complete
 - GET /api/v1/employees/{employee_id}/goals
 - PATCH /api/v1/employees/{employee_id}/points
 """
 
-from fastapi import APIRouter, HTTPException, status, Query
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Tuple
+import json
 
-from app.models.pydantic_schemas import EmployeeDetail, CourseDetail, GoalDetail
-from ...agent.course_recommendation_agent.main import get_course_recommendations, get_leadership_potential_employee, get_career_pathway, get_leadership_potential_employer
-from ...agent.course_recommendation_agent.tools import get_employee_context
+from app.models.pydantic_schemas import (
+    EmployeeDetail, CourseDetail, GoalDetail,
+    BatchRecommendationRequest, BatchRecommendationResponse,
+)
+from ...agent.course_recommendation_agent.main import (
+    get_course_recommendations, get_leadership_potential_employee, get_career_pathway, get_leadership_potential_employer,
+    stream_course_recommendations, stream_career_pathway,
+)
+from ...agent.course_recommendation_agent.tools import get_employee_context, recommend_courses_batch
+from app.core.vectorstore import VectorStoreNotReady
+from app.core.llm_cache import llm_cache
+from app.core.jobs import job_queue
+from app.core.db import connection
+from app.services.leadership_scorer import predictions_for
 
 # --------------------------
 # Router
@@ -29,6 +46,26 @@ router = APIRouter(
     tags=["Employees"],
 )
 
+# --------------------------
+# Batch Course Recommendations
+# --------------------------
+@router.post("/recommendations:batch", response_model=BatchRecommendationResponse)
+def batch_recommendations(payload: BatchRecommendationRequest):
+    """
+    Vector-similarity course recommendations for many employees in one call.
+    """
+    try:
+        results = recommend_courses_batch(payload.employee_ids, top_k=payload.top_k)
+    except VectorStoreNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "recommendations": results,
+        "not_found": [emp_id for emp_id in payload.employee_ids if emp_id not in results],
+    }
+
+
 # --------------------------
 # Employee Profile
 # --------------------------
@@ -62,7 +99,7 @@ async def get_employee_profile(employee_id: str):
 # Career Recommendations
 # --------------------------
 @router.get("/{employee_id}/career/recommendations")
-async def career_recommendations(employee_id: str):
+def career_recommendations(employee_id: str):
     try:
         result = get_course_recommendations(employee_id)
         # Ensure JSON is returned, fallback to empty dict
@@ -72,6 +109,8 @@ async def career_recommendations(employee_id: str):
             "recommendations": recommendations,
             "summary": result.get("text_summary", "")
         }
+    except VectorStoreNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -81,7 +120,7 @@ async def career_recommendations(employee_id: str):
 # Career Pathway (full growth plan)
 # --------------------------
 @router.get("/{employee_id}/career/pathway")
-async def career_pathway(employee_id: str):
+def career_pathway(employee_id: str):
     try:
         result = get_career_pathway(employee_id)
         pathway_json = result.get("json", {})
@@ -95,11 +134,50 @@ async def career_pathway(employee_id: str):
 
 
 
+def _require_employee(employee_id: str) -> None:
+    """Raise 404 unless the employee exists."""
+    with connection() as conn:
+        if conn.execute("SELECT 1 FROM employees WHERE id = ?", (employee_id,)).fetchone() is None:
+            raise HTTPException(status_code=404, detail=f"Employee {employee_id} not found")
+
+
+# --------------------------
+# Streaming (SSE): "json" event first, then "token" events, then "done"
+# --------------------------
+def _sse(events: Iterator[Tuple[str, dict]]) -> Iterator[str]:
+    try:
+        for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+
+def _sse_response(events: Iterator[Tuple[str, dict]]) -> StreamingResponse:
+    return StreamingResponse(
+        _sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{employee_id}/career/recommendations/stream")
+def career_recommendations_stream(employee_id: str):
+    # Checked up front: once streaming starts the status is already 200
+    _require_employee(employee_id)
+    return _sse_response(stream_course_recommendations(employee_id))
+
+
+@router.get("/{employee_id}/career/pathway/stream")
+def career_pathway_stream(employee_id: str):
+    _require_employee(employee_id)
+    return _sse_response(stream_career_pathway(employee_id))
+
+
 # --------------------------
 # Leadership Potential (Employee View)
 # --------------------------
 @router.get("/{employee_id}/leadership/potential")
-async def leadership_potential_employee(employee_id: str):
+def leadership_potential_employee(employee_id: str):
     """
     Evaluate leadership potential for the employee.
     """
@@ -114,11 +192,27 @@ async def leadership_potential_employee(employee_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# --------------------------
+# Leadership Score (deterministic factor scores)
+# --------------------------
+@router.get("/{employee_id}/leadership/score")
+def leadership_score(employee_id: str):
+    """
+    Experience, learning-engagement and soft-skill scores computed from local
+    data. Instant and consistent; use /leadership/employer for the narrative.
+    """
+    with connection() as conn:
+        predictions = predictions_for(conn, [employee_id])
+    if not predictions:
+        raise HTTPException(status_code=404, detail=f"Employee {employee_id} not found")
+    return predictions[0]
+
+
 # --------------------------
 # Leadership Potential (Employer View)
 # --------------------------
 @router.get("/{employee_id}/leadership/employer")
-async def leadership_potential_employer(employee_id: str):
+def leadership_potential_employer(employee_id: str):
     """
     Evaluate leadership potential from the employer's perspective.
     """
@@ -133,6 +227,47 @@ async def leadership_potential_employer(employee_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# --------------------------
+# Background Jobs (submit, then poll GET /api/v1/jobs/{job_id})
+# --------------------------
+JOB_KINDS = {
+    "career/recommendations": get_course_recommendations,
+    "career/pathway": get_career_pathway,
+    "leadership/potential": get_leadership_potential_employee,
+    "leadership/employer": get_leadership_potential_employer,
+}
+for _kind, _handler in JOB_KINDS.items():
+    job_queue.register(_kind, _handler)
+
+
+def _submit_job(kind: str, employee_id: str, response: Response) -> dict:
+    # Fail fast instead of queueing a job that cannot succeed
+    _require_employee(employee_id)
+    job, created = job_queue.submit(kind, employee_id)
+    response.headers["Location"] = f"/api/v1/jobs/{job['id']}"
+    return {"job_id": job["id"], "status": job["status"], "deduplicated": not created}
+
+
+@router.post("/{employee_id}/career/recommendations/jobs", status_code=status.HTTP_202_ACCEPTED)
+def submit_career_recommendations_job(employee_id: str, response: Response):
+    return _submit_job("career/recommendations", employee_id, response)
+
+
+@router.post("/{employee_id}/career/pathway/jobs", status_code=status.HTTP_202_ACCEPTED)
+def submit_career_pathway_job(employee_id: str, response: Response):
+    return _submit_job("career/pathway", employee_id, response)
+
+
+@router.post("/{employee_id}/leadership/potential/jobs", status_code=status.HTTP_202_ACCEPTED)
+def submit_leadership_potential_job(employee_id: str, response: Response):
+    return _submit_job("leadership/potential", employee_id, response)
+
+
+@router.post("/{employee_id}/leadership/employer/jobs", status_code=status.HTTP_202_ACCEPTED)
+def submit_leadership_employer_job(employee_id: str, response: Response):
+    return _submit_job("leadership/employer", employee_id, response)
+
+
 # --------------------------
 # Start Course
 # --------------------------
@@ -147,6 +282,8 @@ async def start_course(employee_id: str, course_id: str):
         emp_context = get_employee_context(employee_id)
         courses = emp_context.get("profile", {}).get("courses_enrolled", {})
         courses[course_id] = "in-progress"
+        # Course changes alter the context the career/leadership answers were based on
+        llm_cache.invalidate_employee(employee_id)
         return CourseDetail(course_id=course_id, status="in-progress")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -165,6 +302,7 @@ async def complete_course(employee_id: str, course_id: str):
         emp_context = get_employee_context(employee_id)
         courses = emp_context.get("profile", {}).get("courses_enrolled", {})
         courses[course_id] = "completed"
+        llm_cache.invalidate_employee(employee_id)
         return CourseDetail(course_id=course_id, status="completed")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
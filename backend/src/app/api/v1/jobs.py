@@ -0,0 +1,30 @@
+"""
+API v1: Jobs Router
+
+Purpose:
+- Poll background jobs submitted by LLM-heavy endpoints
+  (e.g. POST /api/v1/employees/{employee_id}/career/pathway/jobs).
+
+Routes:
+- GET /api/v1/jobs/{job_id}
+"""
+
+from fastapi import APIRouter, HTTPException
+
+from app.core.jobs import job_queue
+
+router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["Jobs"],
+)
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    """
+    Current status of a job; `result` is set once status is 'succeeded'.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
@@ -25,7 +25,7 @@ from typing import AsyncGenerator, List, Optional, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 import os
 
-from app.core.db import get_connection, init_db
+from app.core.db import get_db
 from app.data.seed_data import load_all_seeds
 from app.services.mentor_match_request_service import MentorMatchingService
 
@@ -36,18 +36,15 @@ router = APIRouter(
 )
 
 
-async def get_matching_service() -> AsyncGenerator[MentorMatchingService, None]:
-    conn = get_connection()
-    try:
-        init_db(conn)
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM employees")
-        count = cur.fetchone()[0]
-        if count == 0:
-            load_all_seeds(conn, generate_insights=False)
-        yield MentorMatchingService(conn)
-    finally:
-        conn.close()
+async def get_matching_service(
+    conn=Depends(get_db),
+) -> AsyncGenerator[MentorMatchingService, None]:
+    # Schema is migrated once by get_db; only check whether seeding is needed.
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM employees LIMIT 1")
+    if cur.fetchone() is None:
+        load_all_seeds(conn, generate_insights=False)
+    yield MentorMatchingService(conn)
 
 
 # ============================================================================
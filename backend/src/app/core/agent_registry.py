@@ -0,0 +1,104 @@
+"""
+Core: agent registry
+
+Purpose
+- Build each agent variant (e.g. a LangChain `create_agent` graph) once per
+  process instead of on every request, and share it between callers.
+- Variants are keyed by the tools, system prompt and model config they were
+  built with, so a change to any of them yields a new instance.
+- Built agents must be safe to invoke concurrently (compiled LangGraph
+  graphs without a checkpointer are); construction itself is serialized per key.
+
+Metrics (see `AgentRegistry.stats()`):
+- builds / hits, total and last build time in ms, per variant
+
+Usage
+    agent = agent_registry.get(
+        agent_registry.make_key(tools=[my_tool], system_prompt=SYSTEM_PROMPT, model=DEPLOYMENT),
+        lambda: create_agent(model=llm, tools=[my_tool], system_prompt=SYSTEM_PROMPT),
+    )
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class AgentRegistry:
+    def __init__(self):
+        self._agents: Dict[str, Any] = {}
+        self._build_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Counter] = defaultdict(Counter)
+
+    @staticmethod
+    def make_key(
+        *,
+        tools: Iterable[Any] = (),
+        system_prompt: str = "",
+        model: Optional[str] = None,
+        **model_config: Any,
+    ) -> str:
+        """Stable key for an agent variant; tools are identified by module + name."""
+        tool_names = [
+            f"{getattr(t, '__module__', '')}.{getattr(t, 'name', None) or getattr(t, '__name__', repr(t))}"
+            for t in tools
+        ]
+        payload = json.dumps(
+            {"tools": tool_names, "system_prompt": system_prompt, "model": model, "config": model_config},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, build: Callable[[], Any], *, name: Optional[str] = None) -> Any:
+        """Return the agent for `key`, calling `build()` only the first time."""
+        label = name or key[:12]
+        agent = self._agents.get(key)
+        if agent is not None:
+            with self._lock:
+                self._stats[label]["hits"] += 1
+            return agent
+
+        with self._lock:
+            build_lock = self._build_locks[key]
+        with build_lock:
+            agent = self._agents.get(key)
+            if agent is not None:
+                with self._lock:
+                    self._stats[label]["hits"] += 1
+                return agent
+
+            started = time.perf_counter()
+            agent = build()
+            build_ms = int((time.perf_counter() - started) * 1000)
+            with self._lock:
+                self._agents[key] = agent
+                self._stats[label]["builds"] += 1
+                self._stats[label]["build_ms_total"] += build_ms
+                self._stats[label]["last_build_ms"] = build_ms
+            return agent
+
+    def clear(self) -> None:
+        with self._lock:
+            self._agents.clear()
+            self._build_locks.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                label: {
+                    "builds": counts["builds"],
+                    "hits": counts["hits"],
+                    "build_ms_total": counts["build_ms_total"],
+                    "last_build_ms": counts["last_build_ms"],
+                }
+                for label, counts in self._stats.items()
+            }
+
+
+agent_registry = AgentRegistry()
@@ -26,5 +26,54 @@ class Settings:
     enable_anonymous_mode: bool = os.getenv("ENABLE_ANON", "true").lower() not in {"0", "false", "no"}
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
 
+    # SQLite connection pool tuning (see app.core.db.ConnectionManager)
+    db_read_pool_size: int = int(os.getenv("DB_READ_POOL_SIZE", "4"))
+    # Matches the default size of the threadpool FastAPI runs sync dependencies in.
+    db_checkout_pool_size: int = int(os.getenv("DB_CHECKOUT_POOL_SIZE", "40"))
+    db_pool_timeout_s: float = float(os.getenv("DB_POOL_TIMEOUT_S", "30"))
+    db_busy_timeout_ms: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    db_cache_size_kb: int = int(os.getenv("DB_CACHE_SIZE_KB", "65536"))
+    db_mmap_size: int = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+    # Vector stores (see app.core.vectorstore)
+    vectorstore_warm_on_startup: bool = os.getenv("VECTORSTORE_WARM_ON_STARTUP", "true").lower() not in {"0", "false", "no"}
+    vectorstore_reload_interval_s: float = float(os.getenv("VECTORSTORE_RELOAD_INTERVAL_S", "30"))
+    vectorstore_wait_timeout_s: float = float(os.getenv("VECTORSTORE_WAIT_TIMEOUT_S", "30"))
+
+    # Embedding provider for retrieval (see app.agent.embeddings): azure | local | hashing
+    embedding_provider: str = os.getenv("EMBEDDING_PROVIDER", "azure")
+    embedding_local_model: str = os.getenv("EMBEDDING_LOCAL_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    embedding_batch_size: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    embedding_hash_dim: int = int(os.getenv("EMBEDDING_HASH_DIM", "384"))
+
+    # LLM response cache (see app.core.llm_cache)
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in {"0", "false", "no"}
+    llm_cache_ttl_s: float = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+
+    # Background job workers for LLM-heavy endpoints (see app.core.jobs)
+    job_workers: int = int(os.getenv("JOB_WORKERS", "4"))
+
+    # employee_insights batch pipeline (see agent info_for_employer.py)
+    insights_workers: int = int(os.getenv("INSIGHTS_WORKERS", "4"))
+    insights_rate_per_minute: float = float(os.getenv("INSIGHTS_RATE_PER_MINUTE", "30"))
+    insights_batch_size: int = int(os.getenv("INSIGHTS_BATCH_SIZE", "20"))
+    # Unchanged rows older than this are recomputed anyway in --changed-only mode (0 = never)
+    insights_max_age_days: float = float(os.getenv("INSIGHTS_MAX_AGE_DAYS", "30"))
+
+    # One LLM call returns payload + summary instead of two (see agent structured.py)
+    llm_single_pass: bool = os.getenv("LLM_SINGLE_PASS", "false").lower() in {"1", "true", "yes"}
+
+    # ETag / 304 and response cache for polled GET endpoints (see app.core.http_cache)
+    http_cache_enabled: bool = os.getenv("HTTP_CACHE_ENABLED", "true").lower() not in {"0", "false", "no"}
+    http_cache_max_entries: int = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256"))
+
+    # Parquet snapshots of employee_insights (see app.services.insights_snapshot)
+    insights_snapshot_dir: str = os.getenv(
+        "INSIGHTS_SNAPSHOT_DIR",
+        os.path.join(os.path.dirname(__file__), "..", "data", "snapshots"),
+    )
+    insights_snapshot_keep: int = int(os.getenv("INSIGHTS_SNAPSHOT_KEEP", "3"))
+
 
 settings = Settings()
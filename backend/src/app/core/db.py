@@ -2,7 +2,9 @@
 Core: db (SQLite helper)
 
 Purpose
-- Provide helpers to create a SQLite connection and initialize minimal schema.
+- Provide helpers to create a SQLite connection and apply versioned schema migrations.
+- Provide a pooled, per-thread connection manager so request handlers and
+  agent tools reuse configured connections instead of reopening the file.
 
 Notes
 - Uses Python stdlib `sqlite3` to avoid external dependencies.
@@ -10,15 +12,61 @@ Notes
 from __future__ import annotations
 
 import os
+import queue
 import sqlite3
-from typing import Iterable, Mapping
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Mapping
 
-from app.data.migrations import (
-    ensure_position_level_column,
-    ensure_mentor_request_history_schema,
-)
+from app.core.config import settings
+from app.data.migrations import run_migrations
 from app.data.utils.position_level import derive_position_level
 
+MEMORY_URL = ":memory:"
+
+
+def _default_db_path() -> str:
+    return os.path.join(os.path.dirname(__file__), "..", "data", "database", "app.db")
+
+
+def resolve_db_url(url: str | None = None) -> str:
+    """Return the absolute database path (or ':memory:') for a URL/env override."""
+    db_url = url or os.getenv("DATABASE_URL", _default_db_path())
+    if db_url == MEMORY_URL:
+        return db_url
+    return os.path.abspath(db_url)
+
+
+def configure_connection(conn: sqlite3.Connection, *, read_only: bool = False) -> None:
+    """
+    Apply the per-connection PRAGMAs used across the app.
+
+    WAL journaling lets readers proceed while a writer holds the lock, and
+    `synchronous=NORMAL` is durable under WAL while avoiding an fsync per commit.
+    """
+    if not read_only:
+        # journal_mode is persistent in the file; in-memory databases ignore it.
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute(f"PRAGMA busy_timeout = {int(settings.db_busy_timeout_ms)};")
+    # Negative cache_size is expressed in KiB rather than pages.
+    conn.execute(f"PRAGMA cache_size = -{int(settings.db_cache_size_kb)};")
+    conn.execute(f"PRAGMA mmap_size = {int(settings.db_mmap_size)};")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA foreign_keys = ON;")
+
+
+def _open(db_path: str, *, read_only: bool = False) -> sqlite3.Connection:
+    if db_path == MEMORY_URL:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+    elif read_only:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
 
 def get_connection(url: str | None = None) -> sqlite3.Connection:
     """
@@ -34,298 +82,318 @@ def get_connection(url: str | None = None) -> sqlite3.Connection:
         - Default path: backend/src/app/data/database/app.db
         - Use ':memory:' for in-memory database (testing)
         - Creates parent directories automatically
+        - Opens a new, caller-owned connection. Request handlers and agent
+          tools should use `get_manager()` / `get_db` instead.
     """
-    # Default to data/database/app.db (not root level)
-    default_path = os.path.join(os.path.dirname(__file__), "..", "data", "database", "app.db")
-    db_url = url or os.getenv("DATABASE_URL", default_path)
-    
-    # Handle in-memory database for testing
-    if db_url == ":memory:":
-        conn = sqlite3.connect(db_url, check_same_thread=False)
-    else:
-        # Create data/database/ directory if it doesn't exist
-        db_path = os.path.abspath(db_url)
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        conn = sqlite3.connect(db_path, check_same_thread=False)
-    
-    # Ensure foreign key constraints are enforced
-    conn.execute("PRAGMA foreign_keys = ON;")
-    conn.row_factory = sqlite3.Row
+    db_path = resolve_db_url(url)
+    conn = _open(db_path)
+    configure_connection(conn)
     return conn
 
 
-def init_db(conn: sqlite3.Connection) -> None:
-    cur = conn.cursor()
+class _BoundedPool:
+    """
+    Up to `size` connections to one database, opened on demand and reused.
 
-    # Core
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS departments (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL
-        )
-        """
-    )
+    When every connection is checked out, `acquire()` waits for one to be
+    released instead of opening more, and gives up after
+    `settings.db_pool_timeout_s`.
+    """
 
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS employees (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            role TEXT,
-            department_id TEXT,
-            level TEXT,
-            position_level INTEGER,
-            points_current INTEGER DEFAULT 0,
-            hire_date TEXT,
-            skills_map TEXT,
-            courses_enrolled_map TEXT,
-            goals_set TEXT,
-            FOREIGN KEY (department_id) REFERENCES departments(id)
-        )
-        """
-    )
+    def __init__(self, db_path: str, size: int, *, read_only: bool, size_setting: str):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.read_only = read_only
+        self.size_setting = size_setting
+        self._lock = threading.Lock()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened: List[sqlite3.Connection] = []
+        self._reserved = 0
 
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS skills (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            category TEXT
-        )
-        """
-    )
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
 
-    # Learning & Goals
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS courses (
-            id TEXT PRIMARY KEY,
-            title TEXT,
-            description TEXT,
-            difficulty TEXT,
-            duration_weeks INTEGER,
-            effort_hours_week INTEGER,
-            points_reward INTEGER,
-            roi TEXT,
-            active INTEGER DEFAULT 1
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS course_skills (
-            course_id TEXT,
-            skill_id TEXT,
-            weight INTEGER,
-            PRIMARY KEY (course_id, skill_id),
-            FOREIGN KEY (course_id) REFERENCES courses(id),
-            FOREIGN KEY (skill_id) REFERENCES skills(id)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS enrollments (
-            employee_id TEXT,
-            course_id TEXT,
-            status TEXT,
-            progress_percent INTEGER,
-            started_at TEXT,
-            completed_at TEXT,
-            points_awarded INTEGER,
-            PRIMARY KEY (employee_id, course_id),
-            FOREIGN KEY (employee_id) REFERENCES employees(id),
-            FOREIGN KEY (course_id) REFERENCES courses(id)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS goals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_id TEXT,
-            title TEXT,
-            target_date TEXT,
-            progress_percent INTEGER,
-            FOREIGN KEY (employee_id) REFERENCES employees(id)
-        )
-        """
-    )
+        with self._lock:
+            can_open = self._reserved < self.size
+            if can_open:
+                self._reserved += 1
+        if not can_open:
+            # Pool exhausted: wait for another caller to hand one back.
+            timeout = settings.db_pool_timeout_s
+            try:
+                return self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"No connection to {self.db_path} was released within {timeout}s "
+                    f"(pool size {self.size}; see {self.size_setting})"
+                ) from None
 
-    # Wellbeing
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS wellbeing_messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_id TEXT,
-            anon_session_id TEXT,
-            sender TEXT,
-            content TEXT,
-            timestamp TEXT,
-            is_anonymous INTEGER DEFAULT 0
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sentiment_messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            message_id INTEGER,
-            label TEXT,
-            score REAL,
-            confidence REAL,
-            created_at TEXT,
-            FOREIGN KEY (message_id) REFERENCES wellbeing_messages(id)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sentiment_snapshots (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_id TEXT,
-            anon_session_id TEXT,
-            day TEXT,
-            label TEXT,
-            average_score REAL,
-            messages_count INTEGER,
-            created_at TEXT
-        )
-        """
-    )
+        try:
+            conn = _open(self.db_path, read_only=self.read_only)
+            configure_connection(conn, read_only=self.read_only)
+        except sqlite3.Error:
+            with self._lock:
+                self._reserved -= 1
+            raise
+        with self._lock:
+            self._opened.append(conn)
+        return conn
 
-    # Mentorship
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS mentorship_profiles (
-            employee_id TEXT PRIMARY KEY,
-            is_mentor INTEGER DEFAULT 0,
-            capacity INTEGER,
-            mentees_count INTEGER,
-            rating REAL,
-            personality TEXT,
-            FOREIGN KEY (employee_id) REFERENCES employees(id)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS mentorship_matches (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            mentor_id TEXT,
-            mentee_id TEXT,
-            score REAL,
-            reasons_json TEXT,
-            status TEXT,
-            created_at TEXT,
-            FOREIGN KEY (mentor_id) REFERENCES employees(id),
-            FOREIGN KEY (mentee_id) REFERENCES employees(id)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS mentor_match_requests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            mentee_id TEXT NOT NULL,
-            mentor_id TEXT NOT NULL,
-            match_score REAL,
-            explanation TEXT,
-            status TEXT,
-            created_at TEXT,
-            FOREIGN KEY (mentee_id) REFERENCES employees(id),
-            FOREIGN KEY (mentor_id) REFERENCES employees(id)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS mentor_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            mentor_id TEXT,
-            mentee_id TEXT,
-            session_date TEXT,
-            notes TEXT,
-            points_awarded INTEGER,
-            FOREIGN KEY (mentor_id) REFERENCES employees(id),
-            FOREIGN KEY (mentee_id) REFERENCES employees(id)
-        )
-        """
-    )
+    def release(self, conn: sqlite3.Connection) -> None:
+        self._idle.put(conn)
 
-    ensure_mentor_request_history_schema(conn)
+    def close(self) -> None:
+        with self._lock:
+            opened, self._opened = self._opened, []
+        for conn in opened:
+            conn.close()
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
 
-    # Rewards & Points
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS marketplace_items (
-            id INTEGER PRIMARY KEY,
-            name TEXT,
-            description TEXT,
-            points_cost INTEGER,
-            category TEXT,
-            in_stock INTEGER DEFAULT 1
+
+class ConnectionManager:
+    """
+    Bounded SQLite connection pool for a single database file.
+
+    - One read/write connection per worker thread, opened and configured once
+      and reused for every subsequent checkout on that thread.
+    - A fixed-size pool of read-only connections for query-only paths.
+    - A fixed-size pool of request-scoped read/write connections
+      (`checkout()`) for work that is not confined to one thread, such as
+      FastAPI dependencies.
+
+    Both fixed-size pools block callers once exhausted rather than opening
+    more connections.
+
+    Connections are owned by the manager; callers must not close them.
+    In-memory databases share a single connection, since every new
+    ':memory:' connection would otherwise see an empty database.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        read_pool_size: int | None = None,
+        checkout_pool_size: int | None = None,
+    ):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writers: List[sqlite3.Connection] = []
+        self._readers = _BoundedPool(
+            db_path,
+            read_pool_size or settings.db_read_pool_size,
+            read_only=True,
+            size_setting="DB_READ_POOL_SIZE",
         )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS redemptions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_id TEXT,
-            item_id INTEGER,
-            points_cost INTEGER,
-            created_at TEXT,
-            FOREIGN KEY (employee_id) REFERENCES employees(id),
-            FOREIGN KEY (item_id) REFERENCES marketplace_items(id)
+        self._checkouts = _BoundedPool(
+            db_path,
+            checkout_pool_size or settings.db_checkout_pool_size,
+            read_only=False,
+            size_setting="DB_CHECKOUT_POOL_SIZE",
         )
+        self._shared: sqlite3.Connection | None = None
+        self._closed = False
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def read_pool_size(self) -> int:
+        return self._readers.size
+
+    @property
+    def checkout_pool_size(self) -> int:
+        return self._checkouts.size
+
+    @property
+    def is_memory(self) -> bool:
+        return self.db_path == MEMORY_URL
+
+    def _shared_connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._shared is None:
+                self._shared = _open(self.db_path)
+                configure_connection(self._shared)
+                self._writers.append(self._shared)
+            return self._shared
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError(f"Connection manager for {self.db_path} is closed")
+        if self.is_memory:
+            return self._shared_connection()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _open(self.db_path)
+            configure_connection(conn)
+            self._local.conn = conn
+            with self._lock:
+                self._writers.append(conn)
+        return conn
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            if conn.in_transaction:
+                conn.commit()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
         """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS points_ledger (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_id TEXT,
-            delta INTEGER,
-            source TEXT,
-            reference_id TEXT,
-            created_at TEXT,
-            FOREIGN KEY (employee_id) REFERENCES employees(id)
-        )
+        Yield this thread's read/write connection.
+
+        Any transaction left open is committed on success and rolled back on error.
         """
-    )
+        with self._transaction(self._thread_connection()) as conn:
+            yield conn
 
-    # Advanced
-    cur.execute(
+    @contextmanager
+    def checkout(self) -> Iterator[sqlite3.Connection]:
         """
-        CREATE TABLE IF NOT EXISTS leadership_potential_predictions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_id TEXT,
-            model_version TEXT,
-            score REAL,
-            label TEXT,
-            factors_json TEXT,
-            created_at TEXT,
-            FOREIGN KEY (employee_id) REFERENCES employees(id)
-        )
+        Check out a read/write connection that nobody else uses until the block exits.
+
+        Unlike `connection()` it is not tied to the calling thread, so it stays
+        private to one request even when FastAPI runs the dependency and the
+        endpoint on different threads. At most `checkout_pool_size` are open
+        at once; further callers wait for one to be released. Transactions are
+        committed or rolled back as in `connection()`.
+        """
+        if self.is_memory:
+            with self.connection() as conn:
+                yield conn
+            return
+        if self._closed:
+            raise RuntimeError(f"Connection manager for {self.db_path} is closed")
+
+        conn = self._checkouts.acquire()
+        try:
+            with self._transaction(conn):
+                yield conn
+        finally:
+            if not self._closed:
+                self._checkouts.release(conn)
+
+    @contextmanager
+    def read_connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection from the bounded reader pool."""
+        if self.is_memory:
+            with self.connection() as conn:
+                yield conn
+            return
+
+        conn = self._readers.acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if not self._closed:
+                self._readers.release(conn)
+
+    def ensure_schema(self) -> None:
         """
-    )
+        Apply pending migrations once per process for this database.
 
-    # Indexes
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_enrollments_emp ON enrollments(employee_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments(course_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_wellbeing_emp_time ON wellbeing_messages(employee_id, timestamp);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_msg ON sentiment_messages(message_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_emp_day ON sentiment_snapshots(employee_id, day);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_matches_mentor ON mentorship_matches(mentor_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_matches_mentee ON mentorship_matches(mentee_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_match_requests_mentee ON mentor_match_requests(mentee_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_points_emp_time ON points_ledger(employee_id, created_at);")
+        After the first call this is a flag check, so request paths stay DDL-free.
+        """
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            with self.connection() as conn:
+                run_migrations(conn)
+            self._schema_ready = True
 
-    conn.commit()
-    ensure_position_level_column(conn)
+    def close_all(self) -> None:
+        """Close every connection opened by this manager."""
+        with self._lock:
+            self._closed = True
+            writers, self._writers = self._writers, []
+            self._shared = None
+        for conn in writers:
+            conn.close()
+        self._readers.close()
+        self._checkouts.close()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(url: str | None = None) -> ConnectionManager:
+    """Return the process-wide connection manager for a database URL."""
+    db_path = resolve_db_url(url)
+    with _managers_lock:
+        manager = _managers.get(db_path)
+        if manager is None:
+            manager = ConnectionManager(db_path)
+            _managers[db_path] = manager
+        return manager
+
+
+def close_all_managers() -> None:
+    """Close every pooled connection (application shutdown, test teardown)."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close_all()
+
+
+@contextmanager
+def connection(url: str | None = None) -> Iterator[sqlite3.Connection]:
+    """Context manager for agent tools and scripts: a pooled read/write connection."""
+    manager = get_manager(url)
+    manager.ensure_schema()
+    with manager.connection() as conn:
+        yield conn
+
+
+@contextmanager
+def read_connection(url: str | None = None) -> Iterator[sqlite3.Connection]:
+    """Context manager yielding a pooled read-only connection."""
+    manager = get_manager(url)
+    manager.ensure_schema()
+    with manager.read_connection() as conn:
+        yield conn
+
+
+def get_db() -> Iterator[sqlite3.Connection]:
+    """
+    FastAPI dependency yielding a read/write connection private to the request.
+
+    A sync generator, so FastAPI runs it in the threadpool rather than on the
+    event loop; the connection is committed (or rolled back) and returned to
+    the manager when the request finishes.
+    """
+    manager = get_manager()
+    manager.ensure_schema()
+    with manager.checkout() as conn:
+        yield conn
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    """
+    Bring the schema up to date by applying any pending migrations.
+
+    Cheap once the database is current: only `PRAGMA user_version` is read.
+    """
+    run_migrations(conn)
 
 
 def seed_employees(conn: sqlite3.Connection, rows: Iterable[Mapping]) -> None:
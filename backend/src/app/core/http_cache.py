@@ -0,0 +1,204 @@
+"""
+Core: versioned ETag / 304 response cache
+
+Purpose
+- Dashboards poll the analytics and profile endpoints every ~30 s, yet the
+  answer only changes when the tables behind it do. Triggers keep one
+  counter per table in `data_versions` (see migration data_versions).
+- For a cached route the middleware reads those counters (one primary-key
+  query) and derives a strong ETag from (path, query params, versions):
+    * a matching `If-None-Match` is answered with 304 before the handler runs;
+    * otherwise a stored 200 response for the same key is replayed;
+    * otherwise the handler runs and its 200 response is stored.
+
+Usage
+    app.add_middleware(ConditionalGetMiddleware, routes=(
+        CachedRoute(r"/api/v1/analytics/[^/]+", tables=("employee_insights",)),
+    ))
+    response_cache.stats()
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.db import read_connection
+
+_FALSE_VALUES = {"", "0", "false", "no"}
+
+
+@dataclass(frozen=True)
+class CachedRoute:
+    """A GET route whose response depends only on `tables` and its query params."""
+    pattern: str
+    tables: Tuple[str, ...]
+    # Query params that force a recompute (e.g. ?refresh=true) skip the cache
+    bypass_params: Tuple[str, ...] = ()
+    # Responses that also depend on today's date (e.g. tenure) change ETag daily
+    daily: bool = False
+
+    def matches(self, path: str) -> bool:
+        return re.fullmatch(self.pattern, path) is not None
+
+    def bypassed(self, query: Sequence[Tuple[str, str]]) -> bool:
+        return any(name in self.bypass_params and value.lower() not in _FALSE_VALUES for name, value in query)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    status: int
+    headers: Tuple[Tuple[bytes, bytes], ...]
+    body: bytes
+
+
+def table_versions(tables: Sequence[str], url: Optional[str] = None) -> Optional[Tuple]:
+    """(name, version, token) of each table, or None if data_versions does not exist yet."""
+    placeholders = ", ".join("?" for _ in tables)
+    try:
+        with read_connection(url) as conn:
+            rows = conn.execute(
+                f"SELECT name, version, token FROM data_versions WHERE name IN ({placeholders}) ORDER BY name",
+                tuple(tables),
+            ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return tuple(tuple(row) for row in rows)
+
+
+def make_etag(key: Tuple) -> str:
+    return '"' + hashlib.sha256(repr(key).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix is ignored."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class ResponseCache:
+    """Bounded LRU of 200 responses keyed on (path, query params, table versions)."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.http_cache_max_entries
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, event: str) -> None:
+        with self._lock:
+            self._stats[event] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "not_modified": self._stats["not_modified"],
+                "hit": self._stats["hit"],
+                "miss": self._stats["miss"],
+                "entries": len(self._entries),
+            }
+
+
+response_cache = ResponseCache()
+
+
+class ConditionalGetMiddleware:
+    """
+    ASGI middleware serving ETag / 304 / cached responses for `routes`.
+
+    Register it inside CORSMiddleware so that 304s and replayed responses
+    still get CORS headers for the requesting origin.
+    """
+
+    def __init__(self, app, routes: Sequence[CachedRoute] = (), cache: Optional[ResponseCache] = None):
+        self.app = app
+        self.routes = tuple(routes)
+        self.cache = cache or response_cache
+
+    def _route(self, path: str) -> Optional[CachedRoute]:
+        return next((route for route in self.routes if route.matches(path)), None)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not settings.http_cache_enabled:
+            await self.app(scope, receive, send)
+            return
+        route = self._route(scope["path"])
+        query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+        if route is None or route.bypassed(query):
+            await self.app(scope, receive, send)
+            return
+        versions = await run_in_threadpool(table_versions, route.tables)
+        if versions is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], tuple(query), versions)
+        if route.daily:
+            key += (date.today().isoformat(),)
+        etag = make_etag(key)
+        request_headers = {name.lower(): value for name, value in scope.get("headers", [])}
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1")
+        validators = [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+
+        if etag_matches(if_none_match, etag):
+            self.cache.count("not_modified")
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.count("hit")
+            await send({"type": "http.response.start", "status": cached.status, "headers": list(cached.headers)})
+            await send({"type": "http.response.body", "body": cached.body})
+            return
+
+        self.cache.count("miss")
+        start: Dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                if message["status"] == 200:
+                    message = {**message, "headers": [*message.get("headers", []), *validators]}
+                    start["headers"] = message["headers"]
+            elif message["type"] == "http.response.body" and start.get("status") == 200:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.cache.put(key, CachedResponse(
+                        etag=etag, status=200, headers=tuple(start["headers"]), body=b"".join(chunks),
+                    ))
+            await send(message)
+
+        await self.app(scope, receive, capture)
@@ -0,0 +1,230 @@
+"""
+Core: background jobs
+
+Purpose
+- Run slow, synchronous work (LLM calls) on a bounded thread pool instead of
+  inside request handlers, so one slow call cannot stall the event loop.
+- Persist every job in the `jobs` table so clients can poll for status/results.
+- Deduplicate: submitting a job identical to one still queued or running
+  (per the `jobs` table) returns the existing job instead of starting another.
+- A handler result without a parsed "json" payload (agents report errors as
+  {"error": ...} / {"raw_output": ...}) is recorded as failed.
+- Every job records the queue (host, pid) that owns it, so startup recovery
+  only fails jobs whose owning process has exited.
+
+Usage
+    job_queue.register("career_pathway", get_career_pathway)
+    job, created = job_queue.submit("career_pathway", "EMP001")
+    job_queue.get(job["id"])
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.db import connection
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class UnknownJobKind(ValueError):
+    """Raised when submitting a job kind that has no registered handler."""
+
+
+def _process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; assume it is alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # e.g. EPERM: the process exists but belongs to another user
+        return True
+    return True
+
+
+def result_error(result: Any) -> Optional[str]:
+    """Why a handler result counts as failed, or None if it carries a parsed payload."""
+    if isinstance(result, dict) and result.get("json") is not None:
+        return None
+    if isinstance(result, dict) and result.get("error"):
+        return str(result["error"])
+    return "no parsed output"
+
+
+class JobQueue:
+    def __init__(self, *, db_url: Optional[str] = None, max_workers: Optional[int] = None):
+        self.db_url = db_url
+        self.max_workers = max_workers or settings.job_workers
+        self._handlers: Dict[str, Callable[[str], Any]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # host:pid:nonce; the nonce tells this queue apart from an earlier
+        # process that had the same pid (common in containers)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def register(self, kind: str, handler: Callable[[str], Any]) -> None:
+        self._handlers[kind] = handler
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="job-worker"
+            )
+        return self._executor
+
+    # ------------------------------------------------------------------
+    # Submit / poll
+    # ------------------------------------------------------------------
+    def submit(self, kind: str, employee_id: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Queue `kind` for `employee_id`.
+
+        Returns:
+            (job, created) where created is False if an identical job was
+            already queued or running.
+
+        Raises:
+            UnknownJobKind: if no handler is registered for `kind`.
+        """
+        if kind not in self._handlers:
+            raise UnknownJobKind(f"Unknown job kind: {kind}")
+        dedup_key = f"{kind}:{employee_id}"
+
+        job_id = uuid.uuid4().hex
+        # IMMEDIATE: check-then-insert must not interleave with another submitter
+        with self._lock, connection(self.db_url) as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE dedup_key = ? AND status IN (?, ?) LIMIT 1",
+                (dedup_key, QUEUED, RUNNING),
+            ).fetchone()
+            if existing is None:
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, employee_id, dedup_key, status, owner, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, employee_id, dedup_key, QUEUED, self.owner, _now()),
+                )
+        if existing is not None:
+            return self.get(existing[0]), False
+
+        self._pool().submit(self._run, job_id, kind, employee_id)
+        return self.get(job_id), True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with connection(self.db_url) as conn:
+            row = conn.execute(
+                "SELECT id, kind, employee_id, status, result_json, error, "
+                "created_at, started_at, finished_at, duration_ms FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        result_json = job.pop("result_json")
+        job["result"] = json.loads(result_json) if result_json else None
+        return job
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _run(self, job_id: str, kind: str, employee_id: str) -> None:
+        started = time.monotonic()
+        status, result_json, error = FAILED, None, None
+        try:
+            with connection(self.db_url) as conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                    (RUNNING, _now(), job_id),
+                )
+            result = self._handlers[kind](employee_id)
+            result_json = json.dumps(result, default=str)
+            error = result_error(result)
+            if error is None:
+                status = SUCCEEDED
+            else:
+                print(f"Job {job_id} ({kind}) returned no parsed output: {error}")
+        except Exception as e:
+            print(f"Job {job_id} ({kind}) failed: {e}")
+            error = str(e)
+        finally:
+            duration_ms = int((time.monotonic() - started) * 1000)
+            with connection(self.db_url) as conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, result_json = ?, error = ?, "
+                    "finished_at = ?, duration_ms = ? WHERE id = ?",
+                    (status, result_json, error, _now(), duration_ms, job_id),
+                )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def _owner_gone(self, owner: Optional[str]) -> bool:
+        """Whether the queue that owns a job has certainly exited."""
+        if owner == self.owner:
+            return False
+        try:
+            host, pid, _ = owner.split(":")
+            pid = int(pid)
+        except (AttributeError, ValueError):
+            return True
+        if host != socket.gethostname():
+            # Cannot probe processes on another host
+            return False
+        if pid == os.getpid():
+            # Same pid, different nonce: an earlier process that reused our pid
+            return True
+        return not _process_alive(pid)
+
+    def recover_stale(self) -> int:
+        """
+        Fail queued/running jobs whose owning process has exited. Call at startup.
+
+        Jobs only run on the thread pool of the process that queued them, so
+        those jobs would otherwise stay unfinished (and block deduplication)
+        forever. Jobs owned by live processes sharing the database are left
+        alone.
+        """
+        with connection(self.db_url) as conn:
+            owners = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT DISTINCT owner FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+                )
+            ]
+            gone = [owner for owner in owners if self._owner_gone(owner)]
+            failed = 0
+            for owner in gone:
+                cur = conn.execute(
+                    "UPDATE jobs SET status = ?, error = 'interrupted', finished_at = ? "
+                    "WHERE status IN (?, ?) AND owner IS ?",
+                    (FAILED, _now(), QUEUED, RUNNING, owner),
+                )
+                failed += cur.rowcount
+            return failed
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+
+job_queue = JobQueue()
@@ -0,0 +1,207 @@
+"""
+Core: LLM response cache
+
+Purpose
+- Avoid repeating slow LLM calls when nothing about the employee changed.
+- Entries are keyed on sha256(function, prompt version, model, normalized
+  context), kept in SQLite (`llm_response_cache`) with an in-process LRU in front.
+
+Invalidation
+- A changed context produces a new key, so stale answers are never served.
+- Entries expire after a TTL (LLM_CACHE_TTL_S).
+- `invalidate_employee()` drops an employee's entries explicitly; triggers on
+  `employees` do the same when skills, goals or course enrolments are updated.
+
+Usage
+    @llm_cache.memoize("career_pathway", prompt_version=1, model=DEPLOYMENT,
+                       context_loader=get_employee_context)
+    def get_career_pathway(employee_id: str) -> dict: ...
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.db import connection
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a JSON-serializable value (dict key order does not matter)."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        *,
+        db_url: Optional[str] = None,
+        ttl_s: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.db_url = db_url
+        self.ttl_s = settings.llm_cache_ttl_s if ttl_s is None else ttl_s
+        self.max_entries = settings.llm_cache_max_entries if max_entries is None else max_entries
+        # cache_key -> (expires_at, employee_id, value)
+        self._lru: "OrderedDict[str, Tuple[float, Optional[str], dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+
+    @staticmethod
+    def make_key(function: str, prompt_version: int, model: Optional[str], context: Any) -> str:
+        return fingerprint(
+            {"function": function, "prompt_version": prompt_version, "model": model, "context": context}
+        )
+
+    # ------------------------------------------------------------------
+    # In-memory front
+    # ------------------------------------------------------------------
+    def _remember(self, key: str, expires_at: float, employee_id: Optional[str], value: dict) -> None:
+        with self._lock:
+            self._lru[key] = (expires_at, employee_id, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _recall(self, key: str, now: float) -> Optional[dict]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return entry[2]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        value = self._recall(key, now)
+        if value is not None:
+            return value
+
+        with connection(self.db_url) as conn:
+            row = conn.execute(
+                "SELECT employee_id, response_json, expires_at FROM llm_response_cache "
+                "WHERE cache_key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row["response_json"])
+        self._remember(key, row["expires_at"], row["employee_id"], value)
+        return value
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """`get()` that also counts the hit or miss in `stats()`."""
+        cached = self.get(key)
+        with self._lock:
+            self._stats["hit" if cached is not None else "miss"] += 1
+        return cached
+
+    def set(
+        self,
+        key: str,
+        value: dict,
+        *,
+        function: str,
+        employee_id: Optional[str] = None,
+        model: Optional[str] = None,
+        prompt_version: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+    ) -> None:
+        now = time.time()
+        expires_at = now + (self.ttl_s if ttl_s is None else ttl_s)
+        with connection(self.db_url) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_response_cache
+                    (cache_key, function, employee_id, model, prompt_version,
+                     response_json, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, function, employee_id, model, prompt_version,
+                 json.dumps(value), now, expires_at),
+            )
+        self._remember(key, expires_at, employee_id, value)
+
+    def invalidate_employee(self, employee_id: str) -> int:
+        """Drop every cached response for `employee_id`. Returns rows deleted."""
+        with self._lock:
+            for key in [k for k, entry in self._lru.items() if entry[1] == employee_id]:
+                del self._lru[key]
+        with connection(self.db_url) as conn:
+            cur = conn.execute(
+                "DELETE FROM llm_response_cache WHERE employee_id = ?", (employee_id,)
+            )
+            return cur.rowcount
+
+    def purge_expired(self) -> int:
+        with connection(self.db_url) as conn:
+            cur = conn.execute(
+                "DELETE FROM llm_response_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+        with connection(self.db_url) as conn:
+            conn.execute("DELETE FROM llm_response_cache")
+
+    def memoize(
+        self,
+        function: str,
+        *,
+        prompt_version: int,
+        model: Optional[str],
+        context_loader: Callable[[str], Any],
+    ) -> Callable[[Callable[[str], dict]], Callable[[str], dict]]:
+        """
+        Cache a `fn(employee_id) -> dict` LLM call on the employee's context.
+
+        Only successful results (those with a "json" payload) are stored, so
+        parse failures and errors are retried on the next request.
+        """
+
+        def decorator(fn: Callable[[str], dict]) -> Callable[[str], dict]:
+            @functools.wraps(fn)
+            def wrapper(employee_id: str) -> dict:
+                if not settings.llm_cache_enabled:
+                    return fn(employee_id)
+                key = self.make_key(function, prompt_version, model, context_loader(employee_id))
+                cached = self.lookup(key)
+                if cached is not None:
+                    return cached
+                result = fn(employee_id)
+                if isinstance(result, dict) and "json" in result:
+                    self.set(
+                        key,
+                        result,
+                        function=function,
+                        employee_id=employee_id,
+                        model=model,
+                        prompt_version=prompt_version,
+                    )
+                return result
+
+            wrapper.uncached = fn  # type: ignore[attr-defined]
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hit": self._stats["hit"], "miss": self._stats["miss"], "memory_entries": len(self._lru)}
+
+
+llm_cache = LLMResponseCache()
@@ -0,0 +1,79 @@
+"""
+Core: LLM call metrics
+
+Purpose
+- Record per-function, per-mode latency and token usage of LLM-backed requests
+  so that output modes (e.g. two-pass vs single-pass) can be compared.
+
+Usage
+    with llm_metrics.track("career_pathway", mode="single_pass") as run:
+        ...                        # LLM calls report usage via record_usage()
+        run["repairs"] += 1
+
+    llm_metrics.snapshot()         # {"career_pathway": {"single_pass": {...}}}
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+_current_run: contextvars.ContextVar[Optional[Counter]] = contextvars.ContextVar(
+    "llm_metrics_run", default=None
+)
+
+
+class LLMMetrics:
+    def __init__(self):
+        self._totals: Dict[tuple, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, function: str, *, mode: str) -> Iterator[Counter]:
+        """Attribute every LLM call made inside the block to (function, mode)."""
+        run: Counter = Counter()
+        token = _current_run.set(run)
+        started = time.perf_counter()
+        try:
+            yield run
+        except BaseException:
+            run["errors"] += 1
+            raise
+        finally:
+            _current_run.reset(token)
+            run["latency_ms"] += int((time.perf_counter() - started) * 1000)
+            run["requests"] += 1
+            with self._lock:
+                self._totals[(function, mode)].update(run)
+
+    def record_usage(self, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        """Add one LLM call's usage to the run currently being tracked (if any)."""
+        run = _current_run.get()
+        if run is None:
+            return
+        run["llm_calls"] += 1
+        run["input_tokens"] += int(input_tokens or 0)
+        run["output_tokens"] += int(output_tokens or 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for (function, mode), totals in self._totals.items():
+                requests = totals["requests"] or 1
+                stats = dict(totals)
+                stats["avg_latency_ms"] = round(totals["latency_ms"] / requests, 1)
+                stats["avg_tokens"] = round(
+                    (totals["input_tokens"] + totals["output_tokens"]) / requests, 1
+                )
+                out.setdefault(function, {})[mode] = stats
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+llm_metrics = LLMMetrics()
@@ -0,0 +1,63 @@
+"""
+Core: token-bucket rate limiting
+
+Purpose
+- Keep bursts of concurrent workers under an upstream quota (e.g. LLM
+  requests per minute) by making each call take a token first.
+- Tokens refill continuously at `rate_per_s` up to `capacity`; callers block
+  until a token is available.
+
+Usage
+    bucket = TokenBucket.per_minute(30)
+    bucket.acquire()               # blocks while the bucket is empty
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate_per_s: float,
+        capacity: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive")
+        self.rate_per_s = rate_per_s
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_s)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited_s = 0.0
+
+    @classmethod
+    def per_minute(cls, rate: float, capacity: Optional[float] = None) -> "TokenBucket":
+        return cls(rate / 60.0, capacity)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take `tokens`, sleeping until they are available. Returns seconds waited."""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of capacity {self.capacity}")
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.waited_s += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate_per_s
+            self._sleep(delay)
+            waited += delay
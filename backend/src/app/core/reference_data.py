@@ -0,0 +1,115 @@
+"""
+Core: reference-data cache (skills, departments)
+
+Purpose
+- Skills and departments are tiny and rarely change, yet mentor listings and
+  match scoring resolve their names over and over. Load them once per
+  process and serve O(1) id -> name and name -> id lookups from memory.
+
+Invalidation
+- Triggers on `skills` and `departments` bump `reference_data_versions`
+  (see migration reference_data_versions). Each lookup compares that counter,
+  a single two-row read that is itself memoized per request scope, and
+  reloads only when it changed.
+
+Usage
+    ref = reference_data.snapshot(conn)
+    ref.skill_names["SKILL001"]          # "Python Programming"
+    ref.skill_id("python programming")   # "SKILL001"
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.request_scope import scope_cache
+
+# Distinct databases (one token each) kept in memory at once
+MAX_DATABASES = 16
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    versions: Tuple[Tuple[str, int, str], ...]
+    skill_names: Dict[str, str]
+    department_names: Dict[str, str]
+    skill_ids_by_name: Dict[str, str]
+    department_ids_by_name: Dict[str, str]
+
+    def skill_id(self, name: str) -> Optional[str]:
+        return self.skill_ids_by_name.get(name.strip().lower())
+
+    def department_id(self, name: str) -> Optional[str]:
+        return self.department_ids_by_name.get(name.strip().lower())
+
+
+def _load(conn: sqlite3.Connection, versions: Tuple) -> ReferenceSnapshot:
+    skill_names = {row[0]: row[1] for row in conn.execute("SELECT id, name FROM skills")}
+    department_names = {row[0]: row[1] for row in conn.execute("SELECT id, name FROM departments")}
+    return ReferenceSnapshot(
+        versions=versions,
+        skill_names=skill_names,
+        department_names=department_names,
+        skill_ids_by_name={(name or "").lower(): sid for sid, name in skill_names.items()},
+        department_ids_by_name={(name or "").lower(): did for did, name in department_names.items()},
+    )
+
+
+class ReferenceDataCache:
+    def __init__(self):
+        # database token -> snapshot
+        self._snapshots: "OrderedDict[str, ReferenceSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+
+    def snapshot(self, conn: sqlite3.Connection) -> ReferenceSnapshot:
+        memo = scope_cache("reference_data")
+        if memo is not None and id(conn) in memo:
+            return memo[id(conn)]
+
+        try:
+            versions = tuple(
+                tuple(row)
+                for row in conn.execute(
+                    "SELECT name, version, token FROM reference_data_versions ORDER BY name"
+                )
+            )
+        except sqlite3.OperationalError:
+            # Schema not migrated yet: nothing to validate a cached copy against
+            return _load(conn, ())
+        token = "|".join(row[2] for row in versions)
+
+        with self._lock:
+            cached = self._snapshots.get(token)
+            if cached is not None and cached.versions == versions:
+                self._snapshots.move_to_end(token)
+                self._stats["hit"] += 1
+                snapshot = cached
+            else:
+                snapshot = None
+        if snapshot is None:
+            snapshot = _load(conn, versions)
+            with self._lock:
+                self._stats["load"] += 1
+                self._snapshots[token] = snapshot
+                self._snapshots.move_to_end(token)
+                while len(self._snapshots) > MAX_DATABASES:
+                    self._snapshots.popitem(last=False)
+
+        if memo is not None:
+            memo[id(conn)] = snapshot
+        return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hit": self._stats["hit"], "load": self._stats["load"], "databases": len(self._snapshots)}
+
+
+reference_data = ReferenceDataCache()
@@ -0,0 +1,60 @@
+"""
+Core: request-scoped memoization
+
+Purpose
+- Let lookups that several layers repeat during one request (e.g. the
+  employee context read by the LLM cache key, the prompt builder and the
+  route itself) hit the database once per request.
+- Nothing outlives the request, so there is no invalidation to get wrong.
+
+Usage
+    app.add_middleware(RequestScopeMiddleware)   # one scope per HTTP request
+
+    with request_scope():                        # or explicitly, e.g. in scripts
+        memo = scope_cache("employee_context")   # None outside any scope
+"""
+from __future__ import annotations
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+_scope: contextvars.ContextVar[Optional[Dict[str, Dict[Any, Any]]]] = contextvars.ContextVar(
+    "request_scope", default=None
+)
+
+
+@contextmanager
+def request_scope() -> Iterator[Dict[str, Dict[Any, Any]]]:
+    """Open a memoization scope; nested calls reuse the outer one."""
+    current = _scope.get()
+    if current is not None:
+        yield current
+        return
+    token = _scope.set({})
+    try:
+        yield _scope.get()
+    finally:
+        _scope.reset(token)
+
+
+def scope_cache(namespace: str) -> Optional[Dict[Any, Any]]:
+    """The current scope's dict for `namespace`, or None outside a scope."""
+    current = _scope.get()
+    if current is None:
+        return None
+    return current.setdefault(namespace, {})
+
+
+class RequestScopeMiddleware:
+    """ASGI middleware opening one request_scope per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_scope():
+            await self.app(scope, receive, send)
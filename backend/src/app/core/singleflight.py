@@ -0,0 +1,169 @@
+"""
+Core: single-flight request coalescing
+
+Purpose
+- When many callers ask for the same expensive result at once (e.g. a
+  dashboard opening the same employee's leadership view), run the work once
+  and hand every concurrent caller the same result or exception.
+- Works for sync callers (threads) and async callers (coroutines).
+
+Metrics (see `SingleFlight.stats()`):
+- hit:   the caller was handed the result of another caller's computation
+- wait:  the caller joined a computation already in flight (a hit once that
+         computation succeeds)
+- miss:  the caller ran the function itself
+- error: the shared computation raised
+
+Usage
+    @singleflight.coalesce("leadership_employer")
+    def get_leadership_potential_employer(employee_id: str) -> dict: ...
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn(*args, **kwargs)` unless a call for `key` is in flight; then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["wait"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["miss"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            with self._lock:
+                self._stats["hit"] += 1
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["error"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    # ------------------------------------------------------------------
+    # Async
+    # ------------------------------------------------------------------
+    async def do_async(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Async counterpart of `do`.
+
+        Coroutine functions are coalesced per event loop. Plain functions run
+        in a worker thread through `do`, so they also coalesce with sync callers.
+        """
+        if not inspect.iscoroutinefunction(fn):
+            return await asyncio.to_thread(self.do, key, fn, *args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            if future is not None:
+                self._stats["wait"] += 1
+                leader = False
+            else:
+                future = self._async_calls[loop_key] = loop.create_future()
+                self._stats["miss"] += 1
+                leader = True
+
+        if not leader:
+            # shield: one waiter being cancelled must not cancel the others
+            result = await asyncio.shield(future)
+            with self._lock:
+                self._stats["hit"] += 1
+            return result
+
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._stats["error"] += 1
+                self._async_calls.pop(loop_key, None)
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so an unawaited future does not log a warning
+                future.exception()
+            raise
+        with self._lock:
+            self._async_calls.pop(loop_key, None)
+        future.set_result(result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Decorator / metrics
+    # ------------------------------------------------------------------
+    def coalesce(self, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorate a sync or async function; calls are keyed by (name, args, kwargs)."""
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+            def make_key(args: tuple, kwargs: dict) -> Hashable:
+                return (label, args, tuple(sorted(kwargs.items())))
+
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    return await self.do_async(make_key(args, kwargs), fn, *args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                return self.do(make_key(args, kwargs), fn, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hit": self._stats["hit"],
+                "miss": self._stats["miss"],
+                "wait": self._stats["wait"],
+                "error": self._stats["error"],
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+
+singleflight = SingleFlight()
@@ -0,0 +1,221 @@
+"""
+Core: vectorstore registry
+
+Purpose
+- Load vector stores lazily (first use or a background startup task) so that
+  importing agent modules never blocks on a FAISS load or an embedding rebuild.
+- Serve requests from the current store reference; a reload builds the new
+  store off to the side and swaps the reference only once it is ready.
+- Hot-reload a store when its index on disk changes.
+
+Usage
+    from app.core.vectorstore import registry
+
+    handle = registry.register("courses", build_or_load_vectorstore, watch_path=INDEX_DIR)
+    store = handle.get(timeout=30)      # blocks until the first load finishes
+    registry.status()                   # readiness snapshot for /health
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+Fingerprint = Optional[Tuple[Tuple[str, int, int], ...]]
+
+
+class VectorStoreNotReady(RuntimeError):
+    """Raised when a store is still loading (or failed to load) and cannot serve."""
+
+
+def index_fingerprint(path: Optional[Path]) -> Fingerprint:
+    """Cheap change detector for an index file or directory (names, sizes, mtimes)."""
+    if path is None or not path.exists():
+        return None
+    files = sorted(p for p in path.iterdir() if p.is_file()) if path.is_dir() else [path]
+    entries = []
+    for file in files:
+        stat = file.stat()
+        entries.append((file.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(entries)
+
+
+class VectorStoreHandle:
+    """A single lazily loaded, hot-swappable store."""
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        *,
+        watch_path: Optional[Path] = None,
+        reload_interval: float = 30.0,
+    ):
+        self.name = name
+        self._loader = loader
+        self._watch_path = Path(watch_path) if watch_path else None
+        self._reload_interval = reload_interval
+
+        self._store: Any = None
+        self._state = "idle"  # idle | loading | ready | failed
+        self._error: Optional[str] = None
+        self._loaded_at: Optional[str] = None
+        self._fingerprint: Fingerprint = None
+        self._last_check = 0.0
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def start(self) -> bool:
+        """Begin loading in the background. Returns False if a load is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            if self._store is None:
+                self._ready.clear()
+                self._state = "loading"
+            self._thread = threading.Thread(
+                target=self._load, name=f"vectorstore-{self.name}", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _load(self) -> None:
+        try:
+            store = self._loader()
+        except Exception as e:
+            print(f"Vectorstore '{self.name}' failed to load: {e}")
+            with self._lock:
+                self._error = str(e)
+                # Keep serving the previous store if this was a reload
+                self._state = "ready" if self._store is not None else "failed"
+            self._ready.set()
+            return
+
+        # Fingerprint after loading: a rebuild may have just written the index
+        fingerprint = index_fingerprint(self._watch_path)
+        with self._lock:
+            self._store = store
+            self._fingerprint = fingerprint
+            self._state = "ready"
+            self._error = None
+            self._loaded_at = datetime.now(timezone.utc).isoformat()
+            self._last_check = time.monotonic()
+        self._ready.set()
+
+    def reload(self, *, wait: bool = False, timeout: Optional[float] = None) -> None:
+        """Rebuild the store in the background; readers keep the old one until it is ready."""
+        self.start()
+        if wait and self._thread is not None:
+            self._thread.join(timeout)
+
+    def _maybe_reload(self) -> None:
+        if self._watch_path is None or self._store is None:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self._reload_interval:
+            return
+        self._last_check = now
+        if index_fingerprint(self._watch_path) != self._fingerprint:
+            print(f"Vectorstore '{self.name}' index changed on disk, reloading...")
+            self.start()
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Return the current store, starting a load on first use.
+
+        Raises:
+            VectorStoreNotReady: if no store is available within `timeout` seconds.
+        """
+        store = self._store
+        if store is not None:
+            self._maybe_reload()
+            return store
+
+        if self._state in ("idle", "failed"):
+            self.start()
+        if not self._ready.wait(timeout):
+            raise VectorStoreNotReady(f"Vectorstore '{self.name}' is still loading")
+        store = self._store
+        if store is None:
+            raise VectorStoreNotReady(
+                f"Vectorstore '{self.name}' failed to load: {self._error}"
+            )
+        return store
+
+    @property
+    def ready(self) -> bool:
+        return self._store is not None
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            reloading = self._store is not None and self._thread is not None and self._thread.is_alive()
+            return {
+                "state": self._state,
+                "ready": self._store is not None,
+                "reloading": reloading,
+                "loaded_at": self._loaded_at,
+                "error": self._error,
+            }
+
+
+class VectorStoreRegistry:
+    """Process-wide collection of named vector store handles."""
+
+    def __init__(self):
+        self._handles: Dict[str, VectorStoreHandle] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        *,
+        watch_path: Optional[Path] = None,
+        reload_interval: Optional[float] = None,
+    ) -> VectorStoreHandle:
+        """Register (or return the already registered) handle for `name`."""
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is None:
+                handle = VectorStoreHandle(
+                    name,
+                    loader,
+                    watch_path=watch_path,
+                    reload_interval=(
+                        settings.vectorstore_reload_interval_s
+                        if reload_interval is None
+                        else reload_interval
+                    ),
+                )
+                self._handles[name] = handle
+            return handle
+
+    def get(self, name: str) -> VectorStoreHandle:
+        return self._handles[name]
+
+    def start_all(self) -> None:
+        """Kick off background loads for every registered store (non-blocking)."""
+        for handle in list(self._handles.values()):
+            if not handle.ready:
+                handle.start()
+
+    def all_ready(self) -> bool:
+        return all(handle.ready for handle in self._handles.values())
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: handle.status() for name, handle in self._handles.items()}
+
+
+registry = VectorStoreRegistry()
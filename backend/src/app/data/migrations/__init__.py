@@ -2,3 +2,21 @@
 
 from .position_level import ensure_position_level_column  # noqa: F401
 from .mentor_match_requests import ensure_mentor_request_history_schema  # noqa: F401
+from .employee_skills import ensure_employee_skills_table  # noqa: F401
+from .embedding_cache import ensure_embedding_cache_table  # noqa: F401
+from .llm_response_cache import ensure_llm_response_cache_table  # noqa: F401
+from .jobs import ensure_jobs_table  # noqa: F401
+from .employee_insights import ensure_employee_insights_tables  # noqa: F401
+from .insights_fingerprint import ensure_insights_fingerprint_columns  # noqa: F401
+from .leadership_predictions_index import ensure_leadership_predictions_index  # noqa: F401
+from .reference_data_versions import ensure_reference_data_versions  # noqa: F401
+from .insights_aggregates import ensure_insights_aggregates_tables  # noqa: F401
+from .data_versions import ensure_data_versions  # noqa: F401
+from .insights_typed_storage import ensure_insights_typed_storage  # noqa: F401
+from .leadership_scoring_runs import ensure_leadership_scoring_runs  # noqa: F401
+from .runner import (  # noqa: F401
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    get_schema_version,
+    run_migrations,
+)
@@ -0,0 +1,51 @@
+"""Per-table data versions, bumped on every write (used for HTTP ETags)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+VERSIONED_TABLES = (
+    "departments",
+    "employee_insights",
+    "employee_skills",
+    "employees",
+    "leadership_potential_predictions",
+    "skills",
+)
+
+
+def ensure_data_versions(conn: sqlite3.Connection) -> None:
+    """
+    Create data_versions and the triggers that bump it.
+
+    Like reference_data_versions, `token` is random per database so that a
+    version number is never mistaken for another database's.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            token TEXT NOT NULL
+        )
+        """
+    )
+    for table in VERSIONED_TABLES:
+        cur.execute(
+            "INSERT OR IGNORE INTO data_versions (name, version, token) "
+            "VALUES (?, 0, lower(hex(randomblob(8))))",
+            (table,),
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_data_version_{event.lower()};")
+            cur.execute(
+                f"""
+                CREATE TRIGGER trg_{table}_data_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+                END
+                """
+            )
+    conn.commit()
@@ -0,0 +1,22 @@
+"""Persistent embedding cache keyed by (model, sha256 of the embedded text)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_embedding_cache_table(conn: sqlite3.Connection) -> None:
+    """Create embedding_cache. Vectors are stored as raw float32 BLOBs."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            model TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vector BLOB NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (model, content_hash)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.commit()
@@ -0,0 +1,55 @@
+"""Employee insights table and the checkpoints of the batch pipeline that fills it."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_employee_insights_tables(conn: sqlite3.Connection) -> None:
+    """Create employee_insights plus per-run pipeline bookkeeping tables."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS employee_insights (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            department_id TEXT,
+            role TEXT,
+            level TEXT,
+            years_with_company REAL,
+            skills TEXT,
+            goals TEXT,
+            courses_enrolled TEXT,
+            leadership_json TEXT,
+            leadership_summary TEXT,
+            career_pathway_json TEXT,
+            career_pathway_summary TEXT,
+            courses_recommended_json TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS employee_insights_runs (
+            run_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'running',
+            total INTEGER NOT NULL DEFAULT 0,
+            started_at TEXT NOT NULL,
+            finished_at TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS employee_insights_checkpoints (
+            run_id TEXT NOT NULL,
+            employee_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT,
+            duration_ms INTEGER,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (run_id, employee_id)
+        )
+        """
+    )
+    conn.commit()
@@ -0,0 +1,102 @@
+"""Normalized employee_skills table kept in sync with employees.skills_map."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def _skills_object(column: str) -> str:
+    """
+    SQL expression yielding the skills JSON object stored in `column`, or '{}'.
+
+    Some seeded rows hold a JSON string that itself encodes the object, so one
+    level of string encoding is unwrapped.
+    """
+    inner = f"json_extract({column}, '$')"
+    return f"""
+        CASE
+            WHEN json_valid({column}) AND json_type({column}) = 'object'
+            THEN {column}
+            WHEN json_valid({column}) AND json_type({column}) = 'text'
+                 AND json_valid({inner}) AND json_type({inner}) = 'object'
+            THEN {inner}
+            ELSE '{{}}'
+        END
+    """
+
+
+# Rebuilds one employee's rows from skills_map. Deleting first also covers
+# INSERT OR REPLACE, which does not fire DELETE triggers by default.
+_SYNC_FROM_NEW = f"""
+    DELETE FROM employee_skills WHERE employee_id = NEW.id;
+    INSERT OR REPLACE INTO employee_skills (employee_id, skill_id, proficiency)
+    SELECT NEW.id, je.key, je.value
+    FROM json_each({_skills_object("NEW.skills_map")}) AS je;
+"""
+
+
+def ensure_employee_skills_table(conn: sqlite3.Connection) -> None:
+    """
+    Create employee_skills, its covering index and sync triggers, then backfill.
+
+    The triggers keep the table consistent for every writer of employees
+    (repositories, seeders and raw SQL alike).
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS employee_skills (
+            employee_id TEXT NOT NULL,
+            skill_id TEXT NOT NULL,
+            proficiency INTEGER,
+            PRIMARY KEY (employee_id, skill_id)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_employee_skills_skill "
+        "ON employee_skills(skill_id, employee_id, proficiency);"
+    )
+
+    cur.execute("DROP TRIGGER IF EXISTS trg_employee_skills_insert;")
+    cur.execute("DROP TRIGGER IF EXISTS trg_employee_skills_update;")
+    cur.execute("DROP TRIGGER IF EXISTS trg_employee_skills_delete;")
+    cur.execute(
+        f"""
+        CREATE TRIGGER trg_employee_skills_insert
+        AFTER INSERT ON employees
+        BEGIN
+            {_SYNC_FROM_NEW}
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER trg_employee_skills_update
+        AFTER UPDATE OF id, skills_map ON employees
+        BEGIN
+            DELETE FROM employee_skills WHERE employee_id = OLD.id;
+            {_SYNC_FROM_NEW}
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER trg_employee_skills_delete
+        AFTER DELETE ON employees
+        BEGIN
+            DELETE FROM employee_skills WHERE employee_id = OLD.id;
+        END
+        """
+    )
+
+    # Backfill rows written before the triggers existed.
+    cur.execute("DELETE FROM employee_skills;")
+    cur.execute(
+        f"""
+        INSERT OR REPLACE INTO employee_skills (employee_id, skill_id, proficiency)
+        SELECT e.id, je.key, je.value
+        FROM employees AS e, json_each({_skills_object("e.skills_map")}) AS je
+        """
+    )
+    conn.commit()
@@ -0,0 +1,91 @@
+"""Materialized analytics aggregates over employee_insights."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_insights_aggregates_tables(conn: sqlite3.Connection) -> None:
+    """
+    Create the analytics summary tables and the triggers that queue changed
+    employee_insights rows for incremental refresh.
+
+    - insights_derived: per-employee parsed values (facets, leadership score).
+    - insights_facet_counts: employee counts per (facet, value), e.g. ("skill", "Python").
+    - insights_group_stats: per role / department totals for averages.
+    - insights_aggregates_dirty: employee ids changed since the last refresh.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS insights_derived (
+            employee_id TEXT PRIMARY KEY,
+            name TEXT,
+            role TEXT,
+            department_id TEXT,
+            level TEXT,
+            years_with_company REAL,
+            num_skills INTEGER NOT NULL DEFAULT 0,
+            leadership_score REAL,
+            leadership_category TEXT NOT NULL,
+            facets_json TEXT NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_insights_derived_category "
+        "ON insights_derived(leadership_category)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_insights_derived_years "
+        "ON insights_derived(years_with_company DESC)"
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS insights_facet_counts (
+            facet TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (facet, value)
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_insights_facet_counts_rank "
+        "ON insights_facet_counts(facet, count DESC)"
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS insights_group_stats (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            employees INTEGER NOT NULL DEFAULT 0,
+            skills_total REAL NOT NULL DEFAULT 0,
+            years_total REAL NOT NULL DEFAULT 0,
+            years_n INTEGER NOT NULL DEFAULT 0,
+            leadership_total REAL NOT NULL DEFAULT 0,
+            leadership_n INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, key)
+        )
+        """
+    )
+    cur.execute(
+        "CREATE TABLE IF NOT EXISTS insights_aggregates_dirty (employee_id TEXT PRIMARY KEY)"
+    )
+    for event, refs in (("INSERT", ("NEW",)), ("UPDATE", ("OLD", "NEW")), ("DELETE", ("OLD",))):
+        body = "".join(
+            f"INSERT OR IGNORE INTO insights_aggregates_dirty (employee_id) VALUES ({ref}.id);"
+            for ref in refs
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_employee_insights_{event.lower()}_aggregates
+            AFTER {event} ON employee_insights
+            BEGIN {body} END
+            """
+        )
+    # Rows written before this migration are folded in on the first refresh
+    cur.execute(
+        "INSERT OR IGNORE INTO insights_aggregates_dirty (employee_id) SELECT id FROM employee_insights"
+    )
+    conn.commit()
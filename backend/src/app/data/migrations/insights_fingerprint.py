@@ -0,0 +1,17 @@
+"""Track the inputs each employee_insights row was computed from."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_insights_fingerprint_columns(conn: sqlite3.Connection) -> None:
+    """Add input_fingerprint / refreshed_at to employee_insights if missing."""
+    cur = conn.cursor()
+    cur.execute("PRAGMA table_info(employee_insights);")
+    columns = {row[1] for row in cur.fetchall()}
+    if "input_fingerprint" not in columns:
+        cur.execute("ALTER TABLE employee_insights ADD COLUMN input_fingerprint TEXT")
+    if "refreshed_at" not in columns:
+        cur.execute("ALTER TABLE employee_insights ADD COLUMN refreshed_at TEXT")
+    conn.commit()
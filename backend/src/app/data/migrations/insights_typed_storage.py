@@ -0,0 +1,197 @@
+"""Typed leadership columns and exploded child tables for employee_insights."""
+
+from __future__ import annotations
+
+import sqlite3
+
+TYPED_COLUMNS = {
+    "leadership_score": "REAL",
+    "leadership_category": "TEXT",
+    "experience_score": "REAL",
+    "learning_engagement_score": "REAL",
+    "soft_skills_score": "REAL",
+    "strategic_outlook_score": "REAL",
+}
+CHILD_TABLES = ("insight_skills", "insight_goals", "insight_courses", "insight_recommendations")
+
+
+def _numeric(path: str) -> str:
+    return (
+        f"CASE WHEN json_type(leadership_json, '{path}') IN ('integer', 'real') "
+        f"THEN json_extract(leadership_json, '{path}') END"
+    )
+
+
+def _label(value: str = "j.value", type_: str = "j.type") -> str:
+    """
+    SQL twin of app.services.insight_records._label for one json_each item:
+    dicts give their first non-empty title / name / id, scalars their text.
+    Nested arrays yield NULL (skipped).
+    """
+    fields = ", ".join(
+        f"NULLIF(NULLIF(json_extract({value}, '$.{key}'), ''), 0)" for key in ("title", "name", "id")
+    )
+    return (
+        f"CASE WHEN {type_} = 'object' THEN CAST(COALESCE({fields}) AS TEXT) "
+        f"WHEN {type_} = 'true' THEN 'True' WHEN {type_} = 'false' THEN 'False' "
+        f"WHEN {type_} IN ('integer', 'real', 'text') THEN CAST({value} AS TEXT) END"
+    )
+
+
+def _backfill_insight_children(cur: sqlite3.Cursor) -> None:
+    """
+    Rebuild every insight_* row from the JSON columns of employee_insights,
+    matching what app.services.insight_records.child_rows writes: labels as
+    `_label`, 0-based contiguous positions for skills / goals and list
+    indexes for recommendations.
+    """
+    for table in CHILD_TABLES:
+        cur.execute(f"DELETE FROM {table}")
+    # Skills / goals: list items (or dict keys, or a single scalar) in
+    # document order; json_each ids increase in that order
+    for table, value_column, source in (
+        ("insight_skills", "skill", "skills"),
+        ("insight_goals", "goal", "goals"),
+    ):
+        cur.execute(
+            f"""
+            INSERT INTO {table} (employee_id, position, {value_column})
+            SELECT employee_id, row_number() OVER (PARTITION BY employee_id ORDER BY item) - 1, label
+            FROM (
+                SELECT e.id AS employee_id, j.id AS item,
+                       CASE WHEN json_type(e.{source}) = 'object' THEN j.key ELSE {_label()} END AS label
+                FROM employee_insights AS e, json_each(e.{source}) AS j
+                WHERE json_valid(e.{source})
+                  AND NOT (json_type(e.{source}) = 'text' AND json_extract(e.{source}, '$') = '')
+            )
+            WHERE label IS NOT NULL
+            """
+        )
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO insight_courses (employee_id, course_id, status)
+        SELECT e.id, j.key,
+               CASE j.type WHEN 'null' THEN NULL WHEN 'true' THEN 'True' WHEN 'false' THEN 'False'
+                           ELSE CAST(j.value AS TEXT) END
+        FROM employee_insights AS e, json_each(e.courses_enrolled) AS j
+        WHERE json_valid(e.courses_enrolled) AND json_type(e.courses_enrolled) = 'object'
+        """
+    )
+    cur.execute(
+        f"""
+        INSERT INTO insight_recommendations (employee_id, position, course_id, title, url, score)
+        SELECT e.id, j.key,
+               CASE WHEN j.type = 'object' THEN json_extract(j.value, '$.id') END,
+               {_label()},
+               CASE WHEN j.type = 'object' THEN json_extract(j.value, '$.url') END,
+               CASE WHEN j.type = 'object' AND json_type(j.value, '$.score') IN ('integer', 'real')
+                    THEN CAST(json_extract(j.value, '$.score') AS REAL) END
+        FROM employee_insights AS e, json_each(e.courses_recommended_json) AS j
+        WHERE json_valid(e.courses_recommended_json) AND json_type(e.courses_recommended_json) = 'array'
+          AND {_label()} IS NOT NULL
+        """
+    )
+
+
+def ensure_insights_typed_storage(conn: sqlite3.Connection) -> None:
+    """
+    Add typed leadership columns to employee_insights and create
+    insight_skills / insight_goals / insight_courses / insight_recommendations.
+
+    Existing rows are backfilled with SQLite's JSON functions. Scores that
+    only exist as free text ("7/10, strong tenure") are left NULL until the
+    row is next written by the insights pipeline.
+    """
+    cur = conn.cursor()
+    cur.execute("PRAGMA table_info(employee_insights);")
+    columns = {row[1] for row in cur.fetchall()}
+    for column, sql_type in TYPED_COLUMNS.items():
+        if column not in columns:
+            cur.execute(f"ALTER TABLE employee_insights ADD COLUMN {column} {sql_type}")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_employee_insights_leadership "
+        "ON employee_insights(leadership_category, leadership_score)"
+    )
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS insight_skills (
+            employee_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            skill TEXT NOT NULL,
+            PRIMARY KEY (employee_id, position)
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS insight_goals (
+            employee_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            goal TEXT NOT NULL,
+            PRIMARY KEY (employee_id, position)
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS insight_courses (
+            employee_id TEXT NOT NULL,
+            course_id TEXT NOT NULL,
+            status TEXT,
+            PRIMARY KEY (employee_id, course_id)
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS insight_recommendations (
+            employee_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            course_id TEXT,
+            title TEXT NOT NULL,
+            url TEXT,
+            score REAL,
+            PRIMARY KEY (employee_id, position)
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_insight_skills_skill ON insight_skills(skill)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_insight_goals_goal ON insight_goals(goal)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_insight_courses_course ON insight_courses(course_id)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_insight_recommendations_title ON insight_recommendations(title)"
+    )
+
+    # INSERT OR REPLACE does not fire delete triggers; writers rewrite the
+    # child rows themselves (see app.services.insight_records)
+    body = " ".join(f"DELETE FROM {table} WHERE employee_id = OLD.id;" for table in CHILD_TABLES)
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_employee_insights_delete_children
+        AFTER DELETE ON employee_insights
+        BEGIN {body} END
+        """
+    )
+
+    # Backfill rows written before this migration
+    cur.execute(
+        f"""
+        UPDATE employee_insights SET
+            leadership_score = {_numeric('$.overall_potential_score')},
+            leadership_category = CASE
+                WHEN json_extract(leadership_json, '$.potential_category') IN ('Low', 'Mid', 'High')
+                THEN json_extract(leadership_json, '$.potential_category') END,
+            experience_score = {_numeric('$.leadership_factors.experience')},
+            learning_engagement_score = {_numeric('$.leadership_factors.learning_engagement')},
+            soft_skills_score = {_numeric('$.leadership_factors.soft_skills_alignment')},
+            strategic_outlook_score = {_numeric('$.leadership_factors.strategic_outlook')}
+        WHERE json_valid(leadership_json)
+        """
+    )
+    _backfill_insight_children(cur)
+    # Aggregate facets are now derived from the child rows: re-derive everyone
+    cur.execute(
+        "INSERT OR IGNORE INTO insights_aggregates_dirty (employee_id) SELECT id FROM employee_insights"
+    )
+    conn.commit()
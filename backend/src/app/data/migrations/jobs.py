@@ -0,0 +1,35 @@
+"""Background job records for long-running (LLM-heavy) requests."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_jobs_table(conn: sqlite3.Connection) -> None:
+    """Create jobs and the index used to find an identical in-flight job."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            employee_id TEXT,
+            dedup_key TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            owner TEXT,
+            result_json TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            duration_ms INTEGER
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_jobs_dedup_status
+        ON jobs (dedup_key, status)
+        """
+    )
+    conn.commit()
@@ -0,0 +1,14 @@
+"""Index leadership_potential_predictions for per-model-version lookups."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_leadership_predictions_index(conn: sqlite3.Connection) -> None:
+    """Scores are read and replaced one model_version at a time."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_leadership_predictions_version "
+        "ON leadership_potential_predictions(model_version, employee_id);"
+    )
+    conn.commit()
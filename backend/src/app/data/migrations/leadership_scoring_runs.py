@@ -0,0 +1,22 @@
+"""Record which input versions the stored leadership predictions were computed from."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_leadership_scoring_runs(conn: sqlite3.Connection) -> None:
+    """
+    One row per model_version: the data_versions of the scorer's input tables
+    and the day the scores were computed (tenure is measured against it).
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS leadership_scoring_runs (
+            model_version TEXT PRIMARY KEY,
+            inputs_version TEXT NOT NULL,
+            scored_on TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
@@ -0,0 +1,52 @@
+"""Persistent cache of LLM responses keyed by a context fingerprint."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def ensure_llm_response_cache_table(conn: sqlite3.Connection) -> None:
+    """
+    Create llm_response_cache and triggers that drop an employee's entries
+    when their skills, goals or course enrolments change.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            function TEXT NOT NULL,
+            employee_id TEXT,
+            model TEXT,
+            prompt_version INTEGER,
+            response_json TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_llm_response_cache_employee
+        ON llm_response_cache (employee_id)
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_llm_cache_employee_update
+        AFTER UPDATE OF skills_map, goals_set, courses_enrolled_map ON employees
+        BEGIN
+            DELETE FROM llm_response_cache WHERE employee_id = NEW.id;
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_llm_cache_employee_delete
+        AFTER DELETE ON employees
+        BEGIN
+            DELETE FROM llm_response_cache WHERE employee_id = OLD.id;
+        END
+        """
+    )
+    conn.commit()
@@ -0,0 +1,45 @@
+"""Version counters for small reference tables (skills, departments)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+REFERENCE_TABLES = ("skills", "departments")
+
+
+def ensure_reference_data_versions(conn: sqlite3.Connection) -> None:
+    """
+    Create reference_data_versions and the triggers that bump it.
+
+    `token` is random per database, so caches shared across databases never
+    mistake one database's counter for another's.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reference_data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            token TEXT NOT NULL
+        )
+        """
+    )
+    for table in REFERENCE_TABLES:
+        cur.execute(
+            "INSERT OR IGNORE INTO reference_data_versions (name, version, token) "
+            "VALUES (?, 0, lower(hex(randomblob(8))))",
+            (table,),
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version_{event.lower()};")
+            cur.execute(
+                f"""
+                CREATE TRIGGER trg_{table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE reference_data_versions SET version = version + 1
+                    WHERE name = '{table}';
+                END
+                """
+            )
+    conn.commit()
@@ -0,0 +1,82 @@
+"""Versioned schema migrations keyed on SQLite's `PRAGMA user_version`."""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from .data_versions import ensure_data_versions
+from .embedding_cache import ensure_embedding_cache_table
+from .employee_insights import ensure_employee_insights_tables
+from .employee_skills import ensure_employee_skills_table
+from .insights_aggregates import ensure_insights_aggregates_tables
+from .insights_fingerprint import ensure_insights_fingerprint_columns
+from .insights_typed_storage import ensure_insights_typed_storage
+from .jobs import ensure_jobs_table
+from .leadership_predictions_index import ensure_leadership_predictions_index
+from .leadership_scoring_runs import ensure_leadership_scoring_runs
+from .llm_response_cache import ensure_llm_response_cache_table
+from .mentor_match_requests import ensure_mentor_request_history_schema
+from .position_level import ensure_position_level_column
+from .reference_data_versions import ensure_reference_data_versions
+from .schema import create_base_schema
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+# Append-only: never renumber or edit a migration once it has shipped.
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "base_schema", create_base_schema),
+    Migration(2, "mentor_request_history", ensure_mentor_request_history_schema),
+    Migration(3, "employee_position_level", ensure_position_level_column),
+    Migration(4, "employee_skills", ensure_employee_skills_table),
+    Migration(5, "embedding_cache", ensure_embedding_cache_table),
+    Migration(6, "llm_response_cache", ensure_llm_response_cache_table),
+    Migration(7, "jobs", ensure_jobs_table),
+    Migration(8, "employee_insights", ensure_employee_insights_tables),
+    Migration(9, "insights_fingerprint", ensure_insights_fingerprint_columns),
+    Migration(10, "leadership_predictions_index", ensure_leadership_predictions_index),
+    Migration(11, "reference_data_versions", ensure_reference_data_versions),
+    Migration(12, "insights_aggregates", ensure_insights_aggregates_tables),
+    Migration(13, "data_versions", ensure_data_versions),
+    Migration(14, "insights_typed_storage", ensure_insights_typed_storage),
+    Migration(15, "leadership_scoring_runs", ensure_leadership_scoring_runs),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+def _set_schema_version(conn: sqlite3.Connection, version: int) -> None:
+    # PRAGMA does not accept bound parameters; version is always an int.
+    conn.execute(f"PRAGMA user_version = {int(version)};")
+    conn.commit()
+
+
+def run_migrations(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply every migration newer than the database's user_version.
+
+    Returns:
+        Versions applied during this call (empty when already current).
+    """
+    applied: List[int] = []
+    for migration in MIGRATIONS:
+        # Re-read each time so a concurrent process that migrated first wins.
+        if migration.version <= get_schema_version(conn):
+            continue
+        migration.apply(conn)
+        if conn.in_transaction:
+            conn.commit()
+        _set_schema_version(conn, migration.version)
+        applied.append(migration.version)
+    return applied
@@ -2,11 +2,25 @@
 BaseRepository: Abstract base class for all repositories.
 Provides common CRUD operations and connection management.
 """
-from typing import Any, Generic, List, Optional, TypeVar
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
 import sqlite3
 
 T = TypeVar("T")
 
+# Stay well below SQLite's host-parameter limit (999 on older builds).
+MAX_IN_PARAMS = 500
+
+
+def chunked(values: List[Any], size: int = MAX_IN_PARAMS) -> Iterator[List[Any]]:
+    """Yield successive slices of at most `size` items."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def unique_ids(ids: Iterable[Any]) -> List[Any]:
+    """De-duplicate ids (dropping None) while preserving first-seen order."""
+    return list(dict.fromkeys(i for i in ids if i is not None))
+
 def dict_factory(cursor, row):
     """Convert sqlite3.Row to dict"""
     fields = [column[0] for column in cursor.description]
@@ -24,6 +38,23 @@ class BaseRepository(Generic[T]):
         row = cur.fetchone()
         return dict(row) if row else None
 
+    def get_many(self, table: str, id_field: str, ids: Iterable[Any]) -> List[dict]:
+        """Fetch rows for many ids using chunked `IN (...)` queries."""
+        wanted = unique_ids(ids)
+        rows: List[dict] = []
+        cur = self.conn.cursor()
+        for chunk in chunked(wanted, MAX_IN_PARAMS):
+            placeholders = ",".join(["?"] * len(chunk))
+            cur.execute(
+                f"SELECT * FROM {table} WHERE {id_field} IN ({placeholders})", tuple(chunk)
+            )
+            rows.extend(dict(row) for row in cur.fetchall())
+        return rows
+
+    def map_by_ids(self, table: str, id_field: str, ids: Iterable[Any]) -> Dict[Any, dict]:
+        """Like get_many, but keyed by id. Missing ids are simply absent."""
+        return {row[id_field]: row for row in self.get_many(table, id_field, ids)}
+
     def list_all(self, table: str) -> List[dict]:
         cur = self.conn.cursor()
         cur.execute(f"SELECT * FROM {table}")
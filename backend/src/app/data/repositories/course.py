@@ -4,12 +4,53 @@ Automatically syncs with courses.json at startup.
 """
 from typing import Optional, List, Dict, Any
 import sqlite3
-import json
 from pathlib import Path
 from .base import BaseRepository
+from ..utils.seed_sync import SeedSpec, sync_seed
 
 JSON_FILE = Path(__file__).parent.parent / "seeds" / "courses.json"
 
+COURSE_COLUMNS = (
+    "id", "title", "description", "difficulty", "duration_weeks",
+    "effort_hours_week", "points_reward", "roi", "url", "active",
+)
+
+
+def _ensure_url_column(conn: sqlite3.Connection) -> None:
+    # The base schema predates course URLs.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(courses)")}
+    if "url" not in columns:
+        conn.execute("ALTER TABLE courses ADD COLUMN url TEXT")
+
+
+COURSE_SEED = SeedSpec(
+    name="courses",
+    path=JSON_FILE,
+    table="courses",
+    columns=COURSE_COLUMNS,
+    key_columns=("id",),
+    create_sql="""
+        CREATE TABLE IF NOT EXISTS courses (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            difficulty TEXT,
+            duration_weeks INTEGER,
+            effort_hours_week INTEGER,
+            points_reward INTEGER,
+            roi TEXT,
+            url TEXT,
+            active INTEGER DEFAULT 1
+        )
+    """,
+    to_row=lambda c: (
+        c["id"], c["title"], c["description"], c["difficulty"],
+        c["duration_weeks"], c["effort_hours_week"], c["points_reward"],
+        c["roi"], c["url"], c.get("active", 1),
+    ),
+    prepare=_ensure_url_column,
+)
+
 class CourseRepository(BaseRepository):
     TABLE = "courses"
     ID_FIELD = "id"
@@ -21,52 +62,17 @@ class CourseRepository(BaseRepository):
             self.sync_from_json()
 
     def sync_from_json(self):
-        """Load courses.json and sync the database table."""
+        """Sync the courses table with courses.json, applying only what changed."""
         if not JSON_FILE.exists():
             print(f"Warning: {JSON_FILE} does not exist.")
             return
 
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
-            courses = json.load(f)
-
-        cur = self.conn.cursor()
-        
-        # Drop existing table completely
-        cur.execute(f"DROP TABLE IF EXISTS {self.TABLE}")
-        
-        # Create fresh table with correct schema matching JSON
-        cur.execute(f"""
-            CREATE TABLE {self.TABLE} (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                description TEXT,
-                difficulty TEXT,
-                duration_weeks INTEGER,
-                effort_hours_week INTEGER,
-                points_reward INTEGER,
-                roi TEXT,
-                url TEXT,
-                active INTEGER DEFAULT 1
+        result = sync_seed(self.conn, COURSE_SEED)
+        if not result.skipped:
+            print(
+                f"Synced courses from JSON into {self.TABLE} "
+                f"(+{result.inserted} ~{result.updated} -{result.deleted})."
             )
-        """)
-        self.conn.commit()
-
-        # Insert all data from JSON
-        query = f"""
-            INSERT INTO {self.TABLE}
-            (id, title, description, difficulty, duration_weeks, effort_hours_week,
-             points_reward, roi, url, active)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        data = [
-            (c["id"], c["title"], c["description"], c["difficulty"],
-             c["duration_weeks"], c["effort_hours_week"], c["points_reward"],
-             c["roi"], c["url"], c.get("active", 1))
-            for c in courses
-        ]
-        cur.executemany(query, data)
-        self.conn.commit()
-        print(f"Synced {len(data)} courses from JSON into {self.TABLE}.")
 
     def get_course(self, course_id: str) -> Optional[dict]:
         """Retrieve a single course by ID."""
@@ -4,12 +4,28 @@ Automatically syncs with course_skills.json at startup.
 """
 from typing import List, Dict, Any
 import sqlite3
-import json
 from pathlib import Path
 from .base import BaseRepository
+from ..utils.seed_sync import SeedSpec, sync_seed
 
 JSON_FILE = Path(__file__).parent.parent / "seeds" / "course_skills.json"
 
+COURSE_SKILL_SEED = SeedSpec(
+    name="course_skills",
+    path=JSON_FILE,
+    table="course_skills",
+    columns=("course_id", "skill_id", "weight"),
+    key_columns=("course_id", "skill_id"),
+    create_sql="""
+        CREATE TABLE IF NOT EXISTS course_skills (
+            course_id TEXT,
+            skill_id TEXT,
+            weight INTEGER
+        )
+    """,
+    to_row=lambda cs: (cs["course_id"], cs["skill_id"], cs["weight"]),
+)
+
 class CourseSkillRepository(BaseRepository):
     TABLE = "course_skills"
 
@@ -20,34 +36,17 @@ class CourseSkillRepository(BaseRepository):
             self.sync_from_json()
 
     def sync_from_json(self):
-        """Load course_skills.json and sync the database table."""
+        """Sync the course_skills table with course_skills.json, applying only what changed."""
         if not JSON_FILE.exists():
             print(f"Warning: {JSON_FILE} does not exist.")
             return
 
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
-            course_skills = json.load(f)
-
-        # Create table if not exists
-        cur = self.conn.cursor()
-        cur.execute(f"""
-            CREATE TABLE IF NOT EXISTS {self.TABLE} (
-                course_id TEXT,
-                skill_id TEXT,
-                weight INTEGER
+        result = sync_seed(self.conn, COURSE_SKILL_SEED)
+        if not result.skipped:
+            print(
+                f"Synced course-skills from JSON into {self.TABLE} "
+                f"(+{result.inserted} ~{result.updated} -{result.deleted})."
             )
-        """)
-        self.conn.commit()
-
-        # Clear old data and insert JSON data
-        cur.execute(f"DELETE FROM {self.TABLE}")
-        self.conn.commit()
-
-        query = f"INSERT INTO {self.TABLE} (course_id, skill_id, weight) VALUES (?, ?, ?)"
-        data = [(cs["course_id"], cs["skill_id"], cs["weight"]) for cs in course_skills]
-        cur.executemany(query, data)
-        self.conn.commit()
-        print(f"Synced {len(data)} course-skills from JSON into {self.TABLE}.")
 
     def list_course_skills(self) -> List[Dict[str, Any]]:
         cur = self.conn.cursor()
@@ -2,7 +2,7 @@
 DepartmentRepository: Data access for departments table.
 """
 from .base import BaseRepository
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 class DepartmentRepository(BaseRepository):
     TABLE = "departments"
@@ -13,3 +13,6 @@ class DepartmentRepository(BaseRepository):
 
     def list_departments(self) -> List[dict]:
         return self.list_all(self.TABLE)
+
+    def get_departments(self, department_ids: List[str]) -> Dict[str, dict]:
+        return self.map_by_ids(self.TABLE, self.ID_FIELD, department_ids)
@@ -0,0 +1,85 @@
+"""
+EmbeddingCacheRepository: Persistent cache of text embeddings.
+
+Rows are keyed by (model, sha256(text)), so an unchanged document never has to
+be re-embedded, even across process restarts or index rebuilds. The table is
+created by migration 5 (embedding_cache); this repository issues no DDL.
+"""
+from array import array
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import hashlib
+import sqlite3
+
+from .base import BaseRepository, chunked, unique_ids, MAX_IN_PARAMS
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _to_blob(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _from_blob(blob: bytes) -> List[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCacheRepository(BaseRepository):
+    TABLE = "embedding_cache"
+
+    def get_vectors(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for `hashes`; misses are simply absent."""
+        found: Dict[str, List[float]] = {}
+        cur = self.conn.cursor()
+        for chunk in chunked(unique_ids(hashes), MAX_IN_PARAMS):
+            placeholders = ",".join(["?"] * len(chunk))
+            cur.execute(
+                f"SELECT content_hash, vector FROM {self.TABLE} "
+                f"WHERE model = ? AND content_hash IN ({placeholders})",
+                (model, *chunk),
+            )
+            for row in cur.fetchall():
+                found[row["content_hash"]] = _from_blob(row["vector"])
+        return found
+
+    def put_vectors(self, model: str, items: Iterable[Tuple[str, Sequence[float]]]) -> int:
+        """Upsert (content_hash, vector) pairs for `model`."""
+        rows = [(model, h, len(v), _to_blob(v)) for h, v in items]
+        if not rows:
+            return 0
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {self.TABLE} (model, content_hash, dim, vector) "
+            f"VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def embed_with_cache(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embed: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """
+        Embed `texts`, calling `embed` only for texts not already cached.
+
+        Duplicate texts within one call are embedded once.
+        """
+        hashes = [text_hash(t) for t in texts]
+        cached = self.get_vectors(model, hashes)
+
+        missing: Dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in cached and h not in missing:
+                missing[h] = t
+        if missing:
+            vectors = embed(list(missing.values()))
+            fresh = list(zip(missing.keys(), vectors))
+            self.put_vectors(model, fresh)
+            # Round-trip through float32 so cached and fresh results agree
+            cached.update((h, _from_blob(_to_blob(v))) for h, v in fresh)
+        return [cached[h] for h in hashes]
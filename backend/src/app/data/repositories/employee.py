@@ -45,6 +45,11 @@ class EmployeeRepository(BaseRepository):
         rows = self.list_all(self.TABLE)
         return [self._normalize_employee(row) for row in rows if row]
 
+    def get_employees(self, employee_ids: List[str]) -> Dict[str, dict]:
+        """Get and normalize many employees at once, keyed by id."""
+        rows = self.map_by_ids(self.TABLE, self.ID_FIELD, employee_ids)
+        return {emp_id: self._normalize_employee(row) for emp_id, row in rows.items()}
+
     # ---------- Specific Getters ----------
     def get_employee_skills(self, employee_id: str) -> Dict[str, Any]:
         """Return only the employee's skills dictionary."""
@@ -66,6 +71,15 @@ class EmployeeRepository(BaseRepository):
         emp = self.get_employee(employee_id)
         if not emp:
             return {}
+        return self._to_profile(emp)
+
+    def get_employee_profiles(self, employee_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return lightweight profiles for many employees, keyed by id."""
+        rows = self.map_by_ids(self.TABLE, self.ID_FIELD, employee_ids)
+        return {emp_id: self._to_profile(row) for emp_id, row in rows.items()}
+
+    @staticmethod
+    def _to_profile(emp: dict) -> Dict[str, Any]:
         return {
             "id": emp["id"],
             "name": emp["name"],
@@ -81,6 +95,10 @@ class EmployeeRepository(BaseRepository):
         """Return raw employee row without normalization."""
         return self.get_by_id(self.TABLE, self.ID_FIELD, employee_id)
 
+    def list_employee_rows(self) -> List[dict]:
+        """Return every raw employee row without normalization."""
+        return self.list_all(self.TABLE)
+
     # ---------- Sync from JSON ----------
     # def sync_from_json(self):
     #     """Load employees.json and sync the employees table."""
@@ -150,22 +168,19 @@ class EmployeeRepository(BaseRepository):
         """
         if not skills:
             return []
-        
-        cur = self.conn.cursor()
-        
-        # Build OR conditions for each skill
-        conditions = [f'skills_map LIKE ?' for _ in skills]
-        where_clause = ' OR '.join(conditions)
-        
+
+        # Indexed lookup on employee_skills(skill_id, employee_id)
+        placeholders = ",".join(["?"] * len(skills))
         query = f"""
             SELECT * FROM {self.TABLE}
-            WHERE {where_clause}
+            WHERE id IN (
+                SELECT employee_id FROM employee_skills
+                WHERE skill_id IN ({placeholders})
+            )
         """
-        
-        # Create LIKE patterns for each skill
-        params = [f'%"{skill}"%' for skill in skills]
-        
-        cur.execute(query, params)
+
+        cur = self.conn.cursor()
+        cur.execute(query, list(skills))
         rows = cur.fetchall()
         return [dict(row) for row in rows]
     
@@ -13,3 +13,11 @@ class LeadershipPotentialPredictionRepository(BaseRepository):
 
     def list_predictions(self) -> List[dict]:
         return self.list_all(self.TABLE)
+
+    def list_by_model_version(self, model_version: str) -> List[dict]:
+        cur = self.conn.cursor()
+        cur.execute(
+            f"SELECT * FROM {self.TABLE} WHERE model_version = ? ORDER BY employee_id",
+            (model_version,),
+        )
+        return [dict(row) for row in cur.fetchall()]
@@ -2,7 +2,7 @@
 MentorshipProfileRepository: Data access for mentorship_profiles table.
 """
 from .base import BaseRepository
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 class MentorshipProfileRepository(BaseRepository):
     TABLE = "mentorship_profiles"
@@ -13,6 +13,9 @@ class MentorshipProfileRepository(BaseRepository):
 
     def list_profiles(self) -> List[dict]:
         return self.list_all(self.TABLE)
+
+    def get_profiles(self, employee_ids: List[str]) -> Dict[str, dict]:
+        return self.map_by_ids(self.TABLE, self.ID_FIELD, employee_ids)
     
     def get_available_mentors(
         self,
@@ -57,8 +60,13 @@ class MentorshipProfileRepository(BaseRepository):
             params.append(department)
         
         if skill_area:
-            query += " AND e.skills_map LIKE ?"
-            params.append(f'%"{skill_area}"%')
+            query += """
+              AND EXISTS (
+                  SELECT 1 FROM employee_skills es
+                  WHERE es.skill_id = ? AND es.employee_id = e.id
+              )
+            """
+            params.append(skill_area)
         
         query += " ORDER BY mp.rating DESC"
         
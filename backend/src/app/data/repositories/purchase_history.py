@@ -3,8 +3,28 @@ import sqlite3, json
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+from ..utils.seed_sync import SeedSpec, sync_seed
+
 JSON_FILE = Path(__file__).parent.parent / "seeds" / "purchase_history.json"
 
+PURCHASE_HISTORY_SEED = SeedSpec(
+    name="purchase_history",
+    path=JSON_FILE,
+    table="purchase_history",
+    columns=("id", "points", "bought_items"),
+    key_columns=("id",),
+    create_sql="""
+        CREATE TABLE IF NOT EXISTS purchase_history (
+            id TEXT PRIMARY KEY,
+            points INTEGER DEFAULT 0,
+            bought_items TEXT DEFAULT '[]'
+        )
+    """,
+    to_row=lambda emp: (
+        emp["id"], emp.get("points", 0), json.dumps(emp.get("bought_items", [])),
+    ),
+)
+
 class PurchaseHistoryRepository:
     TABLE = "purchase_history"
     ID_FIELD = "id"
@@ -20,27 +40,13 @@ class PurchaseHistoryRepository:
             print(f"Warning: {JSON_FILE} does not exist.")
             return
 
-        with open(JSON_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        cur = self.conn.cursor()
-        cur.execute(f"DROP TABLE IF EXISTS {self.TABLE}")
-        cur.execute(f"""
-            CREATE TABLE {self.TABLE} (
-                id TEXT PRIMARY KEY,
-                points INTEGER DEFAULT 0,
-                bought_items TEXT DEFAULT '[]'
+        # Unchanged seed file -> no writes, so redeemed points survive restarts.
+        result = sync_seed(self.conn, PURCHASE_HISTORY_SEED)
+        if not result.skipped:
+            print(
+                f"Synced purchase_history from JSON "
+                f"(+{result.inserted} ~{result.updated} -{result.deleted})."
             )
-        """)
-        self.conn.commit()
-
-        insert_data = [
-            (emp["id"], emp.get("points", 0), json.dumps(emp.get("bought_items", [])))
-            for emp in data
-        ]
-        cur.executemany(f"INSERT INTO {self.TABLE} VALUES (?, ?, ?)", insert_data)
-        self.conn.commit()
-        print(f"Synced {len(insert_data)} employees into purchase_history.")
 
     # Redeem marketplace item
     def redeem_item(self, employee_id: str, item: Dict[str, Any]) -> bool:
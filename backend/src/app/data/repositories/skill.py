@@ -47,10 +47,5 @@ class SkillRepository(BaseRepository):
         if not skill_ids:
             return {}
 
-        placeholders = ",".join(["?"] * len(skill_ids))
-        query = f"SELECT id, name FROM {self.TABLE} WHERE id IN ({placeholders})"
-
-        cur = self.conn.cursor()
-        cur.execute(query, skill_ids)
-        rows = cur.fetchall()
+        rows = self.get_many(self.TABLE, self.ID_FIELD, skill_ids)
         return {row["id"]: row["name"] for row in rows}
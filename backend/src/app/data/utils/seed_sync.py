@@ -0,0 +1,185 @@
+"""
+Incremental sync of JSON seed files into SQLite tables.
+
+Each seed file's SHA-256 is stored in `seed_sync_state`. When the file is
+unchanged the sync is a single metadata lookup; otherwise the table is
+diffed against the file and only inserts, updates and deletes are applied,
+all inside one transaction so readers never observe a partially rebuilt table.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+STATE_TABLE = "seed_sync_state"
+
+
+@dataclass(frozen=True)
+class SeedSpec:
+    """Describes how one seed file maps onto one table."""
+
+    name: str
+    path: Path
+    table: str
+    columns: Tuple[str, ...]
+    key_columns: Tuple[str, ...]
+    create_sql: str
+    to_row: Callable[[Dict[str, Any]], Tuple[Any, ...]]
+    # Extra idempotent DDL run on the write path (e.g. columns added later).
+    prepare: Optional[Callable[[sqlite3.Connection], None]] = None
+
+
+@dataclass
+class SeedSyncResult:
+    name: str
+    skipped: bool = False
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _stored_hash(conn: sqlite3.Connection, name: str) -> Optional[str]:
+    try:
+        row = conn.execute(
+            f"SELECT content_hash FROM {STATE_TABLE} WHERE seed_name = ?", (name,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # State table not created yet: nothing has been synced.
+        return None
+    return row[0] if row else None
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_state_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+            seed_name TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER,
+            synced_at TEXT
+        )
+        """
+    )
+
+
+def _diff(
+    existing: Dict[Tuple[Any, ...], Tuple[Any, ...]],
+    desired: Dict[Tuple[Any, ...], Tuple[Any, ...]],
+) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+    inserts = [row for key, row in desired.items() if key not in existing]
+    updates = [
+        row for key, row in desired.items() if key in existing and existing[key] != row
+    ]
+    deletes = [key for key in existing if key not in desired]
+    return inserts, updates, deletes
+
+
+def _key_of(spec: SeedSpec, row: Sequence[Any]) -> Tuple[Any, ...]:
+    return tuple(row[spec.columns.index(col)] for col in spec.key_columns)
+
+
+def sync_seed(conn: sqlite3.Connection, spec: SeedSpec, *, force: bool = False) -> SeedSyncResult:
+    """
+    Bring `spec.table` in line with `spec.path`, skipping work when unchanged.
+
+    Raises:
+        FileNotFoundError: if the seed file does not exist.
+    """
+    raw = spec.path.read_bytes()
+    digest = content_hash(raw)
+    result = SeedSyncResult(name=spec.name)
+
+    if (
+        not force
+        and _stored_hash(conn, spec.name) == digest
+        and _table_exists(conn, spec.table)
+    ):
+        result.skipped = True
+        return result
+
+    records = json.loads(raw)
+    desired: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+    for record in records:
+        row = tuple(spec.to_row(record))
+        desired[_key_of(spec, row)] = row
+
+    # Idempotent DDL only runs when the seed actually changed.
+    conn.execute(spec.create_sql)
+    if spec.prepare:
+        spec.prepare(conn)
+    ensure_state_table(conn)
+    if conn.in_transaction:
+        conn.commit()
+
+    column_list = ", ".join(spec.columns)
+    key_clause = " AND ".join(f"{col} = ?" for col in spec.key_columns)
+    value_columns = [col for col in spec.columns if col not in spec.key_columns]
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        existing = {}
+        for db_row in conn.execute(f"SELECT {column_list} FROM {spec.table}"):
+            row = tuple(db_row)
+            existing[_key_of(spec, row)] = row
+
+        inserts, updates, deletes = _diff(existing, desired)
+
+        if deletes:
+            conn.executemany(f"DELETE FROM {spec.table} WHERE {key_clause}", deletes)
+        if updates and value_columns:
+            set_clause = ", ".join(f"{col} = ?" for col in value_columns)
+            conn.executemany(
+                f"UPDATE {spec.table} SET {set_clause} WHERE {key_clause}",
+                [
+                    tuple(row[spec.columns.index(col)] for col in value_columns)
+                    + _key_of(spec, row)
+                    for row in updates
+                ],
+            )
+        if inserts:
+            placeholders = ", ".join(["?"] * len(spec.columns))
+            conn.executemany(
+                f"INSERT INTO {spec.table} ({column_list}) VALUES ({placeholders})",
+                inserts,
+            )
+
+        conn.execute(
+            f"""
+            INSERT INTO {STATE_TABLE} (seed_name, content_hash, row_count, synced_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(seed_name) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                row_count = excluded.row_count,
+                synced_at = excluded.synced_at
+            """,
+            (spec.name, digest, len(desired), datetime.now(timezone.utc).isoformat()),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    result.inserted = len(inserts)
+    result.updated = len(updates)
+    result.deleted = len(deletes)
+    return result
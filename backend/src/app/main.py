@@ -2,20 +2,55 @@
 Application entrypoint
 
 FastAPI application wiring v1 routers:
-- employees, wellbeing, marketplace, sample, mentoring
+- employees, wellbeing, marketplace, sample, mentoring, jobs
 
 The actual route handlers are defined in api/v1/ modules.
 This file just creates the app and includes the routers.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from app.api.v1 import auth, employees, wellbeing, marketplace, sample, analytics, mentoring
+from app.api.v1 import auth, employees, wellbeing, marketplace, sample, analytics, mentoring, jobs
 from app.core.config import settings
+from app.core.db import close_all_managers, get_manager
+from app.core.http_cache import CachedRoute, ConditionalGetMiddleware, response_cache
+from app.core.vectorstore import registry as vectorstore_registry
+from app.core.agent_registry import agent_registry
+from app.core.jobs import job_queue
+from app.core.llm_cache import llm_cache
+from app.core.llm_metrics import llm_metrics
+from app.core.reference_data import reference_data
+from app.core.request_scope import RequestScopeMiddleware
+from app.core.singleflight import singleflight
+from app.services import insights_aggregates
 
 APP_DESCRIPTION = "Future-Ready Workforce Agent Platform API"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    # Apply pending schema migrations once, before serving any request
+    manager = get_manager()
+    manager.ensure_schema()
+    # Analytics GETs are read-only: fold in employee_insights changes queued
+    # outside the pipeline (e.g. by migrations) before serving them
+    with manager.connection() as conn:
+        insights_aggregates.refresh(conn)
+    # Jobs left queued/running by an exited process will never finish
+    job_queue.recover_stale()
+    # Load vector stores in the background; requests wait only if they need one
+    if settings.vectorstore_warm_on_startup:
+        vectorstore_registry.start_all()
+    yield
+    job_queue.shutdown(wait=False)
+    # Release pooled SQLite connections on shutdown
+    close_all_managers()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="PSA Future-Ready Workforce Platform",
@@ -23,7 +58,24 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+)
+
+# Polled dashboard endpoints: strong ETags from the versions of the tables they read.
+# First matching route wins.
+CACHED_ROUTES = (
+    CachedRoute(
+        r"/api/v1/analytics/leadership/scores",
+        tables=("employee_skills", "employees", "leadership_potential_predictions", "skills"),
+        bypass_params=("refresh",),
+        daily=True,
+    ),
+    # ?source=snapshot reads a file export, which data_versions does not track
+    CachedRoute(r"/api/v1/analytics/[^/]+", tables=("employee_insights",), bypass_params=("source",)),
+    CachedRoute(r"/api/v1/employees/[^/]+", tables=("employees", "skills")),
 )
+# Added before CORS so that CORS wraps it and 304s still carry CORS headers
+app.add_middleware(ConditionalGetMiddleware, routes=CACHED_ROUTES)
 
 # Configure CORS to allow frontend to call backend
 app.add_middleware(
@@ -33,6 +85,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-request memoization (e.g. employee contexts read by several layers)
+app.add_middleware(RequestScopeMiddleware)
 
 # Include routers from api/v1
 app.include_router(auth.router)
@@ -42,6 +96,7 @@ app.include_router(marketplace.router)
 app.include_router(sample.router)  # Example router showing the pattern
 app.include_router(analytics.router)
 app.include_router(mentoring.router)  # Mentoring feature
+app.include_router(jobs.router)
 
 
 # Health check endpoints
@@ -62,6 +117,14 @@ async def health_check():
         "status": "healthy",
         "environment": settings.env,
         "anonymous_mode": settings.enable_anonymous_mode,
+        "ready": vectorstore_registry.all_ready(),
+        "vectorstores": vectorstore_registry.status(),
+        "llm_cache": llm_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "llm_metrics": llm_metrics.snapshot(),
+        "agents": agent_registry.stats(),
+        "reference_data": reference_data.stats(),
+        "http_cache": response_cache.stats(),
     }
 
 
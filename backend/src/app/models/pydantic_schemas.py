@@ -384,3 +384,20 @@ class LeadershipPotentialPredictionCreate(BaseModel):
 
 class LeadershipPotentialPredictionDetail(LeadershipPotentialPredictionBase):
     pass
+
+# --- Batch course recommendations ---
+class BatchRecommendationRequest(BaseModel):
+    employee_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    top_k: int = Field(3, ge=1, le=20)
+
+class CourseRecommendation(BaseModel):
+    id: Optional[str] = None
+    title: str
+    url: str
+    skills: List[str]
+    reason: str
+    score: Optional[float] = None
+
+class BatchRecommendationResponse(BaseModel):
+    recommendations: Dict[str, List[CourseRecommendation]]
+    not_found: List[str] = []
@@ -0,0 +1,90 @@
+"""
+EmployeeContext: profile, readable skills, goals and courses for the agents and API.
+
+Contexts are built in bulk: employees are read with one chunked `IN (...)`
+query and skill names come from the process-wide reference-data cache
+(app.core.reference_data), however many employees are asked for. Within a request scope (see
+app.core.request_scope) each employee's context is built at most once.
+"""
+import copy
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.db import read_connection
+from app.core.reference_data import reference_data
+from app.core.request_scope import scope_cache
+from app.data.repositories.base import unique_ids
+from app.data.repositories.employee import EmployeeRepository
+
+MEMO_NAMESPACE = "employee_context"
+
+
+def _json_field(value: Any, default: Any) -> Any:
+    """
+    Fields arrive parsed from EmployeeRepository; some seeded rows were
+    JSON-encoded twice, so a remaining string is parsed once more.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return default
+    return value if isinstance(value, type(default)) else default
+
+
+def build_employee_contexts(conn: sqlite3.Connection, employee_ids: Iterable[str]) -> Dict[str, dict]:
+    """Contexts for the given employees, keyed by id. Unknown ids are omitted."""
+    employees = EmployeeRepository(conn).get_employees(unique_ids(employee_ids))
+    skill_maps = {emp_id: _json_field(emp.get("skills"), {}) for emp_id, emp in employees.items()}
+    skill_names = reference_data.snapshot(conn).skill_names
+
+    contexts: Dict[str, dict] = {}
+    for emp_id, employee in employees.items():
+        contexts[emp_id] = {
+            "profile": {
+                "id": employee.get("id"),
+                "name": employee.get("name"),
+                "role": employee.get("role"),
+                "department_id": employee.get("department_id"),
+                "level": employee.get("level"),
+                "points_current": employee.get("points_current"),
+                "hire_date": employee.get("hire_date"),
+            },
+            "skills": [skill_names[sid] for sid in skill_maps[emp_id] if sid in skill_names],
+            "goals": _json_field(employee.get("goals"), []),
+            "courses_enrolled": _json_field(employee.get("courses_enrolled"), {}),
+        }
+    return contexts
+
+
+def get_employee_contexts(employee_ids: Iterable[str], db_url: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Contexts for many employees at once (unknown ids are omitted).
+
+    Returned dicts are copies, so callers may modify them freely.
+    """
+    wanted = unique_ids(employee_ids)
+    memo = scope_cache(MEMO_NAMESPACE)
+    found = {emp_id: memo[emp_id] for emp_id in wanted if memo and emp_id in memo}
+    missing = [emp_id for emp_id in wanted if emp_id not in found]
+    if missing:
+        with read_connection(db_url) as conn:
+            built = build_employee_contexts(conn, missing)
+        found.update(built)
+        if memo is not None:
+            memo.update(built)
+    return {emp_id: copy.deepcopy(found[emp_id]) for emp_id in wanted if emp_id in found}
+
+
+def get_employee_context(employee_id: str, db_url: Optional[str] = None) -> dict:
+    """
+    Fetch a complete employee context (profile, readable skills, goals, courses).
+
+    Raises:
+        ValueError: if the employee does not exist.
+    """
+    context = get_employee_contexts([employee_id], db_url).get(employee_id)
+    if context is None:
+        raise ValueError(f"Employee {employee_id} not found")
+    return context
@@ -0,0 +1,206 @@
+"""
+InsightRecords: typed and exploded storage of employee_insights rows.
+
+The pipeline writes skills, goals, courses and recommendations as JSON text
+and the leadership evaluation as JSON plus free-text summary. At write time
+this module also derives:
+
+- typed leadership columns on employee_insights (overall score, category and
+  one score per leadership factor), so nobody regex-parses the summary later;
+- one row per list item in insight_skills, insight_goals, insight_courses and
+  insight_recommendations, so analytics are indexed SQL, not JSON decoding.
+
+Writers should go through `upsert_insights()` so the three stay in sync.
+"""
+import json
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# leadership_factors key (employer prompt) -> typed column
+FACTOR_COLUMNS = {
+    "experience": "experience_score",
+    "learning_engagement": "learning_engagement_score",
+    "soft_skills_alignment": "soft_skills_score",
+    "strategic_outlook": "strategic_outlook_score",
+}
+TYPED_COLUMNS = ("leadership_score", "leadership_category", *FACTOR_COLUMNS.values())
+CATEGORIES = ("Low", "Mid", "High")
+
+_NUMBER_RE = re.compile(r"(\d+(\.\d+)?)")
+# "7/10", "7.5 / 10" or "score 7" inside a factor note
+_FACTOR_SCORE_RES = (
+    re.compile(r"(\d+(?:\.\d+)?)\s*/\s*10"),
+    re.compile(r"score\D{0,3}(\d+(?:\.\d+)?)", re.IGNORECASE),
+)
+
+
+def _json(raw: Any) -> Any:
+    if not isinstance(raw, str):
+        return raw
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+
+def _score(value: Any) -> Optional[float]:
+    """A 0-10 score from a number or a short note such as "7/10, strong tenure"."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str):
+        match = next((m for m in (r.search(value) for r in _FACTOR_SCORE_RES) if m), None)
+        if match is None:
+            return None
+        number = float(match.group(1))
+    else:
+        return None
+    return number if 0 <= number <= 10 else None
+
+
+def summary_score(summary: Any) -> Optional[float]:
+    """First number mentioned in a leadership summary (rows without structured scores)."""
+    if not isinstance(summary, str):
+        return None
+    match = _NUMBER_RE.search(summary)
+    return float(match.group(1)) if match else None
+
+
+def summary_category(summary: Any) -> str:
+    if isinstance(summary, str):
+        text = summary.lower()
+        if "high" in text:
+            return "High"
+        if "low" in text:
+            return "Low"
+    return "Mid"
+
+
+def typed_leadership(leadership: Any, summary: Any = None) -> Dict[str, Any]:
+    """
+    Typed leadership columns from the employer-view evaluation.
+
+    The structured JSON wins; the summary text is only a fallback for
+    evaluations that lack an overall score or category.
+    """
+    leadership = _json(leadership)
+    leadership = leadership if isinstance(leadership, dict) else {}
+    factors = leadership.get("leadership_factors")
+    factors = factors if isinstance(factors, dict) else {}
+
+    score = _score(leadership.get("overall_potential_score"))
+    category = leadership.get("potential_category")
+    typed = {
+        "leadership_score": score if score is not None else summary_score(summary),
+        "leadership_category": category if category in CATEGORIES else summary_category(summary),
+    }
+    for factor, column in FACTOR_COLUMNS.items():
+        typed[column] = _score(factors.get(factor))
+    return typed
+
+
+def _label(item: Any) -> Optional[str]:
+    if isinstance(item, dict):
+        value = item.get("title") or item.get("name") or item.get("id")
+        return None if value is None else str(value)
+    return None if item is None else str(item)
+
+
+def _labels(raw: Any) -> List[str]:
+    """Dict keys, list items or a single value, as labels."""
+    value = _json(raw)
+    if value is None or value == "":
+        return []
+    items = list(value.keys()) if isinstance(value, dict) else value if isinstance(value, list) else [value]
+    return [label for label in map(_label, items) if label is not None]
+
+
+def _score_value(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def child_rows(insight: Mapping[str, Any]) -> Dict[str, List[Tuple]]:
+    """insight_* rows of one employee_insights row (JSON text or Python values)."""
+    emp_id = insight["id"]
+    courses = _json(insight.get("courses_enrolled"))
+    recommended = _json(insight.get("courses_recommended_json"))
+    return {
+        "insight_skills": [(emp_id, i, skill) for i, skill in enumerate(_labels(insight.get("skills")))],
+        "insight_goals": [(emp_id, i, goal) for i, goal in enumerate(_labels(insight.get("goals")))],
+        "insight_courses": [
+            (emp_id, str(course_id), None if status is None else str(status))
+            for course_id, status in (courses.items() if isinstance(courses, dict) else [])
+        ],
+        "insight_recommendations": [
+            (
+                emp_id, i,
+                course.get("id") if isinstance(course, dict) else None,
+                _label(course),
+                course.get("url") if isinstance(course, dict) else None,
+                _score_value(course.get("score")) if isinstance(course, dict) else None,
+            )
+            for i, course in enumerate(recommended if isinstance(recommended, list) else [])
+            if _label(course) is not None
+        ],
+    }
+
+
+_CHILD_INSERTS = {
+    "insight_skills": "INSERT INTO insight_skills (employee_id, position, skill) VALUES (?, ?, ?)",
+    "insight_goals": "INSERT INTO insight_goals (employee_id, position, goal) VALUES (?, ?, ?)",
+    "insight_courses": "INSERT OR REPLACE INTO insight_courses (employee_id, course_id, status) VALUES (?, ?, ?)",
+    "insight_recommendations": (
+        "INSERT INTO insight_recommendations (employee_id, position, course_id, title, url, score) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    ),
+}
+
+
+def replace_children(conn: sqlite3.Connection, insights: Iterable[Mapping[str, Any]]) -> None:
+    """Rewrite the insight_* rows of each given employee_insights row (caller's transaction)."""
+    insights = list(insights)
+    ids = [(insight["id"],) for insight in insights]
+    for table in _CHILD_INSERTS:
+        conn.executemany(f"DELETE FROM {table} WHERE employee_id = ?", ids)
+    batched: Dict[str, List[Tuple]] = {table: [] for table in _CHILD_INSERTS}
+    for insight in insights:
+        for table, rows in child_rows(insight).items():
+            batched[table].extend(rows)
+    for table, rows in batched.items():
+        if rows:
+            conn.executemany(_CHILD_INSERTS[table], rows)
+
+
+def upsert_insights(conn: sqlite3.Connection, insights: Iterable[Mapping[str, Any]]) -> int:
+    """
+    INSERT OR REPLACE employee_insights rows together with their typed
+    leadership columns and insight_* child rows, in the caller's transaction.
+
+    Every mapping must have the same keys (employee_insights columns); typed
+    columns not given are derived from leadership_json / leadership_summary.
+
+    Returns:
+        Number of rows written.
+    """
+    records = []
+    for insight in insights:
+        record = dict(insight)
+        typed = typed_leadership(record.get("leadership_json"), record.get("leadership_summary"))
+        for column, value in typed.items():
+            record.setdefault(column, value)
+        records.append(record)
+    if not records:
+        return 0
+    columns = list(records[0])
+    conn.executemany(
+        f"INSERT OR REPLACE INTO employee_insights ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})",
+        [tuple(record[column] for column in columns) for record in records],
+    )
+    replace_children(conn, records)
+    return len(records)
@@ -0,0 +1,348 @@
+"""
+InsightsAggregates: materialized analytics over `employee_insights`.
+
+The analytics endpoints used to load the whole employee_insights table into
+pandas on every request, re-parsing each JSON column and regex-scanning the
+leadership summaries. Instead, each row's typed leadership columns and
+insight_* child rows (written by app.services.insight_records) are folded
+into small summary tables (`insights_facet_counts`, `insights_group_stats`);
+`insights_derived` remembers each employee's contribution.
+
+Triggers on employee_insights queue changed ids in `insights_aggregates_dirty`;
+`refresh()` applies only those rows (subtract the old contribution, add the
+new one), so reads cost O(distinct values), not O(headcount). Writers call it:
+the insights pipeline after each upsert, and app startup for anything queued
+elsewhere (e.g. by migrations); the analytics reads never do.
+"""
+import json
+import sqlite3
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.services.insight_records import summary_category, summary_score
+
+# facet -> (child table, value column, order column); see insight_records
+FACET_TABLES = {
+    "skill": ("insight_skills", "skill", "position"),
+    "goal": ("insight_goals", "goal", "position"),
+    "course_enrolled": ("insight_courses", "course_id", "course_id"),
+    "course_recommended": ("insight_recommendations", "title", "position"),
+}
+# Dimensions with per-group averages in insights_group_stats
+GROUP_DIMENSIONS = ("role", "department_id")
+
+_PENDING_IDS = (
+    "SELECT d.employee_id FROM insights_aggregates_dirty AS d "
+    "JOIN employee_insights AS e ON e.id = d.employee_id"
+)
+
+
+# ---------------------------
+# Deriving (one employee_insights row)
+# ---------------------------
+def _optional_float(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if pd.isna(number) else number
+
+
+def derive(row: Dict[str, Any], facets: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    The insights_derived values of one employee_insights row and its child rows.
+
+    Leadership values come from the typed columns; only rows that never got
+    them (written before they existed, without structured scores) fall back
+    to the summary text.
+    """
+    score = _optional_float(row.get("leadership_score"))
+    category = row.get("leadership_category")
+    if score is None and category is None:
+        score = summary_score(row.get("leadership_summary"))
+    return {
+        "employee_id": row["id"],
+        "name": row.get("name"),
+        "role": row.get("role") or "",
+        "department_id": row.get("department_id") or "",
+        "level": row.get("level") or "",
+        "years_with_company": _optional_float(row.get("years_with_company")),
+        "num_skills": len(facets["skill"]),
+        "leadership_score": score,
+        "leadership_category": category or summary_category(row.get("leadership_summary")),
+        "facets": facets,
+    }
+
+
+def _pending_facets(conn: sqlite3.Connection) -> Dict[str, Dict[str, List[str]]]:
+    """employee id -> facet -> values, from the child tables of queued rows."""
+    union = " UNION ALL ".join(
+        f"SELECT employee_id, '{facet}' AS facet, {column} AS value, {order} AS ord "
+        f"FROM {table} WHERE employee_id IN ({_PENDING_IDS})"
+        for facet, (table, column, order) in FACET_TABLES.items()
+    )
+    facets: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: {facet: [] for facet in FACET_TABLES})
+    for employee_id, facet, value, _ in conn.execute(f"{union} ORDER BY employee_id, facet, ord"):
+        facets[employee_id][facet].append(value)
+    return facets
+
+
+# ---------------------------
+# Incremental refresh
+# ---------------------------
+def _contribute(derived: Dict[str, Any], sign: int, facet_delta: Counter, group_delta: Dict) -> None:
+    for facet, key in (
+        ("role", "role"),
+        ("department", "department_id"),
+        ("level", "level"),
+        ("leadership_category", "leadership_category"),
+    ):
+        facet_delta[(facet, derived[key])] += sign
+    for facet, values in derived["facets"].items():
+        for value in values:
+            facet_delta[(facet, value)] += sign
+
+    years = derived["years_with_company"]
+    score = derived["leadership_score"]
+    for dimension in GROUP_DIMENSIONS:
+        stats = group_delta[(dimension, derived[dimension])]
+        stats["employees"] += sign
+        stats["skills_total"] += sign * derived["num_skills"]
+        if years is not None:
+            stats["years_total"] += sign * years
+            stats["years_n"] += sign
+        if score is not None:
+            stats["leadership_total"] += sign * score
+            stats["leadership_n"] += sign
+
+
+def _stored_derived(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    frame = pd.read_sql_query(
+        "SELECT dv.* FROM insights_aggregates_dirty AS d "
+        "JOIN insights_derived AS dv ON dv.employee_id = d.employee_id",
+        conn,
+    )
+    rows = frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+    for row in rows:
+        row["facets"] = json.loads(row.pop("facets_json"))
+    return rows
+
+
+def refresh(conn: sqlite3.Connection) -> int:
+    """
+    Fold every queued employee_insights change into the aggregates.
+
+    Runs inside the caller's transaction when there is one (e.g. the pipeline's
+    upsert), otherwise in its own IMMEDIATE transaction so that concurrent
+    refreshes never apply the same change twice. An empty queue is detected
+    before that, so calls with nothing pending never take the write lock.
+
+    Returns:
+        Number of employees applied.
+    """
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        if not conn.execute("SELECT EXISTS (SELECT 1 FROM insights_aggregates_dirty)").fetchone()[0]:
+            return 0
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        pending = pd.read_sql_query(
+            "SELECT e.id, e.name, e.role, e.department_id, e.level, e.years_with_company, "
+            "e.leadership_score, e.leadership_category, e.leadership_summary "
+            "FROM insights_aggregates_dirty AS d JOIN employee_insights AS e ON e.id = d.employee_id",
+            conn,
+        )
+        queued = conn.execute("SELECT COUNT(*) FROM insights_aggregates_dirty").fetchone()[0]
+        if not queued:
+            if own_transaction:
+                conn.rollback()
+            return 0
+
+        facet_delta: Counter = Counter()
+        group_delta: Dict = defaultdict(Counter)
+        for old in _stored_derived(conn):
+            _contribute(old, -1, facet_delta, group_delta)
+
+        current = pending.astype(object).where(pending.notna(), None).to_dict(orient="records")
+        facets = _pending_facets(conn)
+        derived_rows = [derive(row, facets[row["id"]]) for row in current]
+        for new in derived_rows:
+            _contribute(new, 1, facet_delta, group_delta)
+
+        conn.execute(
+            "DELETE FROM insights_derived WHERE employee_id IN "
+            "(SELECT employee_id FROM insights_aggregates_dirty)"
+        )
+        conn.executemany(
+            "INSERT INTO insights_derived (employee_id, name, role, department_id, level, "
+            "years_with_company, num_skills, leadership_score, leadership_category, facets_json) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    d["employee_id"], d["name"], d["role"], d["department_id"], d["level"],
+                    d["years_with_company"], d["num_skills"], d["leadership_score"],
+                    d["leadership_category"], json.dumps(d["facets"]),
+                )
+                for d in derived_rows
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO insights_facet_counts (facet, value, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(facet, value) DO UPDATE SET count = count + excluded.count",
+            [(facet, value, n) for (facet, value), n in facet_delta.items() if n],
+        )
+        conn.execute("DELETE FROM insights_facet_counts WHERE count <= 0")
+        conn.executemany(
+            "INSERT INTO insights_group_stats (dimension, key, employees, skills_total, "
+            "years_total, years_n, leadership_total, leadership_n) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(dimension, key) DO UPDATE SET "
+            "employees = employees + excluded.employees, "
+            "skills_total = skills_total + excluded.skills_total, "
+            "years_total = years_total + excluded.years_total, "
+            "years_n = years_n + excluded.years_n, "
+            "leadership_total = leadership_total + excluded.leadership_total, "
+            "leadership_n = leadership_n + excluded.leadership_n",
+            [
+                (
+                    dimension, key, stats["employees"], stats["skills_total"],
+                    stats["years_total"], stats["years_n"],
+                    stats["leadership_total"], stats["leadership_n"],
+                )
+                for (dimension, key), stats in group_delta.items()
+            ],
+        )
+        conn.execute("DELETE FROM insights_group_stats WHERE employees <= 0")
+        conn.execute("DELETE FROM insights_aggregates_dirty")
+        if own_transaction:
+            conn.commit()
+        return queued
+    except BaseException:
+        if own_transaction:
+            conn.rollback()
+        raise
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Recompute every aggregate from scratch (e.g. after a manual data fix)."""
+    with conn:
+        conn.execute("DELETE FROM insights_derived")
+        conn.execute("DELETE FROM insights_facet_counts")
+        conn.execute("DELETE FROM insights_group_stats")
+        conn.execute(
+            "INSERT OR IGNORE INTO insights_aggregates_dirty (employee_id) SELECT id FROM employee_insights"
+        )
+    return refresh(conn)
+
+
+# ---------------------------
+# Reads
+# ---------------------------
+def _mean(total: float, n: int) -> Optional[float]:
+    return total / n if n else None
+
+
+def _top(conn: sqlite3.Connection, facet: str, limit: Optional[int] = None) -> List[list]:
+    """[[value, count], ...] by descending count, like value_counts().head(limit)."""
+    sql = "SELECT value, count FROM insights_facet_counts WHERE facet = ? ORDER BY count DESC, value"
+    params: tuple = (facet,)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params += (limit,)
+    return [[value, count] for value, count in conn.execute(sql, params).fetchall()]
+
+
+def _group_stats(conn: sqlite3.Connection, dimension: str) -> pd.DataFrame:
+    return pd.read_sql_query(
+        "SELECT key, employees, skills_total, years_total, years_n, leadership_total, leadership_n "
+        "FROM insights_group_stats WHERE dimension = ? ORDER BY key",
+        conn,
+        params=(dimension,),
+    )
+
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+def role_stats(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Per role: employee count, average skills / leadership score / tenure."""
+    return [
+        {
+            "role": row["key"],
+            "count": int(row["employees"]),
+            "avg_skills": _mean(row["skills_total"], row["employees"]),
+            "avg_leadership_score": _mean(row["leadership_total"], row["leadership_n"]),
+            "avg_years": _mean(row["years_total"], row["years_n"]),
+        }
+        for row in _records(_group_stats(conn, "role"))
+    ]
+
+
+def department_stats(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    return [
+        {
+            "department_id": row["key"],
+            "total_employees": int(row["employees"]),
+            "avg_tenure": _mean(row["years_total"], row["years_n"]),
+        }
+        for row in _records(_group_stats(conn, "department_id"))
+    ]
+
+
+def overview(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Company overview served from the summary tables (call `refresh` first)."""
+    roles = role_stats(conn)
+    high_potential = _records(pd.read_sql_query(
+        "SELECT employee_id AS id, name, role, department_id, level, years_with_company, "
+        "leadership_score, leadership_category FROM insights_derived "
+        "WHERE leadership_category = 'High' ORDER BY employee_id",
+        conn,
+    ))
+    most_senior = _records(pd.read_sql_query(
+        "SELECT employee_id AS id, name, role, department_id, level, years_with_company "
+        "FROM insights_derived ORDER BY years_with_company DESC LIMIT 10",
+        conn,
+    ))
+    return {
+        "total_employees": sum(role["count"] for role in roles),
+        "roles_count": dict(_top(conn, "role")),
+        "department_count": dict(_top(conn, "department")),
+        "level_count": dict(_top(conn, "level")),
+        "top_skills": _top(conn, "skill", 15),
+        "top_goals": _top(conn, "goal", 30),
+        "top_enrolled_courses": _top(conn, "course_enrolled", 10),
+        "top_recommended_courses": _top(conn, "course_recommended", 20),
+        "leadership_distribution": dict(_top(conn, "leadership_category")),
+        "high_potential_employees": high_potential,
+        "most_senior": most_senior,
+        "role_analytics": roles,
+        "roles_lacking_skills": [
+            role for role in roles if role["avg_skills"] is not None and role["avg_skills"] <= 3.0
+        ],
+    }
+
+
+def employee_details(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Per-employee rows with skills and goals from the insight_* child tables."""
+    lists: Dict[tuple, List[str]] = defaultdict(list)
+    for key, table, column in (("skills", "insight_skills", "skill"), ("goals", "insight_goals", "goal")):
+        for employee_id, value in conn.execute(
+            f"SELECT employee_id, {column} FROM {table} ORDER BY employee_id, position"
+        ):
+            lists[(employee_id, key)].append(value)
+    rows = _records(pd.read_sql_query(
+        "SELECT id, name, department_id, role, level, years_with_company, leadership_summary "
+        "FROM employee_insights ORDER BY id",
+        conn,
+    ))
+    return [
+        {
+            **{k: v for k, v in row.items() if k != "leadership_summary"},
+            "skills": lists[(row["id"], "skills")],
+            "goals": lists[(row["id"], "goals")],
+            "leadership_summary": row["leadership_summary"],
+        }
+        for row in rows
+    ]
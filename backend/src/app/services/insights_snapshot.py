@@ -0,0 +1,317 @@
+"""
+InsightsSnapshot: columnar Parquet snapshots of workforce insights.
+
+`export_snapshot()` writes employee_insights (joined with employees and
+departments) and its exploded insight_* child tables (skills joined with the
+skills catalogue) to compressed Parquet, partitioned by department. Each
+export is published atomically as a new directory under the snapshot root
+and recorded in `LATEST`; a manifest keeps row counts and the data_versions
+the export was taken at.
+
+`load_frame()` reads only the requested columns (and partitions, via
+`filters`) with memory-mapped I/O. By default columns come back as Arrow-
+backed pandas dtypes, so Arrow buffers are handed to pandas without a copy.
+
+Usage:
+    python -m app.services.insights_snapshot --out /tmp/snapshots
+    load_frame("insights", columns=["id", "role", "leadership_score"])
+    load_frame("skills", filters=[("department_id", "=", "D1")])
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.db import read_connection
+
+PARTITION_COLUMN = "department_id"
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "manifest.json"
+
+# Types of the columns added by joins (employee_insights columns come from PRAGMA)
+_INSIGHT_JOIN_COLUMNS = {
+    "department_name": "TEXT",
+    "hire_date": "TEXT",
+    "position_level": "INTEGER",
+    "points_current": "INTEGER",
+}
+
+# snapshot table -> (query, {column: SQLite type}) for the child tables
+_CHILD_TABLES = {
+    "skills": (
+        "SELECT s.employee_id, e.department_id, s.position, s.skill, k.id AS skill_id, k.category "
+        "FROM insight_skills AS s JOIN employee_insights AS e ON e.id = s.employee_id "
+        "LEFT JOIN skills AS k ON k.name = s.skill",
+        {"employee_id": "TEXT", "department_id": "TEXT", "position": "INTEGER",
+         "skill": "TEXT", "skill_id": "TEXT", "category": "TEXT"},
+    ),
+    "goals": (
+        "SELECT g.employee_id, e.department_id, g.position, g.goal "
+        "FROM insight_goals AS g JOIN employee_insights AS e ON e.id = g.employee_id",
+        {"employee_id": "TEXT", "department_id": "TEXT", "position": "INTEGER", "goal": "TEXT"},
+    ),
+    "courses": (
+        "SELECT c.employee_id, e.department_id, c.course_id, c.status "
+        "FROM insight_courses AS c JOIN employee_insights AS e ON e.id = c.employee_id",
+        {"employee_id": "TEXT", "department_id": "TEXT", "course_id": "TEXT", "status": "TEXT"},
+    ),
+    "recommendations": (
+        "SELECT r.employee_id, e.department_id, r.position, r.course_id, r.title, r.url, r.score "
+        "FROM insight_recommendations AS r JOIN employee_insights AS e ON e.id = r.employee_id",
+        {"employee_id": "TEXT", "department_id": "TEXT", "position": "INTEGER", "course_id": "TEXT",
+         "title": "TEXT", "url": "TEXT", "score": "REAL"},
+    ),
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow is required for insights snapshots (pip install pyarrow)") from e
+    return pa, ds, pq
+
+
+def _arrow_type(pa, sqlite_type: str):
+    sqlite_type = (sqlite_type or "").upper()
+    if "INT" in sqlite_type:
+        return pa.int64()
+    if any(name in sqlite_type for name in ("REAL", "FLOA", "DOUB")):
+        return pa.float64()
+    return pa.string()
+
+
+def _partitioning(ds, pa):
+    return ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+
+def snapshot_root(root: Optional[os.PathLike] = None) -> Path:
+    return Path(root or settings.insights_snapshot_dir)
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def _insights_query(conn: sqlite3.Connection) -> tuple:
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(employee_insights)")}
+    sql = (
+        "SELECT e.*, d.name AS department_name, emp.hire_date, emp.position_level, emp.points_current "
+        "FROM employee_insights AS e "
+        "LEFT JOIN employees AS emp ON emp.id = e.id "
+        "LEFT JOIN departments AS d ON d.id = e.department_id"
+    )
+    return sql, {**columns, **_INSIGHT_JOIN_COLUMNS}
+
+
+def _write_table(conn, sql: str, columns: Dict[str, str], out_dir: Path, compression: str, chunk_rows: int) -> int:
+    """Stream `sql` into a department-partitioned Parquet dataset, `chunk_rows` rows at a time."""
+    pa, ds, pq = _pyarrow()
+    schema = pa.schema([(name, _arrow_type(pa, sqlite_type)) for name, sqlite_type in columns.items()])
+    cursor = conn.execute(sql)
+    names = [d[0] for d in cursor.description]
+    rows_written = 0
+    chunk = 0
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        table = pa.Table.from_arrays(
+            [pa.array([row[i] for row in rows], type=schema.field(name).type) for i, name in enumerate(names)],
+            schema=schema,
+        )
+        pq.write_to_dataset(
+            table,
+            root_path=str(out_dir),
+            partitioning=_partitioning(ds, pa),
+            basename_template=f"part-{chunk}-{{i}}.parquet",
+            compression=compression,
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        rows_written += len(rows)
+        chunk += 1
+    if rows_written == 0:
+        # Keep the schema readable; the partition column lives in directory names
+        out_dir.mkdir(parents=True, exist_ok=True)
+        empty = schema.remove(schema.get_field_index(PARTITION_COLUMN)).empty_table()
+        pq.write_table(empty, str(out_dir / "part-0-0.parquet"), compression=compression)
+    return rows_written
+
+
+def _data_versions(conn: sqlite3.Connection) -> Dict[str, List[Any]]:
+    try:
+        return {row[0]: [row[1], row[2]] for row in conn.execute("SELECT name, version, token FROM data_versions")}
+    except sqlite3.OperationalError:
+        return {}
+
+
+def _publish(root: Path, snapshot_id: str, keep: int) -> None:
+    latest_tmp = root / f".{LATEST_FILE}.{uuid.uuid4().hex}"
+    latest_tmp.write_text(snapshot_id, encoding="utf-8")
+    os.replace(latest_tmp, root / LATEST_FILE)
+    snapshots = sorted(p for p in root.iterdir() if p.is_dir() and (p / MANIFEST_FILE).exists())
+    for old in snapshots[:-keep] if keep > 0 else []:
+        if old.name != snapshot_id:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def export_snapshot(
+    db_url: Optional[str] = None,
+    root: Optional[os.PathLike] = None,
+    compression: str = "zstd",
+    chunk_rows: int = 50_000,
+    keep: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Export the insights tables to a new Parquet snapshot and make it the latest.
+
+    Returns:
+        The snapshot manifest.
+    """
+    _pyarrow()
+    root = snapshot_root(root)
+    root.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.now(timezone.utc)
+    snapshot_id = f"{created_at.strftime('%Y%m%dT%H%M%S%fZ')}-{uuid.uuid4().hex[:6]}"
+    staging = root / f".{snapshot_id}.tmp"
+
+    manifest: Dict[str, Any] = {
+        "snapshot_id": snapshot_id,
+        "created_at": created_at.isoformat(),
+        "format": "parquet",
+        "compression": compression,
+        "partition_by": PARTITION_COLUMN,
+        "tables": {},
+    }
+    try:
+        # One read transaction, so every table reflects the same database state
+        with read_connection(db_url) as conn:
+            conn.execute("BEGIN")
+            try:
+                manifest["data_versions"] = _data_versions(conn)
+                sql, columns = _insights_query(conn)
+                manifest["tables"]["insights"] = {
+                    "rows": _write_table(conn, sql, columns, staging / "insights", compression, chunk_rows),
+                }
+                for name, (sql, columns) in _CHILD_TABLES.items():
+                    manifest["tables"][name] = {
+                        "rows": _write_table(conn, sql, columns, staging / name, compression, chunk_rows),
+                    }
+            finally:
+                conn.rollback()
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(staging, root / snapshot_id)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _publish(root, snapshot_id, settings.insights_snapshot_keep if keep is None else keep)
+    return manifest
+
+
+# -----------------------------
+# Load
+# -----------------------------
+def latest_snapshot(root: Optional[os.PathLike] = None) -> Path:
+    """Directory of the latest published snapshot.
+
+    Raises:
+        FileNotFoundError: if no snapshot has been exported yet.
+    """
+    root = snapshot_root(root)
+    try:
+        snapshot_id = (root / LATEST_FILE).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No insights snapshot under {root}; run the snapshot export first")
+    return root / snapshot_id
+
+
+def read_manifest(snapshot: Optional[os.PathLike] = None) -> Dict[str, Any]:
+    path = Path(snapshot) if snapshot else latest_snapshot()
+    return json.loads((path / MANIFEST_FILE).read_text(encoding="utf-8"))
+
+
+def load_arrow(
+    table: str = "insights",
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[List[tuple]] = None,
+    snapshot: Optional[os.PathLike] = None,
+):
+    """Arrow table of `columns` (all if None), reading only partitions matching `filters`."""
+    pa, ds, pq = _pyarrow()
+    path = (Path(snapshot) if snapshot else latest_snapshot()) / table
+    return pq.read_table(
+        str(path),
+        columns=list(columns) if columns is not None else None,
+        filters=filters,
+        partitioning=_partitioning(ds, pa),
+        memory_map=True,
+    )
+
+
+def load_frame(
+    table: str = "insights",
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[List[tuple]] = None,
+    snapshot: Optional[os.PathLike] = None,
+    arrow_dtypes: bool = True,
+) -> pd.DataFrame:
+    """
+    pandas view of a snapshot table.
+
+    With `arrow_dtypes` (default) columns use pd.ArrowDtype and share the Arrow
+    buffers (no copy); pass False for classic NumPy/object columns.
+    """
+    arrow_table = load_arrow(table, columns, filters, snapshot)
+    if arrow_dtypes:
+        return arrow_table.to_pandas(types_mapper=pd.ArrowDtype)
+    return arrow_table.to_pandas()
+
+
+def employee_details(snapshot: Optional[os.PathLike] = None) -> List[Dict[str, Any]]:
+    """Same rows as the /analytics/employees endpoint, read from a snapshot."""
+    insights = load_frame(
+        "insights",
+        columns=["id", "name", "department_id", "role", "level", "years_with_company", "leadership_summary"],
+        snapshot=snapshot,
+        arrow_dtypes=False,
+    ).sort_values("id")
+    lists = {}
+    for table, column in (("skills", "skill"), ("goals", "goal")):
+        frame = load_frame(table, columns=["employee_id", "position", column], snapshot=snapshot, arrow_dtypes=False)
+        lists[table] = frame.sort_values(["employee_id", "position"]).groupby("employee_id")[column].agg(list).to_dict()
+    rows = insights.astype(object).where(insights.notna(), None).to_dict(orient="records")
+    return [
+        {
+            **{k: v for k, v in row.items() if k != "leadership_summary"},
+            "skills": lists["skills"].get(row["id"], []),
+            "goals": lists["goals"].get(row["id"], []),
+            "leadership_summary": row["leadership_summary"],
+        }
+        for row in rows
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Export employee_insights to a Parquet snapshot.")
+    parser.add_argument("--out", default=None, help="snapshot root (default: INSIGHTS_SNAPSHOT_DIR)")
+    parser.add_argument("--compression", default="zstd", help="Parquet codec: zstd, snappy, gzip, none")
+    parser.add_argument("--keep", type=int, default=None, help="snapshots to keep (default: INSIGHTS_SNAPSHOT_KEEP)")
+    args = parser.parse_args(argv)
+
+    manifest = export_snapshot(root=args.out, compression=args.compression, keep=args.keep)
+    rows = {name: table["rows"] for name, table in manifest["tables"].items()}
+    print(f"✅ Snapshot {manifest['snapshot_id']} written to {snapshot_root(args.out)}: {json.dumps(rows)}")
+    return manifest
+
+
+if __name__ == "__main__":
+    main()
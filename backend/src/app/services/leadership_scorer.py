@@ -0,0 +1,254 @@
+"""
+LeadershipScorer: deterministic leadership factor scores for the whole workforce.
+
+The LLM leadership prompts ask for experience, learning-engagement and
+soft-skill scores that only depend on local data (tenure, level, completed
+courses, skills, goals). This module computes those factors for every
+employee in one vectorized pandas/NumPy pass and stores them in
+`leadership_potential_predictions` under `MODEL_VERSION`. The LLM is then only
+needed for narrative text, on demand.
+
+Stored scores are reused until an input table changes (per `data_versions`)
+or the day changes (tenure is measured in days); `leadership_scoring_runs`
+records both for the current rows.
+"""
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.data.repositories.leadership_potential_prediction import LeadershipPotentialPredictionRepository
+
+# Bump whenever the formula or weights below change
+MODEL_VERSION = "heuristic-v1"
+
+# overall = weighted mean of the factor scores (each 0-10)
+FACTOR_WEIGHTS = {
+    "experience": 0.35,
+    "learning_engagement": 0.25,
+    "soft_skills_alignment": 0.40,
+}
+HIGH_THRESHOLD = 7.0
+MID_THRESHOLD = 4.0
+
+SOFT_SKILL_CATEGORY = "Soft Skills"
+MAX_PROFICIENCY = 5
+MAX_POSITION_LEVEL = 8
+# Goals that show the employee wants to grow into leadership
+LEADERSHIP_GOAL_PATTERN = r"lead|manag|mentor|communicat|head|director"
+# Tables read by load_scoring_frame; a write to any of them makes scores stale
+INPUT_TABLES = ("employee_skills", "employees", "skills")
+
+
+def _json_value(raw: Any, default: Any) -> Any:
+    """Parse a JSON column, unwrapping values that were JSON-encoded twice."""
+    value = raw
+    for _ in range(2):
+        if not isinstance(value, str):
+            break
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return default
+    return value if isinstance(value, type(default)) else default
+
+
+def load_scoring_frame(conn: sqlite3.Connection) -> pd.DataFrame:
+    """One row per employee with every input the scorer needs."""
+    employees = pd.read_sql_query(
+        "SELECT id AS employee_id, level, position_level, hire_date, "
+        "courses_enrolled_map, goals_set FROM employees",
+        conn,
+    )
+    soft_skills = pd.read_sql_query(
+        """
+        SELECT es.employee_id,
+               COUNT(*) AS soft_skill_count,
+               AVG(COALESCE(es.proficiency, 0)) AS soft_skill_proficiency,
+               MAX(CASE WHEN LOWER(s.name) IN ('leadership', 'communication') THEN 1 ELSE 0 END)
+                   AS has_core_leadership_skill
+        FROM employee_skills AS es
+        JOIN skills AS s ON s.id = es.skill_id
+        WHERE s.category = ?
+        GROUP BY es.employee_id
+        """,
+        conn,
+        params=(SOFT_SKILL_CATEGORY,),
+    )
+
+    courses = employees.pop("courses_enrolled_map").map(lambda raw: _json_value(raw, {}))
+    statuses = courses.map(lambda c: [str(s).lower() for s in c.values()])
+    employees["completed_courses"] = statuses.map(lambda s: s.count("completed"))
+    employees["in_progress_courses"] = statuses.map(lambda s: s.count("in-progress"))
+    employees["goals_text"] = employees.pop("goals_set").map(
+        lambda raw: " ".join(map(str, _json_value(raw, [])))
+    )
+
+    frame = employees.merge(soft_skills, on="employee_id", how="left")
+    return frame.fillna(
+        {"soft_skill_count": 0, "soft_skill_proficiency": 0, "has_core_leadership_skill": 0}
+    )
+
+
+def score_frame(frame: pd.DataFrame, as_of: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Vectorized factor scores (0-10) for every row of `load_scoring_frame`.
+
+    Returns:
+        DataFrame with employee_id, the three factor scores, overall score,
+        label (Low/Mid/High) and the derived inputs.
+    """
+    as_of = as_of or datetime.now()
+    hire_dates = pd.to_datetime(frame["hire_date"], errors="coerce")
+    years = ((pd.Timestamp(as_of) - hire_dates).dt.days / 365).fillna(0).clip(lower=0)
+    position = pd.to_numeric(frame["position_level"], errors="coerce").fillna(1)
+
+    # Tenure saturates at 10 years; seniority is scaled over the position ladder
+    experience = 10 * (
+        0.6 * np.minimum(years / 10, 1)
+        + 0.4 * ((position - 1) / (MAX_POSITION_LEVEL - 1)).clip(0, 1)
+    )
+    learning = 10 * (
+        0.7 * np.minimum(frame["completed_courses"] / 5, 1)
+        + 0.3 * np.minimum(frame["in_progress_courses"] / 3, 1)
+    )
+    goal_intent = frame["goals_text"].str.contains(LEADERSHIP_GOAL_PATTERN, case=False, regex=True)
+    soft = 10 * (
+        0.5 * (frame["soft_skill_proficiency"] / MAX_PROFICIENCY)
+        * np.minimum(frame["soft_skill_count"] / 3, 1)
+        + 0.3 * frame["has_core_leadership_skill"]
+        + 0.2 * goal_intent.astype(float)
+    )
+
+    scores = pd.DataFrame({
+        "employee_id": frame["employee_id"],
+        "experience": experience.round(2),
+        "learning_engagement": learning.round(2),
+        "soft_skills_alignment": soft.clip(0, 10).round(2),
+        "years_with_company": years.round(2),
+        "completed_courses": frame["completed_courses"],
+    })
+    scores["overall"] = sum(scores[name] * weight for name, weight in FACTOR_WEIGHTS.items()).round(2)
+    scores["label"] = np.select(
+        [scores["overall"] >= HIGH_THRESHOLD, scores["overall"] >= MID_THRESHOLD],
+        ["High", "Mid"],
+        default="Low",
+    )
+    return scores
+
+
+def inputs_version(conn: sqlite3.Connection) -> str:
+    """data_versions of INPUT_TABLES, as one comparable string."""
+    placeholders = ", ".join("?" for _ in INPUT_TABLES)
+    rows = conn.execute(
+        f"SELECT name, version, token FROM data_versions WHERE name IN ({placeholders}) ORDER BY name",
+        INPUT_TABLES,
+    ).fetchall()
+    return json.dumps([list(row) for row in rows])
+
+
+def is_stale(conn: sqlite3.Connection, as_of: datetime, model_version: str = MODEL_VERSION) -> bool:
+    """True when `model_version` was never scored, or scored from other inputs or on another day."""
+    run = conn.execute(
+        "SELECT inputs_version, scored_on FROM leadership_scoring_runs WHERE model_version = ?",
+        (model_version,),
+    ).fetchone()
+    return run is None or tuple(run) != (inputs_version(conn), as_of.date().isoformat())
+
+
+def save_predictions(
+    conn: sqlite3.Connection,
+    scores: pd.DataFrame,
+    model_version: str = MODEL_VERSION,
+    inputs: Optional[str] = None,
+    scored_on: Optional[str] = None,
+) -> int:
+    """
+    Replace the stored predictions of `model_version` with `scores`. Returns rows written.
+
+    When `inputs` (see inputs_version) and `scored_on` are given they are
+    recorded in leadership_scoring_runs in the same transaction.
+    """
+    created_at = datetime.now(timezone.utc).isoformat()
+    factor_columns = [*FACTOR_WEIGHTS, "years_with_company", "completed_courses"]
+    factors = scores[factor_columns].to_dict(orient="records")
+    rows = [
+        (employee_id, model_version, float(overall), label, json.dumps(factor), created_at)
+        for employee_id, overall, label, factor in zip(
+            scores["employee_id"], scores["overall"], scores["label"], factors
+        )
+    ]
+    with conn:
+        conn.execute(
+            "DELETE FROM leadership_potential_predictions WHERE model_version = ?", (model_version,)
+        )
+        conn.executemany(
+            "INSERT INTO leadership_potential_predictions "
+            "(employee_id, model_version, score, label, factors_json, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        if inputs is not None and scored_on is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO leadership_scoring_runs (model_version, inputs_version, scored_on) "
+                "VALUES (?, ?, ?)",
+                (model_version, inputs, scored_on),
+            )
+    return len(rows)
+
+
+def score_workforce(conn: sqlite3.Connection, as_of: Optional[datetime] = None) -> int:
+    """Score every employee in one pass and persist the result."""
+    as_of = as_of or datetime.now()
+    # Read the versions before the data, so a concurrent write leaves the run stale
+    inputs = inputs_version(conn)
+    scores = score_frame(load_scoring_frame(conn), as_of)
+    return save_predictions(conn, scores, inputs=inputs, scored_on=as_of.date().isoformat())
+
+
+def prediction_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+    """API shape of a leadership_potential_predictions row."""
+    return {
+        "employee_id": row["employee_id"],
+        "model_version": row["model_version"],
+        "overall_score": row["score"],
+        "potential_level": row["label"],
+        "factors": json.loads(row["factors_json"] or "{}"),
+        "scored_at": row["created_at"],
+    }
+
+
+def _existing_employee_ids(conn: sqlite3.Connection, employee_ids: List[str]) -> set:
+    placeholders = ", ".join("?" for _ in employee_ids)
+    rows = conn.execute(f"SELECT id FROM employees WHERE id IN ({placeholders})", tuple(employee_ids))
+    return {row[0] for row in rows}
+
+
+def predictions_for(
+    conn: sqlite3.Connection,
+    employee_ids: Optional[List[str]] = None,
+    refresh: bool = False,
+    as_of: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Stored predictions of the current MODEL_VERSION.
+
+    Unknown employee ids are dropped without scoring anything. The whole
+    workforce is (re)scored first when `refresh` is set or the stored scores
+    are stale (see is_stale).
+    """
+    as_of = as_of or datetime.now()
+    wanted = None
+    if employee_ids is not None:
+        wanted = _existing_employee_ids(conn, employee_ids) if employee_ids else set()
+        if not wanted:
+            return []
+    if refresh or is_stale(conn, as_of):
+        score_workforce(conn, as_of)
+    rows = LeadershipPotentialPredictionRepository(conn).list_by_model_version(MODEL_VERSION)
+    if wanted is not None:
+        rows = [row for row in rows if row["employee_id"] in wanted]
+    return [prediction_to_dict(row) for row in rows]
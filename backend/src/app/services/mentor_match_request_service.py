@@ -6,6 +6,8 @@ from contextlib import suppress
 from datetime import UTC, datetime, date
 from typing import Dict, Iterable, List, Optional
 
+from app.core.reference_data import reference_data
+from app.data.repositories.base import unique_ids
 from app.data.repositories.department import DepartmentRepository
 from app.data.repositories.employee import EmployeeRepository
 from app.data.repositories.mentor_match_request import MentorMatchRequestRepository
@@ -71,36 +73,45 @@ class MentorMatchingService:
             mentee_position = mentee_profile.get("position_level")
             canonical_mentee_id = mentee_profile.get("id") or mentee_id
 
-        mentors: List[Dict] = []
-        for employee in self.employee_repo.list_employees():
-            employee_id = employee.get("id")
+        # Filter on columns first, then hydrate the survivors with a fixed
+        # number of batch lookups instead of several queries per employee.
+        candidates: List[Dict] = []
+        for raw_employee in self.employee_repo.list_employee_rows():
+            employee_id = raw_employee.get("id")
             if canonical_mentee_id and employee_id == canonical_mentee_id:
                 continue
 
-            mentor_position = employee.get("position_level")
+            mentor_position = raw_employee.get("position_level")
             if mentee_position is not None and (
                 mentor_position is None or mentor_position <= mentee_position
             ):
                 continue
 
-            if department and employee.get("department_id") != department:
+            if department and raw_employee.get("department_id") != department:
                 continue
 
-            raw_employee = self.employee_repo.get_employee_row(employee_id) or {}
-            mentor_profile = self.profile_repo.get_profile(employee_id) or {}
+            candidates.append(raw_employee)
+
+        profiles = {
+            profile["employee_id"]: profile for profile in self.profile_repo.list_profiles()
+        }
+        department_names = self._department_names(
+            candidate.get("department_id") for candidate in candidates
+        )
+        skill_names = reference_data.snapshot(self.conn).skill_names
+
+        mentors: List[Dict] = []
+        for raw_employee in candidates:
+            employee_id = raw_employee.get("id")
+            mentor_profile = profiles.get(employee_id) or {}
 
             if skill_area:
                 skill_area_lower = skill_area.lower()
-                skills_map_raw = raw_employee.get("skills_map")
-                matches_skill = False
-                if skills_map_raw:
-                    with suppress(json.JSONDecodeError, TypeError):
-                        parsed = json.loads(skills_map_raw)
-                        if skill_area in parsed:
-                            matches_skill = True
+                skill_ids = self._skill_ids(raw_employee.get("skills_map"))
+                matches_skill = skill_area in skill_ids
                 if not matches_skill:
-                    skill_names = [name.lower() for name in self._skills_from_map(raw_employee.get("skills_map"))]
-                    matches_skill = any(skill_area_lower in name for name in skill_names)
+                    names = self._skills_from_map(raw_employee.get("skills_map"), skill_names)
+                    matches_skill = any(skill_area_lower in name.lower() for name in names)
                 if not matches_skill:
                     continue
 
@@ -108,11 +119,6 @@ class MentorMatchingService:
                 **mentor_profile,
                 **raw_employee,
                 "employee_id": employee_id,
-                "name": employee.get("name"),
-                "role": employee.get("role"),
-                "department_id": employee.get("department_id"),
-                "level": employee.get("level"),
-                "position_level": employee.get("position_level"),
             }
 
             combined.setdefault("capacity", mentor_profile.get("capacity", 3))
@@ -120,7 +126,11 @@ class MentorMatchingService:
             combined.setdefault("rating", mentor_profile.get("rating", 0.0))
             combined.setdefault("personality", mentor_profile.get("personality", ""))
 
-            mentors.append(self._to_mentor_profile(combined))
+            mentors.append(
+                self._to_mentor_profile(
+                    combined, department_names=department_names, skill_names=skill_names
+                )
+            )
 
         mentors.sort(key=lambda mentor: (-mentor.get("rating", 0.0), mentor.get("name", "")))
         return mentors
@@ -238,15 +248,16 @@ class MentorMatchingService:
         resolved_mentor = self._resolve_employee_id(mentor_id) if mentor_id else None
         resolved_mentee = self._resolve_employee_id(mentee_id) if mentee_id else None
         rows = self.request_repo.list_requests(mentor_id=resolved_mentor, mentee_id=resolved_mentee)
+        # Filter out deleted requests unless explicitly requested
+        if not include_deleted:
+            rows = [row for row in rows if row.get("status") != "deleted"]
+
+        employee_profiles = self._profiles_for_rows(rows)
         results: List[Dict] = []
         for row in rows:
-            # Filter out deleted requests unless explicitly requested
-            if not include_deleted and row.get("status") == "deleted":
-                continue
-                
             payload = self.request_repo.decode_payload(row.get("explanation"))
-            mentee_profile = self.employee_repo.get_employee_profile(row["mentee_id"]) or {}
-            mentor_profile = self.employee_repo.get_employee_profile(row["mentor_id"]) or {}
+            mentee_profile = employee_profiles.get(row["mentee_id"], {})
+            mentor_profile = employee_profiles.get(row["mentor_id"], {})
             results.append(
                 self._build_request_dict(
                     row["id"],
@@ -340,10 +351,11 @@ class MentorMatchingService:
         rows = self.match_repo.list_matches_filtered(
             mentor_id=mentor_id, mentee_id=mentee_id
         )
+        employee_profiles = self._profiles_for_rows(rows)
         pairs: List[Dict] = []
         for row in rows:
-            mentor_profile = self.employee_repo.get_employee_profile(row["mentor_id"]) or {}
-            mentee_profile = self.employee_repo.get_employee_profile(row["mentee_id"]) or {}
+            mentor_profile = employee_profiles.get(row["mentor_id"], {})
+            mentee_profile = employee_profiles.get(row["mentee_id"], {})
             payload = self.request_repo.decode_payload(row.get("reasons_json"))
             pairs.append(
                 {
@@ -393,18 +405,37 @@ class MentorMatchingService:
     # --------------------------------------------------------------------- #
     # Helpers
     # --------------------------------------------------------------------- #
-    def _to_mentor_profile(self, row: Dict) -> Dict:
-        department_row = None
-        with suppress(Exception):
-            department_row = self.department_repo.get_department(row.get("department_id"))
+    def _profiles_for_rows(self, rows: List[Dict]) -> Dict[str, Dict]:
+        """Batch-load mentor and mentee profiles referenced by request/match rows."""
+        employee_ids = unique_ids(
+            employee_id for row in rows for employee_id in (row["mentee_id"], row["mentor_id"])
+        )
+        return self.employee_repo.get_employee_profiles(employee_ids)
+
+    def _department_names(self, department_ids: Iterable[Optional[str]]) -> Dict[str, str]:
+        names = reference_data.snapshot(self.conn).department_names
+        return {dept_id: names[dept_id] for dept_id in unique_ids(department_ids) if dept_id in names}
+
+    def _to_mentor_profile(
+        self,
+        row: Dict,
+        *,
+        department_names: Optional[Dict[str, str]] = None,
+        skill_names: Optional[Dict[str, str]] = None,
+    ) -> Dict:
+        department_id = row.get("department_id")
+        if department_names is None:
+            department_names = {}
+            with suppress(Exception):
+                department_names = self._department_names([department_id])
 
-        skills = self._skills_from_map(row.get("skills_map"))
+        skills = self._skills_from_map(row.get("skills_map"), skill_names)
 
         return {
             "employeeId": row.get("employee_id"),
             "name": row.get("name"),
             "role": row.get("role"),
-            "department": department_row["name"] if department_row else row.get("department_id"),
+            "department": department_names.get(department_id, department_id),
             "expertiseAreas": skills,
             "rating": float(row.get("rating") or 0.0),
             "menteesCount": row.get("mentees_count", 0),
@@ -415,16 +446,27 @@ class MentorMatchingService:
             "achievements": [],
         }
 
-    def _skills_from_map(self, skills_map: Optional[str]) -> List[str]:
+    @staticmethod
+    def _skill_ids(skills_map: Optional[str]) -> List[str]:
         if not skills_map:
             return []
-        with suppress(json.JSONDecodeError, TypeError):
-            parsed = json.loads(skills_map)
-            skill_ids = list(parsed.keys())
-            mapping = self.skill_repo.map_skill_ids_to_names(skill_ids)
-            return [mapping.get(skill_id, skill_id) for skill_id in skill_ids]
+        with suppress(json.JSONDecodeError, TypeError, AttributeError):
+            return list(json.loads(skills_map).keys())
         return []
 
+    def _skills_from_map(
+        self, skills_map: Optional[str], skill_names: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        skill_ids = self._skill_ids(skills_map)
+        if not skill_ids:
+            return []
+        mapping = (
+            skill_names
+            if skill_names is not None
+            else reference_data.snapshot(self.conn).skill_names
+        )
+        return [mapping.get(skill_id, skill_id) for skill_id in skill_ids]
+
     def _years_of_experience(self, hire_date: Optional[str]) -> int:
         if not hire_date:
             return 0
@@ -450,7 +492,7 @@ class MentorMatchingService:
             except (ValueError, TypeError, json.JSONDecodeError):
                 mentor_skills = {}
 
-        skill_names = self.skill_repo.map_skill_ids_to_names(list(mentor_skills.keys()))
+        skill_names = reference_data.snapshot(self.conn).skill_names
         normalized_skill_terms = {
             skill_id: skill_names.get(skill_id, skill_id).lower()
             for skill_id in mentor_skills.keys()
@@ -1,34 +1,44 @@
+import sqlite3
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 
-import pandas as pd
+import pytest
+from fastapi import HTTPException
 from pandas.errors import DatabaseError
 
 from app.api.v1 import analytics
 
 
-@patch("app.api.v1.analytics.sqlite3.connect")
-@patch("app.api.v1.analytics.pd.read_sql_query")
-def test_get_company_overview_handles_missing_table(mock_read_sql, mock_connect):
-    mock_conn = MagicMock()
-    mock_connect.return_value = mock_conn
-    mock_read_sql.side_effect = DatabaseError("no such table: employee_insights")
+@contextmanager
+def _connection():
+    yield MagicMock()
 
-    overview = analytics.get_company_overview()
+
+@patch("app.api.v1.analytics.insights_aggregates.overview")
+def test_get_company_overview_handles_missing_table(mock_overview):
+    mock_overview.side_effect = DatabaseError("no such table: insights_group_stats")
+    with patch("app.api.v1.analytics.read_connection", _connection):
+        overview = analytics.get_company_overview()
 
     assert overview["total_employees"] == 0
     assert overview["roles_count"] == {}
     assert overview["top_skills"] == []
-    mock_conn.close.assert_called_once()
-
 
-@patch("app.api.v1.analytics.sqlite3.connect")
-@patch("app.api.v1.analytics.pd.read_sql_query")
-def test_get_employee_details_handles_missing_table(mock_read_sql, mock_connect):
-    mock_conn = MagicMock()
-    mock_connect.return_value = mock_conn
-    mock_read_sql.side_effect = DatabaseError("no such table: employee_insights")
 
-    employees = analytics.get_employee_details()
+@patch("app.api.v1.analytics.insights_aggregates.employee_details")
+def test_get_employee_details_handles_missing_table(mock_details):
+    mock_details.side_effect = sqlite3.OperationalError("no such table: insights_derived")
+    with patch("app.api.v1.analytics.read_connection", _connection):
+        employees = analytics.get_employee_details()
 
     assert employees == []
-    mock_conn.close.assert_called_once()
+
+
+@patch("app.api.v1.analytics.insights_aggregates.overview")
+def test_unavailable_database_is_503_not_empty(mock_overview):
+    mock_overview.side_effect = sqlite3.OperationalError("unable to open database file")
+    with patch("app.api.v1.analytics.read_connection", _connection):
+        with pytest.raises(HTTPException) as excinfo:
+            analytics.get_company_overview()
+
+    assert excinfo.value.status_code == 503
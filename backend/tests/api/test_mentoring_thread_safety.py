@@ -63,15 +63,15 @@ def stub_course_agent_modules(monkeypatch):
     )
 
 
-def _make_thread_bound_connection() -> sqlite3.Connection:
+def _seed_database(db_path) -> None:
     """
-    Create an in-memory SQLite connection that enforces same-thread usage.
+    Seed a file database with a single available mentor.
 
     FastAPI runs sync dependencies in a thread pool. When the async endpoint
-    continues on the event loop, that thread switch triggers the original
-    ProgrammingError seen in production.
+    continues on the event loop, that thread switch triggered the original
+    ProgrammingError seen in production with thread-bound connections.
     """
-    conn = sqlite3.connect(":memory:")  # check_same_thread defaults to True
+    conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
     db.init_db(conn)
 
@@ -105,29 +105,29 @@ def _make_thread_bound_connection() -> sqlite3.Connection:
         ("EMP001", 1, 3, 0, 4.8, "Helpful mentor"),
     )
     conn.commit()
-    return conn
+    conn.close()
 
 
-def test_list_mentors_fails_with_default_thread_bound_connection(monkeypatch):
+def test_list_mentors_fails_with_default_thread_bound_connection(monkeypatch, tmp_path):
     """
     Reproduce the thread-bound SQLite failure observed in the browser logs.
 
-    The mentoring dependency builds its connection inside a sync dependency,
-    then yields control to an async endpoint. Without configuring the
-    connection for cross-thread use, FastAPI raises ProgrammingError.
+    The mentoring dependency obtains its connection from the pool, then yields
+    control to an async endpoint. Pooled connections must be usable across
+    that thread switch or FastAPI raises ProgrammingError.
     """
     from app.api.v1 import mentoring
 
-    # Force the dependency to return a thread-bound connection.
-    monkeypatch.setattr(
-        mentoring,
-        "get_connection",
-        lambda url=None: _make_thread_bound_connection(),
-    )
+    db_path = tmp_path / "thread_safety.db"
+    _seed_database(db_path)
+    monkeypatch.setenv("DATABASE_URL", str(db_path))
 
     app = FastAPI()
     app.include_router(mentoring.router)
     client = TestClient(app)
 
-    response = client.get("/api/v1/mentoring/mentors")
+    try:
+        response = client.get("/api/v1/mentoring/mentors")
+    finally:
+        db.close_all_managers()
     assert response.status_code == 200
@@ -0,0 +1,45 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.agent_registry import AgentRegistry
+
+
+def search_tool(query):
+    return query
+
+
+def other_tool(query):
+    return query
+
+
+def test_agent_is_built_once_under_concurrent_access():
+    registry = AgentRegistry()
+    builds = []
+    lock = threading.Lock()
+
+    def build():
+        with lock:
+            builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    key = registry.make_key(tools=[search_tool], system_prompt="sys", model="gpt", temperature=0.3)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        agents = list(pool.map(lambda _: registry.get(key, build, name="courses"), range(8)))
+
+    assert len(builds) == 1
+    assert all(a is agents[0] for a in agents)
+    stats = registry.stats()["courses"]
+    assert stats["builds"] == 1
+    assert stats["hits"] == 7
+
+
+def test_key_changes_with_tools_prompt_and_model_config():
+    make_key = AgentRegistry.make_key
+    base = make_key(tools=[search_tool], system_prompt="sys", model="gpt", temperature=0.3)
+
+    assert base == make_key(tools=[search_tool], system_prompt="sys", model="gpt", temperature=0.3)
+    assert base != make_key(tools=[other_tool], system_prompt="sys", model="gpt", temperature=0.3)
+    assert base != make_key(tools=[search_tool], system_prompt="other", model="gpt", temperature=0.3)
+    assert base != make_key(tools=[search_tool], system_prompt="sys", model="gpt", temperature=0.7)
@@ -0,0 +1,133 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core import db
+
+
+@pytest.fixture
+def manager(tmp_path: Path):
+    db_path = tmp_path / "pool.db"
+    conn = db.get_connection(str(db_path))
+    db.init_db(conn)
+    conn.close()
+
+    manager = db.get_manager(str(db_path))
+    yield manager
+    db.close_all_managers()
+
+
+def test_same_thread_reuses_configured_connection(manager) -> None:
+    with manager.connection() as first:
+        journal_mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = first.execute("PRAGMA synchronous").fetchone()[0]
+    with manager.connection() as second:
+        pass
+
+    assert first is second
+    assert journal_mode.lower() == "wal"
+    assert synchronous == 1  # NORMAL
+
+
+def test_each_thread_gets_its_own_connection(manager) -> None:
+    seen = []
+
+    def worker() -> None:
+        with manager.connection() as conn:
+            seen.append(id(conn))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(seen)) == 3
+
+
+def test_read_connection_is_read_only_and_returned_to_pool(manager) -> None:
+    with manager.read_connection() as reader:
+        with pytest.raises(Exception):
+            reader.execute("INSERT INTO departments (id, name) VALUES ('D1', 'Ops')")
+    with manager.read_connection() as again:
+        pass
+
+    assert reader is again
+
+
+def test_connection_rolls_back_on_error(manager) -> None:
+    with pytest.raises(RuntimeError):
+        with manager.connection() as conn:
+            conn.execute("INSERT INTO departments (id, name) VALUES ('D1', 'Ops')")
+            raise RuntimeError("boom")
+
+    with manager.connection() as conn:
+        count = conn.execute("SELECT COUNT(*) FROM departments").fetchone()[0]
+    assert count == 0
+
+
+def test_get_manager_is_cached_per_database(tmp_path: Path, manager) -> None:
+    assert db.get_manager(manager.db_path) is manager
+    assert db.get_manager(str(tmp_path / "other.db")) is not manager
+
+
+def test_checkout_is_private_until_released(manager) -> None:
+    with manager.checkout() as first:
+        with manager.checkout() as second:
+            assert first is not second
+            second.execute("INSERT INTO departments (id, name) VALUES ('D1', 'Ops')")
+        with manager.connection() as conn:
+            assert conn is not first
+    with manager.checkout() as again:
+        count = again.execute("SELECT COUNT(*) FROM departments").fetchone()[0]
+
+    assert again in (first, second)
+    assert count == 1
+
+
+def test_exhausted_reader_pool_times_out(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(db.settings, "db_pool_timeout_s", 0.05)
+    manager = db.ConnectionManager(str(tmp_path / "pool.db"), read_pool_size=1)
+    conn = db.get_connection(manager.db_path)
+    db.init_db(conn)
+    conn.close()
+    try:
+        with manager.read_connection():
+            with pytest.raises(TimeoutError, match="DB_READ_POOL_SIZE"):
+                with manager.read_connection():
+                    pass
+    finally:
+        manager.close_all()
+
+
+def test_checkout_pool_is_bounded_and_waits_for_release(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(db.settings, "db_pool_timeout_s", 0.05)
+    manager = db.ConnectionManager(str(tmp_path / "pool.db"), checkout_pool_size=1)
+    conn = db.get_connection(manager.db_path)
+    db.init_db(conn)
+    conn.close()
+    try:
+        with manager.checkout() as held:
+            with pytest.raises(TimeoutError, match="DB_CHECKOUT_POOL_SIZE"):
+                with manager.checkout():
+                    pass
+
+        monkeypatch.setattr(db.settings, "db_pool_timeout_s", 5)
+        seen = []
+
+        def waiter() -> None:
+            with manager.checkout() as conn:
+                seen.append(conn)
+
+        with manager.checkout() as held_again:
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            thread.join(0.1)
+            assert thread.is_alive()
+        thread.join()
+
+        assert held_again is held
+        assert seen == [held]
+    finally:
+        manager.close_all()
@@ -0,0 +1,115 @@
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.db import close_all_managers, connection, seed_employees
+from app.core import http_cache
+from app.core.http_cache import CachedRoute, ConditionalGetMiddleware, ResponseCache, etag_matches
+
+
+@pytest.fixture
+def db_url(tmp_path, monkeypatch):
+    url = str(tmp_path / "app.db")
+    monkeypatch.setenv("DATABASE_URL", url)
+    with connection(url) as conn:
+        seed_employees(conn, [{"id": "EMP1", "name": "Ana"}])
+    yield url
+    close_all_managers()
+
+
+@pytest.fixture
+def client(db_url):
+    calls = []
+    app = FastAPI()
+
+    @app.get("/api/employees/{employee_id}")
+    def profile(employee_id: str, refresh: bool = False):
+        calls.append(employee_id)
+        with connection(db_url) as conn:
+            name = conn.execute("SELECT name FROM employees WHERE id = ?", (employee_id,)).fetchone()
+        return {"id": employee_id, "name": name[0] if name else None}
+
+    app.add_middleware(
+        ConditionalGetMiddleware,
+        routes=(CachedRoute(r"/api/employees/[^/]+", tables=("employees",), bypass_params=("refresh",)),),
+        cache=ResponseCache(max_entries=8),
+    )
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_unchanged_data_is_answered_with_304_before_the_handler(client):
+    first = client.get("/api/employees/EMP1")
+    etag = first.headers["etag"]
+    assert first.json() == {"id": "EMP1", "name": "Ana"}
+    assert first.headers["cache-control"] == "no-cache"
+
+    not_modified = client.get("/api/employees/EMP1", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    replayed = client.get("/api/employees/EMP1")
+    assert replayed.json() == first.json()
+    assert replayed.headers["etag"] == etag
+    assert client.calls == ["EMP1"]
+
+
+def test_write_bumps_version_and_etag(client, db_url):
+    etag = client.get("/api/employees/EMP1").headers["etag"]
+
+    with connection(db_url) as conn:
+        conn.execute("UPDATE employees SET name = 'Ana Lim' WHERE id = 'EMP1'")
+
+    response = client.get("/api/employees/EMP1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Ana Lim"
+    assert response.headers["etag"] != etag
+    assert len(client.calls) == 2
+
+
+def test_params_and_bypass(client):
+    etag = client.get("/api/employees/EMP1").headers["etag"]
+    assert client.get("/api/employees/EMP2").headers["etag"] != etag
+
+    client.get("/api/employees/EMP1?refresh=true", headers={"If-None-Match": etag})
+    client.get("/api/employees/EMP1?refresh=true")
+    assert client.calls == ["EMP1", "EMP2", "EMP1", "EMP1"]
+
+
+def test_daily_route_etag_changes_with_the_date(db_url, monkeypatch):
+    app = FastAPI()
+
+    @app.get("/api/scores")
+    def scores():
+        return {"ok": True}
+
+    app.add_middleware(
+        ConditionalGetMiddleware,
+        routes=(CachedRoute(r"/api/scores", tables=("employees",), daily=True),),
+        cache=ResponseCache(max_entries=8),
+    )
+    client = TestClient(app)
+
+    class Today(date):
+        day = date(2025, 1, 1)
+
+        @classmethod
+        def today(cls):
+            return cls.day
+
+    monkeypatch.setattr(http_cache, "date", Today)
+    etag = client.get("/api/scores").headers["etag"]
+    assert client.get("/api/scores", headers={"If-None-Match": etag}).status_code == 304
+
+    Today.day = date(2025, 1, 2)
+    assert client.get("/api/scores", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
@@ -0,0 +1,144 @@
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from app.core import db
+from app.core.jobs import FAILED, SUCCEEDED, JobQueue, UnknownJobKind
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(db_url=str(tmp_path / "jobs.db"), max_workers=2)
+    yield q
+    q.shutdown(wait=True)
+    db.close_all_managers()
+
+
+def _wait(q, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = q.get(job_id)
+        if job["status"] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_runs_in_background_and_stores_result(queue):
+    queue.register("echo", lambda emp: {"json": {"employee": emp}})
+    job, created = queue.submit("echo", "EMP1")
+
+    assert created
+    assert job["status"] in ("queued", "running", "succeeded")
+    done = _wait(queue, job["id"])
+    assert done["status"] == SUCCEEDED
+    assert done["result"] == {"json": {"employee": "EMP1"}}
+    assert done["duration_ms"] is not None
+
+
+def test_identical_inflight_jobs_are_deduplicated(queue):
+    release = threading.Event()
+    calls = []
+
+    def slow(emp):
+        calls.append(emp)
+        release.wait(5)
+        return {"json": {"ok": True}}
+
+    queue.register("slow", slow)
+    first, created_first = queue.submit("slow", "EMP1")
+    second, created_second = queue.submit("slow", "EMP1")
+    other, created_other = queue.submit("slow", "EMP2")
+
+    assert created_first and not created_second and created_other
+    assert second["id"] == first["id"]
+    release.set()
+    _wait(queue, first["id"])
+    _wait(queue, other["id"])
+    assert sorted(calls) == ["EMP1", "EMP2"]
+
+    # Once finished, the same request starts a new job
+    again, created_again = queue.submit("slow", "EMP1")
+    assert created_again and again["id"] != first["id"]
+    _wait(queue, again["id"])
+
+
+def test_failures_and_unknown_kinds(queue):
+    def boom(emp):
+        raise RuntimeError("llm down")
+
+    queue.register("boom", boom)
+    job, _ = queue.submit("boom", "EMP1")
+    done = _wait(queue, job["id"])
+    assert done["status"] == FAILED
+    assert done["error"] == "llm down"
+
+    with pytest.raises(UnknownJobKind):
+        queue.submit("missing", "EMP1")
+    assert queue.get("nope") is None
+
+
+def test_error_results_fail_and_dedup_spans_queues(queue):
+    release = threading.Event()
+    queue.register("agent", lambda emp: release.wait(5) and {"error": "bad JSON", "raw_output": "oops"})
+    job, _ = queue.submit("agent", "EMP1")
+
+    # Another process (queue) on the same database sees the in-flight job
+    other = JobQueue(db_url=queue.db_url, max_workers=1)
+    other.register("agent", lambda emp: {"json": {}})
+    assert other.submit("agent", "EMP1") == (queue.get(job["id"]), False)
+
+    release.set()
+    done = _wait(queue, job["id"])
+    assert done["status"] == FAILED
+    assert done["error"] == "bad JSON"
+    assert done["result"] == {"error": "bad JSON", "raw_output": "oops"}
+
+
+def _insert_job(q, job_id, owner, status="running"):
+    with db.connection(q.db_url) as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, employee_id, dedup_key, status, owner, created_at) "
+            "VALUES (?, 'slow', 'EMP1', ?, ?, ?, '2024-01-01T00:00:00+00:00')",
+            (job_id, f"slow:{job_id}", status, owner),
+        )
+
+
+def test_recover_stale_fails_only_jobs_of_exited_processes(queue):
+    host = socket.gethostname()
+    live = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    try:
+        _insert_job(queue, "mine", queue.owner)
+        _insert_job(queue, "live", f"{host}:{live.pid}:abcd1234")
+        _insert_job(queue, "remote", "other-host:1:abcd1234", status="queued")
+        _insert_job(queue, "exited", f"{host}:{exited.pid}:abcd1234")
+        _insert_job(queue, "untagged", None, status="queued")
+
+        assert queue.recover_stale() == 2
+        statuses = {job_id: queue.get(job_id)["status"] for job_id in ("mine", "live", "remote", "exited", "untagged")}
+    finally:
+        live.kill()
+        live.wait()
+
+    assert statuses == {
+        "mine": "running", "live": "running", "remote": "queued",
+        "exited": FAILED, "untagged": FAILED,
+    }
+    assert queue.get("exited")["error"] == "interrupted"
+
+
+def test_recover_stale_fails_jobs_of_an_earlier_process_with_the_same_pid(queue):
+    release = threading.Event()
+    queue.register("slow", lambda emp: release.wait(5) and {"json": {}})
+    job, _ = queue.submit("slow", "EMP1")
+
+    # A restarted process often gets the same pid; the nonce tells them apart
+    assert JobQueue(db_url=queue.db_url).recover_stale() == 1
+    assert queue.get(job["id"])["error"] == "interrupted"
+    release.set()
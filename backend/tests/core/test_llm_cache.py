@@ -0,0 +1,80 @@
+import pytest
+
+from app.core import db
+from app.core.llm_cache import LLMResponseCache, fingerprint
+
+
+@pytest.fixture
+def cache(tmp_path):
+    url = str(tmp_path / "cache.db")
+    yield LLMResponseCache(db_url=url, ttl_s=60, max_entries=2), url
+    db.close_all_managers()
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_memoize_reuses_result_until_context_changes(cache):
+    cache, _ = cache
+    context = {"skills": ["Python"]}
+    calls = []
+
+    @cache.memoize("fn", prompt_version=1, model="m", context_loader=lambda emp: context)
+    def answer(employee_id):
+        calls.append(employee_id)
+        return {"json": {"n": len(calls)}, "text_summary": "ok"}
+
+    assert answer("EMP1") == {"json": {"n": 1}, "text_summary": "ok"}
+    assert answer("EMP1")["json"] == {"n": 1}
+    assert calls == ["EMP1"]
+
+    context["skills"].append("SQL")
+    assert answer("EMP1")["json"] == {"n": 2}
+
+
+def test_errors_are_not_cached(cache):
+    cache, _ = cache
+    calls = []
+
+    @cache.memoize("fn", prompt_version=1, model="m", context_loader=lambda emp: {})
+    def failing(employee_id):
+        calls.append(1)
+        return {"error": "boom"}
+
+    failing("EMP1")
+    failing("EMP1")
+    assert len(calls) == 2
+
+
+def test_persisted_entries_survive_a_new_process_and_expire(cache):
+    cache, url = cache
+    key = cache.make_key("fn", 1, "m", {"x": 1})
+    cache.set(key, {"json": 1}, function="fn", employee_id="EMP1")
+
+    fresh = LLMResponseCache(db_url=url, ttl_s=60)
+    assert fresh.get(key) == {"json": 1}
+
+    cache.set(key, {"json": 1}, function="fn", employee_id="EMP1", ttl_s=-1)
+    assert LLMResponseCache(db_url=url).get(key) is None
+
+
+def test_invalidate_employee_and_update_trigger(cache):
+    cache, url = cache
+    k1 = cache.make_key("fn", 1, "m", {"emp": 1})
+    k2 = cache.make_key("fn", 1, "m", {"emp": 2})
+    cache.set(k1, {"json": 1}, function="fn", employee_id="EMP1")
+    cache.set(k2, {"json": 2}, function="fn", employee_id="EMP2")
+
+    assert cache.invalidate_employee("EMP1") == 1
+    assert cache.get(k1) is None
+    assert cache.get(k2) == {"json": 2}
+
+    with db.connection(url) as conn:
+        conn.execute(
+            "INSERT INTO employees (id, name, skills_map) VALUES ('EMP2', 'B', '{}')"
+        )
+        conn.execute("UPDATE employees SET goals_set = '[\"lead\"]' WHERE id = 'EMP2'")
+        remaining = conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+    assert remaining == 0
@@ -0,0 +1,37 @@
+import pytest
+
+from app.core.llm_metrics import LLMMetrics
+
+
+def test_usage_is_attributed_to_the_tracked_function_and_mode():
+    metrics = LLMMetrics()
+
+    with metrics.track("career_pathway", mode="single_pass") as run:
+        metrics.record_usage(input_tokens=100, output_tokens=40)
+        run["repairs"] += 1
+    with metrics.track("career_pathway", mode="two_pass"):
+        metrics.record_usage(input_tokens=100, output_tokens=30)
+        metrics.record_usage(input_tokens=50, output_tokens=20)
+
+    # Usage outside a tracked block is ignored
+    metrics.record_usage(input_tokens=999, output_tokens=999)
+
+    snapshot = metrics.snapshot()["career_pathway"]
+    assert snapshot["single_pass"]["llm_calls"] == 1
+    assert snapshot["single_pass"]["repairs"] == 1
+    assert snapshot["single_pass"]["avg_tokens"] == 140
+    assert snapshot["two_pass"]["llm_calls"] == 2
+    assert snapshot["two_pass"]["avg_tokens"] == 200
+    assert snapshot["two_pass"]["requests"] == 1
+
+
+def test_errors_are_counted_and_reraised():
+    metrics = LLMMetrics()
+
+    with pytest.raises(RuntimeError):
+        with metrics.track("leadership_employer", mode="two_pass"):
+            raise RuntimeError("boom")
+
+    stats = metrics.snapshot()["leadership_employer"]["two_pass"]
+    assert stats["errors"] == 1
+    assert stats["requests"] == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_burst_up_to_capacity_then_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_s=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.now == pytest.approx(0.5)
+
+    clock.now += 10  # refill is capped at capacity
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.waited_s == pytest.approx(1.0)
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate_per_s=0)
+
+
+def test_multi_token_acquire_and_capacity_limit():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_s=1, capacity=4, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire(2) == 0.0
+    assert bucket.acquire(2) == 0.0
+    assert bucket.acquire(2) == pytest.approx(2.0)
+    with pytest.raises(ValueError):
+        bucket.acquire(5)
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+
+from app.core.db import init_db
+from app.core.reference_data import ReferenceDataCache
+from app.core.request_scope import request_scope
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    conn.execute("INSERT INTO departments (id, name) VALUES ('DEPT1', 'Engineering')")
+    conn.executemany(
+        "INSERT INTO skills (id, name, category) VALUES (?, ?, 'Technical')",
+        [("SK1", "Python"), ("SK2", "Cloud Architecture")],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _selects(conn, fn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        result = fn()
+    finally:
+        conn.set_trace_callback(None)
+    return result, [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_lookups_in_both_directions_and_reload_only_after_change(conn):
+    cache = ReferenceDataCache()
+
+    ref, cold = _selects(conn, lambda: cache.snapshot(conn))
+    assert ref.skill_names == {"SK1": "Python", "SK2": "Cloud Architecture"}
+    assert ref.skill_id(" cloud architecture ") == "SK2"
+    assert ref.department_names["DEPT1"] == "Engineering"
+    assert ref.department_id("engineering") == "DEPT1"
+    assert len(cold) == 3  # version check + skills + departments
+
+    again, warm = _selects(conn, lambda: cache.snapshot(conn))
+    assert again is ref
+    assert len(warm) == 1  # version check only
+
+    conn.execute("UPDATE skills SET name = 'Python 3' WHERE id = 'SK1'")
+    conn.commit()
+    assert cache.snapshot(conn).skill_names["SK1"] == "Python 3"
+    assert cache.stats() == {"hit": 1, "load": 2, "databases": 1}
+
+
+def test_separate_databases_do_not_share_entries(conn):
+    cache = ReferenceDataCache()
+    other = sqlite3.connect(":memory:")
+    init_db(other)
+    other.execute("INSERT INTO skills (id, name, category) VALUES ('SK1', 'Rust', 'Technical')")
+    other.commit()
+
+    assert cache.snapshot(conn).skill_names["SK1"] == "Python"
+    assert cache.snapshot(other).skill_names["SK1"] == "Rust"
+    other.close()
+
+
+def test_version_check_is_memoized_per_request_scope(conn):
+    cache = ReferenceDataCache()
+    cache.snapshot(conn)
+
+    with request_scope():
+        _, first = _selects(conn, lambda: cache.snapshot(conn))
+        _, second = _selects(conn, lambda: cache.snapshot(conn))
+
+    assert len(first) == 1
+    assert second == []
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_sync_callers_share_one_call():
+    sf = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    @sf.coalesce("slow")
+    def slow(employee_id):
+        calls.append(employee_id)
+        started.set()
+        release.wait(5)
+        return {"employee": employee_id}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(slow, "EMP1")
+        started.wait(5)
+        followers = [pool.submit(slow, "EMP1") for _ in range(4)]
+        while sf.stats()["wait"] < 4:
+            pass
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert calls == ["EMP1"]
+    assert all(r == {"employee": "EMP1"} for r in results)
+    assert sf.stats() == {"hit": 4, "miss": 1, "wait": 4, "error": 0, "in_flight": 0}
+
+
+def test_different_arguments_are_not_coalesced_and_errors_propagate():
+    sf = SingleFlight()
+
+    @sf.coalesce()
+    def boom(x):
+        raise ValueError(x)
+
+    with pytest.raises(ValueError):
+        boom(1)
+    with pytest.raises(ValueError):
+        boom(2)
+    assert sf.stats()["miss"] == 2
+    assert sf.stats()["error"] == 2
+
+
+def test_async_callers_share_one_coroutine():
+    sf = SingleFlight()
+    calls = []
+
+    @sf.coalesce("async")
+    async def fetch(employee_id):
+        calls.append(employee_id)
+        await asyncio.sleep(0.05)
+        return employee_id.lower()
+
+    async def main():
+        return await asyncio.gather(*(fetch("EMP1") for _ in range(5)))
+
+    assert asyncio.run(main()) == ["emp1"] * 5
+    assert calls == ["EMP1"]
+    assert sf.stats()["wait"] == 4
+    assert sf.stats()["hit"] == 4
+
+
+def test_async_callers_of_sync_function_run_off_the_event_loop():
+    sf = SingleFlight()
+    release = threading.Event()
+
+    def blocking():
+        release.wait(5)
+        return 42
+
+    async def main():
+        tasks = [asyncio.create_task(sf.do_async("k", blocking)) for _ in range(3)]
+        await asyncio.sleep(0.05)  # the loop stays responsive while they wait
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == [42, 42, 42]
+    assert sf.stats()["miss"] == 1
+
+
+def test_waiters_sharing_an_error_are_not_hits():
+    sf = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    @sf.coalesce("flaky")
+    def flaky():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("llm down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flaky)
+        started.wait(5)
+        followers = [pool.submit(flaky) for _ in range(2)]
+        while sf.stats()["wait"] < 2:
+            pass
+        release.set()
+        for future in [leader] + followers:
+            with pytest.raises(RuntimeError):
+                future.result()
+
+    assert sf.stats() == {"hit": 0, "miss": 1, "wait": 2, "error": 1, "in_flight": 0}
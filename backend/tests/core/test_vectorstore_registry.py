@@ -0,0 +1,82 @@
+import os
+import threading
+
+import pytest
+
+from app.core.vectorstore import (
+    VectorStoreHandle,
+    VectorStoreNotReady,
+    VectorStoreRegistry,
+)
+
+
+def test_handle_loads_lazily_on_first_get():
+    calls = []
+    handle = VectorStoreHandle("t", lambda: calls.append(1) or "store")
+
+    assert calls == []
+    assert handle.status()["state"] == "idle"
+    assert handle.get(timeout=5) == "store"
+    assert handle.get(timeout=5) == "store"
+    assert calls == [1]
+    assert handle.status()["ready"] is True
+
+
+def test_get_raises_while_loading_then_serves():
+    release = threading.Event()
+
+    def slow_loader():
+        release.wait(5)
+        return "store"
+
+    handle = VectorStoreHandle("slow", slow_loader)
+    handle.start()
+    with pytest.raises(VectorStoreNotReady):
+        handle.get(timeout=0.01)
+
+    release.set()
+    assert handle.get(timeout=5) == "store"
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def flaky_loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return "store"
+
+    handle = VectorStoreHandle("flaky", flaky_loader)
+    with pytest.raises(VectorStoreNotReady):
+        handle.get(timeout=5)
+    assert handle.status()["state"] == "failed"
+    assert handle.get(timeout=5) == "store"
+
+
+def test_hot_reload_swaps_when_index_changes(tmp_path):
+    index_dir = tmp_path / "index"
+    index_dir.mkdir()
+    (index_dir / "index.faiss").write_text("v1")
+    versions = iter(["v1", "v2"])
+
+    handle = VectorStoreHandle("hot", lambda: next(versions), watch_path=index_dir, reload_interval=0)
+    assert handle.get(timeout=5) == "v1"
+
+    (index_dir / "index.faiss").write_text("v2-longer")
+    os.utime(index_dir / "index.faiss", ns=(1, 1))
+    # The old store keeps serving while the new one is built
+    assert handle.get(timeout=5) == "v1"
+    handle._thread.join(5)
+    assert handle.get(timeout=5) == "v2"
+
+
+def test_registry_status_and_start_all():
+    reg = VectorStoreRegistry()
+    reg.register("a", lambda: "A", reload_interval=0)
+    assert reg.all_ready() is False
+
+    reg.start_all()
+    reg.get("a").get(timeout=5)
+    assert reg.all_ready() is True
+    assert reg.status()["a"]["state"] == "ready"
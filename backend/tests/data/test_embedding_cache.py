@@ -0,0 +1,41 @@
+import sqlite3
+
+from app.core.db import init_db
+from app.data.repositories.embedding_cache import EmbeddingCacheRepository, text_hash
+
+
+def _fake_embed(calls):
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+    return embed
+
+
+def test_embed_with_cache_only_embeds_misses():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    repo = EmbeddingCacheRepository(conn)
+    calls = []
+
+    first = repo.embed_with_cache("m", ["aa", "bbb", "aa"], _fake_embed(calls))
+    assert calls == [["aa", "bbb"]]
+    assert first == [[2.0, 0.5], [3.0, 0.5], [2.0, 0.5]]
+
+    second = repo.embed_with_cache("m", ["bbb", "cccc"], _fake_embed(calls))
+    assert calls[-1] == ["cccc"]
+    assert second == [[3.0, 0.5], [4.0, 0.5]]
+
+
+def test_cache_is_keyed_by_model_and_survives_reconnect(tmp_path):
+    db_path = tmp_path / "cache.db"
+    conn = sqlite3.connect(str(db_path))
+    init_db(conn)
+    EmbeddingCacheRepository(conn).put_vectors("m1", [(text_hash("x"), [1.0, 2.0])])
+    conn.close()
+
+    conn = sqlite3.connect(str(db_path))
+    repo = EmbeddingCacheRepository(conn)
+    assert repo.get_vectors("m1", [text_hash("x")]) == {text_hash("x"): [1.0, 2.0]}
+    assert repo.get_vectors("m2", [text_hash("x")]) == {}
+    row = conn.execute("SELECT dim, length(vector) FROM embedding_cache").fetchone()
+    assert tuple(row) == (2, 8)  # float32 BLOB
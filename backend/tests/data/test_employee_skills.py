@@ -0,0 +1,98 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.core.db import init_db
+from app.data.repositories.employee import EmployeeRepository
+from app.data.repositories.mentorship_profile import MentorshipProfileRepository
+
+
+@pytest.fixture
+def conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    init_db(conn)
+    return conn
+
+
+def _insert_employee(conn, employee_id, skills, verb="INSERT"):
+    conn.execute(
+        f"{verb} INTO employees (id, name, department_id, skills_map) VALUES (?, ?, 'DEPT001', ?)",
+        (employee_id, employee_id.title(), json.dumps(skills)),
+    )
+    conn.commit()
+
+
+def _skills_of(conn, employee_id):
+    rows = conn.execute(
+        "SELECT skill_id, proficiency FROM employee_skills WHERE employee_id = ?",
+        (employee_id,),
+    ).fetchall()
+    return {row["skill_id"]: row["proficiency"] for row in rows}
+
+
+def test_triggers_keep_employee_skills_in_sync(conn) -> None:
+    _insert_employee(conn, "EMP001", {"SKILL001": 3, "SKILL002": 5})
+    assert _skills_of(conn, "EMP001") == {"SKILL001": 3, "SKILL002": 5}
+
+    conn.execute(
+        "UPDATE employees SET skills_map = ? WHERE id = 'EMP001'",
+        (json.dumps({"SKILL003": 2}),),
+    )
+    assert _skills_of(conn, "EMP001") == {"SKILL003": 2}
+
+    _insert_employee(conn, "EMP001", {"SKILL004": 1}, verb="INSERT OR REPLACE")
+    assert _skills_of(conn, "EMP001") == {"SKILL004": 1}
+
+    conn.execute("UPDATE employees SET skills_map = 'not json' WHERE id = 'EMP001'")
+    assert _skills_of(conn, "EMP001") == {}
+
+    _insert_employee(conn, "EMP002", {"SKILL001": 4})
+    conn.execute("DELETE FROM employees WHERE id = 'EMP002'")
+    assert _skills_of(conn, "EMP002") == {}
+
+
+def test_find_employees_by_skills_uses_exact_skill_ids(conn) -> None:
+    _insert_employee(conn, "EMP001", {"SKILL001": 3})
+    _insert_employee(conn, "EMP002", {"SKILL0010": 3})
+    _insert_employee(conn, "EMP003", {"SKILL002": 3, "SKILL001": 1})
+
+    rows = EmployeeRepository(conn).find_employees_by_skills(["SKILL001"])
+
+    assert {row["id"] for row in rows} == {"EMP001", "EMP003"}
+
+
+def test_skill_lookup_uses_index(conn) -> None:
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT employee_id FROM employee_skills WHERE skill_id = ?",
+        ("SKILL001",),
+    ).fetchall()
+
+    assert any("idx_employee_skills_skill" in row[3] for row in plan)
+
+
+def test_available_mentors_filter_by_skill(conn) -> None:
+    _insert_employee(conn, "EMP001", {"SKILL001": 5})
+    _insert_employee(conn, "EMP002", {"SKILL002": 5})
+    conn.executemany(
+        """
+        INSERT INTO mentorship_profiles (employee_id, is_mentor, capacity, mentees_count, rating)
+        VALUES (?, 1, 3, 0, 4.0)
+        """,
+        [("EMP001",), ("EMP002",)],
+    )
+    conn.commit()
+
+    mentors = MentorshipProfileRepository(conn).get_available_mentors(skill_area="SKILL001")
+
+    assert [mentor["employee_id"] for mentor in mentors] == ["EMP001"]
+
+
+def test_double_encoded_skills_map_is_unwrapped(conn) -> None:
+    conn.execute(
+        "INSERT INTO employees (id, name, skills_map) VALUES ('EMP009', 'Nine', ?)",
+        (json.dumps(json.dumps({"SKILL005": 4})),),
+    )
+
+    assert _skills_of(conn, "EMP009") == {"SKILL005": 4}
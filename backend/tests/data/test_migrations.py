@@ -0,0 +1,56 @@
+import sqlite3
+
+from app.core.db import init_db
+from app.data.migrations import SCHEMA_VERSION, get_schema_version, run_migrations
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def test_run_migrations_applies_all_versions_once() -> None:
+    conn = _connect()
+
+    applied = run_migrations(conn)
+
+    assert applied == list(range(1, SCHEMA_VERSION + 1))
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert run_migrations(conn) == []
+
+
+def test_current_database_is_not_rewritten() -> None:
+    conn = _connect()
+    init_db(conn)
+    conn.execute(
+        "INSERT INTO employees (id, name, level, position_level) VALUES ('E1', 'A', 'Senior', NULL)"
+    )
+    conn.commit()
+
+    init_db(conn)
+
+    # The position_level backfill only runs as part of its migration
+    row = conn.execute("SELECT position_level FROM employees WHERE id = 'E1'").fetchone()
+    assert row["position_level"] is None
+
+
+def test_legacy_database_is_upgraded_in_place() -> None:
+    conn = _connect()
+    # employees as it existed before position_level was introduced
+    conn.execute(
+        """
+        CREATE TABLE employees (
+            id TEXT PRIMARY KEY, name TEXT, role TEXT, department_id TEXT, level TEXT,
+            points_current INTEGER DEFAULT 0, hire_date TEXT, skills_map TEXT,
+            courses_enrolled_map TEXT, goals_set TEXT
+        )
+        """
+    )
+    conn.execute("INSERT INTO employees (id, name, level) VALUES ('E1', 'A', 'Senior')")
+    conn.commit()
+
+    run_migrations(conn)
+
+    row = conn.execute("SELECT position_level FROM employees WHERE id = 'E1'").fetchone()
+    assert row["position_level"] == 4
@@ -0,0 +1,78 @@
+import json
+import sqlite3
+
+from app.core.db import init_db
+from app.data.repositories.course import CourseRepository
+from app.data.repositories.course_skill import CourseSkillRepository
+from app.data.repositories.purchase_history import PurchaseHistoryRepository
+from app.data.utils.seed_sync import SeedSpec, sync_seed
+
+
+def _spec(path):
+    return SeedSpec(
+        name="widgets",
+        path=path,
+        table="widgets",
+        columns=("id", "label"),
+        key_columns=("id",),
+        create_sql="CREATE TABLE IF NOT EXISTS widgets (id TEXT PRIMARY KEY, label TEXT)",
+        to_row=lambda w: (w["id"], w["label"]),
+    )
+
+
+def test_sync_seed_applies_only_the_diff(tmp_path):
+    path = tmp_path / "widgets.json"
+    path.write_text(json.dumps([{"id": "a", "label": "A"}, {"id": "b", "label": "B"}]))
+    conn = sqlite3.connect(":memory:")
+
+    first = sync_seed(conn, _spec(path))
+    assert (first.inserted, first.updated, first.deleted) == (2, 0, 0)
+
+    path.write_text(json.dumps([{"id": "a", "label": "A2"}, {"id": "c", "label": "C"}]))
+    second = sync_seed(conn, _spec(path))
+    assert (second.inserted, second.updated, second.deleted) == (1, 1, 1)
+    rows = conn.execute("SELECT id, label FROM widgets ORDER BY id").fetchall()
+    assert rows == [("a", "A2"), ("c", "C")]
+
+
+def test_unchanged_seed_skips_without_writes(tmp_path):
+    path = tmp_path / "widgets.json"
+    path.write_text(json.dumps([{"id": "a", "label": "A"}]))
+    conn = sqlite3.connect(":memory:")
+    sync_seed(conn, _spec(path))
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    result = sync_seed(conn, _spec(path))
+    conn.set_trace_callback(None)
+
+    assert result.skipped
+    assert not any(
+        s.lstrip().upper().startswith(("CREATE", "DROP", "DELETE", "INSERT", "UPDATE"))
+        for s in statements
+    )
+
+
+def test_repositories_do_not_reload_on_every_construction():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+
+    courses = CourseRepository(conn)
+    CourseSkillRepository(conn)
+    history = PurchaseHistoryRepository(conn)
+    assert courses.list_courses()
+    assert courses.get_course(courses.list_courses()[0]["id"])["url"] is not None
+
+    employee_id = conn.execute("SELECT id FROM purchase_history LIMIT 1").fetchone()[0]
+    history.conn.execute(
+        "UPDATE purchase_history SET points = -1 WHERE id = ?", (employee_id,)
+    )
+    conn.commit()
+
+    # Re-constructing the repositories must not wipe runtime changes.
+    CourseRepository(conn)
+    PurchaseHistoryRepository(conn)
+    points = conn.execute(
+        "SELECT points FROM purchase_history WHERE id = ?", (employee_id,)
+    ).fetchone()[0]
+    assert points == -1
@@ -0,0 +1,180 @@
+import dataclasses
+import importlib
+import json
+import sqlite3
+import sys
+import types
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+pytest.importorskip("langchain_openai")
+
+from app.core.config import settings
+from app.core.db import close_all_managers, init_db, seed_employees
+from app.core.llm_cache import LLMResponseCache
+from app.core.vectorstore import VectorStoreNotReady
+
+PACKAGE = "app.agent.course_recommendation_agent"
+EMPLOYEES = "app.api.v1.employees"
+
+STAGE = {"duration": "0-6 months", "focus": ["python"], "suggested_actions": ["course"], "expected_outcomes": "x"}
+PATHWAY = {
+    "analysis": "Solid base",
+    "career_pathway": {"short_term": STAGE, "mid_term": STAGE, "long_term": STAGE},
+    "role_transition": "Lead Engineer",
+}
+
+
+class FakeLLM:
+    """Stands in for AzureChatOpenAI: scripted replies, or raises `error`."""
+
+    def __init__(self):
+        self.replies = []
+        self.chunks = []
+        self.error = None
+
+    def invoke(self, prompt):
+        if self.error is not None:
+            raise self.error
+        return types.SimpleNamespace(content=self.replies.pop(0))
+
+    def stream(self, prompt):
+        for chunk in self.chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield types.SimpleNamespace(content=chunk)
+
+
+@pytest.fixture
+def agent(monkeypatch, tmp_path):
+    """Import main.py and the employees router with the tools module stubbed out."""
+    db_path = str(tmp_path / "agent.db")
+    conn = sqlite3.connect(db_path)
+    init_db(conn)
+    seed_employees(conn, [{"id": "EMP1", "name": "Ada", "hire_date": "2020-01-01"}])
+    conn.close()
+    monkeypatch.setenv("DATABASE_URL", db_path)
+
+    def get_employee_context(employee_id):
+        if employee_id != "EMP1":
+            raise ValueError(f"Employee {employee_id} not found")
+        return {
+            "profile": {"id": "EMP1", "name": "Ada", "role": "Engineer", "level": "Senior",
+                        "department_id": "D1", "points_current": 10, "hire_date": "2020-01-01"},
+            "skills": ["Python"],
+            "goals": ["Lead a team"],
+            "courses_enrolled": {},
+        }
+
+    tools_stub = types.ModuleType(f"{PACKAGE}.tools")
+    tools_stub.get_employee_context = get_employee_context
+    tools_stub.recommend_courses_tool = lambda skills, top_k=3: []
+    tools_stub.recommend_courses_batch = lambda ids, top_k=3: {}
+    monkeypatch.setitem(sys.modules, f"{PACKAGE}.tools", tools_stub)
+    for name in (f"{PACKAGE}.main", EMPLOYEES):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    main = importlib.import_module(f"{PACKAGE}.main")
+    employees = importlib.import_module(EMPLOYEES)
+    fake = FakeLLM()
+    monkeypatch.setattr(main, "llm", fake)
+    monkeypatch.setattr(main, "llm_cache", LLMResponseCache())
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
+    yield types.SimpleNamespace(main=main, employees=employees, llm=fake)
+    close_all_managers()
+
+
+@pytest.mark.parametrize("single_pass", [False, True])
+def test_llm_failures_propagate_instead_of_empty_results(agent, monkeypatch, single_pass):
+    monkeypatch.setattr(settings, "llm_single_pass", single_pass)
+    agent.llm.error = RuntimeError("LLM unavailable")
+
+    with pytest.raises(RuntimeError, match="LLM unavailable"):
+        agent.main.get_leadership_potential_employer("EMP1")
+    with pytest.raises(HTTPException) as excinfo:
+        agent.employees.leadership_potential_employer("EMP1")
+    assert excinfo.value.status_code == 500
+
+
+def test_unparseable_output_is_still_returned_raw(agent, monkeypatch):
+    monkeypatch.setattr(settings, "llm_single_pass", False)
+    agent.llm.replies = ["I cannot answer in JSON today."]
+
+    assert agent.main.get_leadership_potential_employer("EMP1") == {
+        "raw_output": "I cannot answer in JSON today."
+    }
+
+
+def test_vectorstore_not_ready_reaches_the_route_as_503(agent, monkeypatch):
+    def not_ready(prompt):
+        raise VectorStoreNotReady("courses index is still loading")
+
+    spec = agent.main.AGENT_FUNCTIONS["course_recommendations"]
+    monkeypatch.setitem(agent.main.AGENT_FUNCTIONS, "course_recommendations", dataclasses.replace(spec, run=not_ready))
+
+    with pytest.raises(HTTPException) as excinfo:
+        agent.employees.career_recommendations("EMP1")
+    assert excinfo.value.status_code == 503
+
+
+def _events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def stream(agent, monkeypatch):
+    """Test client for the SSE routes with a scripted career pathway agent."""
+    calls = []
+
+    def run_pathway(prompt):
+        calls.append(prompt)
+        return json.dumps(PATHWAY)
+
+    spec = agent.main.AGENT_FUNCTIONS["career_pathway"]
+    monkeypatch.setitem(agent.main.AGENT_FUNCTIONS, "career_pathway", dataclasses.replace(spec, run=run_pathway))
+    app = FastAPI()
+    app.include_router(agent.employees.router)
+    return types.SimpleNamespace(client=TestClient(app), calls=calls, llm=agent.llm)
+
+
+def test_stream_sends_json_then_tokens_then_done_and_replays_from_cache(stream, monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    stream.llm.chunks = ["Keep ", "", "going!"]
+
+    response = stream.client.get("/api/v1/employees/EMP1/career/pathway/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response)
+    assert [name for name, _ in events] == ["json", "token", "token", "done"]
+    assert events[0][1] == PATHWAY
+    assert [data["text"] for name, data in events if name == "token"] == ["Keep ", "going!"]
+    assert events[-1][1]["cached"] is False
+    assert events[-1][1]["json_ms"] <= events[-1][1]["first_token_ms"] <= events[-1][1]["total_ms"]
+
+    replay = _events(stream.client.get("/api/v1/employees/EMP1/career/pathway/stream"))
+    assert replay[:2] == [("json", PATHWAY), ("token", {"text": "Keep going!"})]
+    assert replay[2][0] == "done" and replay[2][1]["cached"] is True
+    assert len(stream.calls) == 1
+
+
+def test_stream_failure_ends_with_an_error_event(stream):
+    stream.llm.chunks = ["Keep ", RuntimeError("stream dropped")]
+
+    events = _events(stream.client.get("/api/v1/employees/EMP1/career/pathway/stream"))
+
+    assert [name for name, _ in events] == ["json", "token", "error"]
+    assert events[-1][1] == {"error": "stream dropped"}
+
+
+def test_stream_for_unknown_employee_is_404(stream):
+    response = stream.client.get("/api/v1/employees/EMP404/career/pathway/stream")
+
+    assert response.status_code == 404
+    assert stream.calls == []
@@ -0,0 +1,192 @@
+import importlib
+import shutil
+import sqlite3
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("langchain_community")
+pytest.importorskip("faiss")
+
+from app.agent.embeddings import EmbeddingSpec, HashingEmbeddings
+from app.core.db import close_all_managers, get_connection, init_db
+
+MODULE = "app.agent.course_recommendation_agent.tools"
+DIMENSION = 64
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    def __init__(self):
+        super().__init__(dimension=DIMENSION)
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.append(list(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return super().embed_query(text)
+
+
+@pytest.fixture
+def tools(monkeypatch, tmp_path):
+    """Import tools.py against a scratch database and FAISS index directory."""
+    db_path = tmp_path / "app.db"
+    conn = get_connection(str(db_path))
+    init_db(conn)
+    conn.close()
+    monkeypatch.setenv("DATABASE_URL", str(db_path))
+
+    # tools.py opens (and seeds) its own connection at import time
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: real_connect(str(db_path)))
+    monkeypatch.delitem(sys.modules, MODULE, raising=False)
+    module = importlib.import_module(MODULE)
+    monkeypatch.setattr(sqlite3, "connect", real_connect)
+
+    embedder = CountingEmbeddings()
+    spec = EmbeddingSpec("hashing", f"hash-{DIMENSION}", DIMENSION)
+    monkeypatch.setattr(module, "DB_PATH", db_path)
+    monkeypatch.setattr(module, "FAISS_INDEX_PATH", tmp_path / "course_vectorstore")
+    monkeypatch.setattr(module, "build_embeddings", lambda: (embedder, spec))
+    module.embedder = embedder
+    yield module
+    module.conn.close()
+    sys.modules.pop(MODULE, None)
+    close_all_managers()
+
+
+def _execute(tools, sql, params=()):
+    conn = sqlite3.connect(str(tools.DB_PATH))
+    try:
+        with conn:
+            conn.execute(sql, params)
+    finally:
+        conn.close()
+
+
+def _embedded(tools):
+    return [text for call in tools.embedder.documents for text in call]
+
+
+def test_sync_reembeds_only_changed_courses_and_drops_deleted_ones(tools):
+    first = tools.build_or_load_vectorstore()
+    course_ids = sorted(first.docstore._dict)
+    assert first.index.ntotal == len(course_ids) > 2
+    edited, deleted = course_ids[0], course_ids[1]
+    unchanged = {cid: first.docstore.search(cid).page_content for cid in course_ids[2:]}
+
+    _execute(tools, "UPDATE courses SET description = 'Rewritten description' WHERE id = ?", (edited,))
+    _execute(tools, "UPDATE courses SET active = 0 WHERE id = ?", (deleted,))
+    tools.embedder.documents.clear()
+
+    second = tools.build_or_load_vectorstore()
+
+    assert [len(call) for call in tools.embedder.documents] == [1]
+    assert _embedded(tools)[0].startswith("Rewritten description")
+    assert deleted not in second.docstore._dict
+    assert deleted not in second.index_to_docstore_id.values()
+    assert second.index.ntotal == len(course_ids) - 1
+    assert {cid: second.docstore.search(cid).page_content for cid in unchanged} == unchanged
+
+    # A rebuild from scratch takes every vector from the embedding cache
+    shutil.rmtree(tools.FAISS_INDEX_PATH)
+    tools.embedder.documents.clear()
+    rebuilt = tools.build_or_load_vectorstore()
+
+    assert _embedded(tools) == []
+    assert rebuilt.index.ntotal == len(course_ids) - 1
+
+
+COURSES = [
+    ("C_PY", "Python for data analysis", ["Python"]),
+    ("C_CLOUD", "Cloud security fundamentals", ["Cloud Security"]),
+    ("C_LEAD", "Leadership and team coaching", ["Leadership"]),
+]
+
+
+@pytest.fixture
+def batch(tools, monkeypatch):
+    """Three employees (one without skills) and a three-course FAISS index."""
+    from langchain_community.vectorstores import FAISS
+    from app.core.db import seed_employees
+
+    conn = sqlite3.connect(str(tools.DB_PATH))
+    conn.executemany(
+        "INSERT INTO skills (id, name, category) VALUES (?, ?, ?)",
+        [("SK_PY", "Python", "Technical"), ("SK_DATA", "Data analysis", "Technical"), ("SK_LEAD", "Leadership", "Soft")],
+    )
+    seed_employees(conn, [
+        {"id": "EMP_DATA", "name": "Data", "skills_map": '{"SK_PY": 4, "SK_DATA": 3}'},
+        {"id": "EMP_NONE", "name": "None", "skills_map": "{}"},
+        {"id": "EMP_LEAD", "name": "Lead", "skills_map": '{"SK_LEAD": 5}'},
+    ])
+    conn.close()
+
+    embeddings = tools.CachedEmbeddings(tools.embedder, model="hashing:test")
+    store = FAISS.from_texts(
+        [title for _, title, _ in COURSES],
+        embeddings,
+        metadatas=[{"id": cid, "title": title, "url": f"https://x/{cid}", "skills": skills} for cid, title, skills in COURSES],
+        ids=[cid for cid, _, _ in COURSES],
+    )
+    monkeypatch.setattr(tools, "course_vectorstore", types.SimpleNamespace(get=lambda timeout=None: store))
+    tools.embedder.documents.clear()
+    return store
+
+
+def _cached_vectors(tools):
+    conn = sqlite3.connect(str(tools.DB_PATH))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_recommend_courses_batch_keeps_input_order_and_ranks_by_distance(tools, batch):
+    results = tools.recommend_courses_batch(["EMP_LEAD", "EMP_MISSING", "EMP_NONE", "EMP_DATA"], top_k=2)
+
+    assert list(results) == ["EMP_LEAD", "EMP_NONE", "EMP_DATA"]
+    assert results["EMP_NONE"] == []
+    assert [rec["id"] for rec in results["EMP_LEAD"]][0] == "C_LEAD"
+    assert [rec["id"] for rec in results["EMP_DATA"]][0] == "C_PY"
+    for recs in (results["EMP_LEAD"], results["EMP_DATA"]):
+        assert len(recs) == 2
+        assert recs[0]["score"] <= recs[1]["score"]
+
+
+def test_recommend_courses_batch_caps_top_k_at_index_size(tools, batch):
+    results = tools.recommend_courses_batch(["EMP_DATA"], top_k=10)
+
+    assert batch.index.ntotal == 3
+    assert sorted(rec["id"] for rec in results["EMP_DATA"]) == ["C_CLOUD", "C_LEAD", "C_PY"]
+
+
+def test_batch_queries_are_embedded_once_without_the_document_cache(tools, batch):
+    cached_before = _cached_vectors(tools)
+
+    tools.recommend_courses_batch(["EMP_DATA", "EMP_LEAD"])
+
+    assert tools.embedder.documents == [["Python Data analysis", "Leadership"]]
+    assert tools.embedder.queries == []
+    assert _cached_vectors(tools) == cached_before
+
+
+def test_batch_route_reports_unknown_employees(tools, batch, monkeypatch):
+    from app.models.pydantic_schemas import BatchRecommendationRequest
+
+    # Other tests leave agent stubs in sys.modules; route through the real ones
+    for name in ("app.agent.course_recommendation_agent.main", "app.api.v1.employees"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    employees = importlib.import_module("app.api.v1.employees")
+    response = employees.batch_recommendations(
+        BatchRecommendationRequest(employee_ids=["EMP_MISSING", "EMP_DATA", "EMP_NONE"], top_k=1)
+    )
+
+    assert response["not_found"] == ["EMP_MISSING"]
+    assert list(response["recommendations"]) == ["EMP_DATA", "EMP_NONE"]
+    assert [rec["id"] for rec in response["recommendations"]["EMP_DATA"]] == ["C_PY"]
+    assert response["recommendations"]["EMP_NONE"] == []
@@ -0,0 +1,73 @@
+import json
+import sqlite3
+from functools import partial
+
+import pytest
+
+from app.agent.course_recommendation_agent import dashboard
+from app.core.db import init_db
+from app.services import insight_records
+
+
+def _insight(emp_id, skills, enrolled=None, recommended=(), leadership=None, years=1):
+    return {
+        "id": emp_id, "name": emp_id.title(), "department_id": "D1", "role": "Engineer", "level": "Senior",
+        "years_with_company": years, "skills": json.dumps(skills), "goals": json.dumps(["Lead"]),
+        "courses_enrolled": json.dumps(enrolled or {}), "courses_recommended_json": json.dumps(list(recommended)),
+        "leadership_json": json.dumps(leadership or {}), "leadership_summary": None,
+    }
+
+
+def _write_text(inputs, out_path, key):
+    out_path.write_text(json.dumps(inputs[key]), encoding="utf-8")
+
+
+ARTIFACTS = (
+    dashboard.Artifact("skills.json", ("top_skills",), partial(_write_text, key="top_skills")),
+    dashboard.Artifact("skills_plot.txt", ("top_skills",), partial(_write_text, key="top_skills"), plot=True),
+    dashboard.Artifact("goals_plot.txt", ("top_goals",), partial(_write_text, key="top_goals"), plot=True),
+)
+
+
+def test_compute_statistics_reads_typed_columns_and_child_tables(tmp_path):
+    db_path = tmp_path / "app.db"
+    conn = sqlite3.connect(db_path)
+    init_db(conn)
+    with conn:
+        insight_records.upsert_insights(conn, [
+            _insight("ana", ["SQL", "Python"], {"C1": "done"}, [{"title": "Leading"}, "Rust"],
+                     {"potential_category": "High", "overall_potential_score": 8}, years=6),
+            _insight("ben", ["Python", "Go"], {"C1": "done", "C2": "started"}, [{"id": "C9"}],
+                     {"overall_potential_score": 8.1}),
+            _insight("cai", [], recommended=[{"title": "Leading"}]),
+        ])
+    conn.close()
+
+    df = dashboard.normalize_df(dashboard.load_insights_tables(db_path))
+    stats = dashboard.compute_statistics(df)
+
+    # Ties keep first-seen order, as Counter.most_common did
+    assert stats["top_skills"] == [("Python", 2), ("SQL", 1), ("Go", 1)]
+    assert stats["top_enrolled_courses"] == [("C1", 2), ("C2", 1)]
+    assert stats["top_recommended_courses"] == [("Leading", 2), ("Rust", 1), ("C9", 1)]
+    # Typed categories fall back to "Mid" for evaluations without one
+    assert stats["leadership_distribution"] == {"High": 1, "Mid": 2}
+    assert df.set_index("id").loc["ana", "n_courses_enrolled"] == 1
+    assert [e["id"] for e in stats["high_potential_employees"]] == ["ana", "ben"]
+    assert stats["high_potential_employees"][0]["department"] == "D1"
+    json.dumps(stats)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_artifacts_skips_unchanged_inputs(tmp_path, workers):
+    inputs = {"top_skills": [["Python", 2]], "top_goals": [["Lead", 1]]}
+    build = partial(dashboard.build_artifacts, report_dir=tmp_path, plots_dir=tmp_path, artifacts=ARTIFACTS, workers=workers)
+
+    assert build(inputs)["built"] == ["skills.json", "skills_plot.txt", "goals_plot.txt"]
+    assert build(inputs) == {"built": [], "skipped": ["skills.json", "skills_plot.txt", "goals_plot.txt"]}
+
+    inputs["top_goals"] = [["Lead", 2]]
+    (tmp_path / "skills.json").unlink()
+    assert build(inputs) == {"built": ["skills.json", "goals_plot.txt"], "skipped": ["skills_plot.txt"]}
+    assert json.loads((tmp_path / "goals_plot.txt").read_text()) == [["Lead", 2]]
+    assert build(inputs, force=True)["skipped"] == []
@@ -0,0 +1,44 @@
+import math
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from app.agent.embeddings import EmbeddingSpec, HashingEmbeddings, build_embeddings
+
+
+def _cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def test_hashing_embeddings_are_deterministic_unit_vectors():
+    embedder = HashingEmbeddings(dimension=64)
+    first = embedder.embed_query("Python data analysis")
+    second = embedder.embed_documents(["Python data analysis"])[0]
+
+    assert first == second
+    assert len(first) == 64
+    assert math.isclose(sum(v * v for v in first), 1.0)
+
+
+def test_hashing_embeddings_rank_shared_words_higher():
+    embedder = HashingEmbeddings(dimension=256)
+    query = embedder.embed_query("cloud security")
+    related = embedder.embed_query("Cloud security fundamentals")
+    unrelated = embedder.embed_query("leadership coaching workshop")
+
+    assert _cosine(query, related) > _cosine(query, unrelated)
+
+
+def test_build_embeddings_records_provider_and_dimension(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "embedding_hash_dim", 32)
+    embedder, spec = build_embeddings("hashing")
+
+    assert spec == EmbeddingSpec("hashing", "hash-32", 32)
+    assert spec.cache_key == "hashing:hash-32"
+    assert len(embedder.embed_query("x")) == 32
+
+    with pytest.raises(ValueError):
+        build_embeddings("nope")
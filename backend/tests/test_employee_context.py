@@ -0,0 +1,99 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.core.db import close_all_managers, init_db, seed_employees
+from app.core.request_scope import request_scope
+from app.services import employee_context
+from app.services.employee_context import build_employee_contexts, get_employee_context, get_employee_contexts
+
+
+def _seed(conn):
+    init_db(conn)
+    conn.executemany(
+        "INSERT INTO skills (id, name, category) VALUES (?, ?, ?)",
+        [(f"SK{i}", f"Skill {i}", "Technical") for i in range(10)],
+    )
+    seed_employees(conn, [
+        {
+            "id": f"EMP{i}", "name": f"Employee {i}", "level": "Senior", "hire_date": "2020-01-01",
+            "skills_map": json.dumps({f"SK{i}": 3, f"SK{i + 1}": 4}),
+            "courses_enrolled_map": json.dumps({"C1": "completed"}),
+            "goals_set": json.dumps(["Lead a team"]),
+        }
+        for i in range(5)
+    ])
+    # Some seeded rows hold the skills object JSON-encoded twice
+    conn.execute(
+        "UPDATE employees SET skills_map = ? WHERE id = 'EMP4'",
+        (json.dumps(json.dumps({"SK9": 5})),),
+    )
+    conn.commit()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "context.db")
+    conn = sqlite3.connect(path)
+    _seed(conn)
+    conn.close()
+    yield path
+    close_all_managers()
+
+
+def _count_selects(conn, fn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        result = fn()
+    finally:
+        conn.set_trace_callback(None)
+    return result, sum(1 for s in statements if s.lstrip().upper().startswith("SELECT"))
+
+
+def test_contexts_are_built_with_a_fixed_number_of_queries():
+    conn = sqlite3.connect(":memory:")
+    _seed(conn)
+    build_employee_contexts(conn, ["EMP0"])  # warm the reference-data cache
+
+    _, one = _count_selects(conn, lambda: build_employee_contexts(conn, ["EMP0"]))
+    contexts, many = _count_selects(
+        conn, lambda: build_employee_contexts(conn, [f"EMP{i}" for i in range(5)] + ["MISSING"])
+    )
+
+    # employees + reference-data version check; skill names come from the cache
+    assert many == one == 2
+    assert set(contexts) == {f"EMP{i}" for i in range(5)}
+    assert contexts["EMP0"]["skills"] == ["Skill 0", "Skill 1"]
+    assert contexts["EMP4"]["skills"] == ["Skill 9"]
+    assert contexts["EMP0"]["goals"] == ["Lead a team"]
+    assert contexts["EMP0"]["courses_enrolled"] == {"C1": "completed"}
+    conn.close()
+
+
+def test_contexts_are_memoized_per_request_scope(db_path, monkeypatch):
+    builds = []
+    real_build = employee_context.build_employee_contexts
+
+    def counting_build(conn, ids):
+        builds.append(list(ids))
+        return real_build(conn, ids)
+
+    monkeypatch.setattr(employee_context, "build_employee_contexts", counting_build)
+
+    with request_scope():
+        first = get_employee_context("EMP1", db_path)
+        first["profile"]["points_current"] = 999  # callers get copies
+        bulk = get_employee_contexts(["EMP1", "EMP2"], db_path)
+        again = get_employee_context("EMP2", db_path)
+
+    assert builds == [["EMP1"], ["EMP2"]]
+    assert bulk["EMP1"]["profile"]["points_current"] != 999
+    assert again == bulk["EMP2"]
+
+    get_employee_context("EMP1", db_path)  # outside a scope nothing is memoized
+    assert builds[-1] == ["EMP1"]
+
+    with pytest.raises(ValueError):
+        get_employee_context("MISSING", db_path)
@@ -0,0 +1,135 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.core.db import init_db
+from app.data.migrations import ensure_insights_typed_storage
+from app.services import insight_records
+
+LEADERSHIP = {
+    "leadership_summary": "Ready for a team lead role.",
+    "leadership_factors": {
+        "experience": "6 years in role, score 8",
+        "learning_engagement": 6,
+        "soft_skills_alignment": "7.5/10 - strong communicator",
+        "strategic_outlook": "not assessed",
+    },
+    "overall_potential_score": 7.2,
+    "potential_category": "High",
+}
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    yield conn
+    conn.close()
+
+
+def test_typed_leadership_prefers_structured_scores():
+    typed = insight_records.typed_leadership(json.dumps(LEADERSHIP), "Low risk, 3 years")
+
+    assert typed == {
+        "leadership_score": 7.2,
+        "leadership_category": "High",
+        "experience_score": 8.0,
+        "learning_engagement_score": 6.0,
+        "soft_skills_score": 7.5,
+        "strategic_outlook_score": None,
+    }
+    # Unstructured evaluations fall back to the summary text
+    fallback = insight_records.typed_leadership({}, "Overall 4.5, low readiness")
+    assert (fallback["leadership_score"], fallback["leadership_category"]) == (4.5, "Low")
+
+
+def test_upsert_writes_typed_columns_and_child_rows(conn):
+    row = {
+        "id": "EMP1",
+        "skills": json.dumps(["Python", "SQL"]),
+        "goals": json.dumps(["Lead a team"]),
+        "courses_enrolled": json.dumps({"C1": "completed"}),
+        "courses_recommended_json": json.dumps([{"id": "C2", "title": "Leading Teams", "score": 0.8}]),
+        "leadership_json": json.dumps(LEADERSHIP),
+        "leadership_summary": "High potential",
+    }
+    insight_records.upsert_insights(conn, [row])
+    insight_records.upsert_insights(conn, [{**row, "skills": json.dumps(["Go"])}])
+
+    assert conn.execute(
+        "SELECT leadership_score, leadership_category, soft_skills_score FROM employee_insights"
+    ).fetchone() == (7.2, "High", 7.5)
+    assert conn.execute("SELECT skill FROM insight_skills").fetchall() == [("Go",)]
+    assert conn.execute("SELECT course_id, status FROM insight_courses").fetchall() == [("C1", "completed")]
+    assert conn.execute(
+        "SELECT position, course_id, title, score FROM insight_recommendations"
+    ).fetchall() == [(0, "C2", "Leading Teams", 0.8)]
+
+    conn.execute("DELETE FROM employee_insights WHERE id = 'EMP1'")
+    assert conn.execute("SELECT COUNT(*) FROM insight_goals").fetchone()[0] == 0
+
+
+def test_migration_backfills_existing_rows(conn):
+    conn.execute(
+        "INSERT INTO employee_insights (id, skills, goals, courses_enrolled, leadership_json) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (
+            "EMP_OLD",
+            json.dumps({"SK1": 3, "SK2": 5}),
+            json.dumps(["Mentor juniors", "Learn Rust"]),
+            json.dumps({"C9": "in-progress"}),
+            json.dumps(LEADERSHIP),
+        ),
+    )
+
+    ensure_insights_typed_storage(conn)
+
+    assert conn.execute(
+        "SELECT leadership_score, leadership_category, learning_engagement_score, experience_score "
+        "FROM employee_insights"
+    ).fetchone() == (7.2, "High", 6.0, None)
+    assert conn.execute("SELECT skill FROM insight_skills ORDER BY position").fetchall() == [("SK1",), ("SK2",)]
+    assert conn.execute("SELECT goal FROM insight_goals ORDER BY position").fetchall() == [
+        ("Mentor juniors",), ("Learn Rust",),
+    ]
+    assert conn.execute("SELECT course_id FROM insight_courses").fetchall() == [("C9",)]
+
+
+def test_sql_backfill_matches_python_writer(conn):
+    rows = [
+        {
+            "id": "EMP_A",
+            "skills": json.dumps(["Python", {"name": "SQL"}, None, {"title": ""}, 3, "Go"]),
+            "goals": json.dumps({"Lead": 1, "Mentor": 2}),
+            "courses_enrolled": json.dumps({"C1": "completed", "C2": None}),
+            "courses_recommended_json": json.dumps(
+                ["Intro", {"name": "Rust", "url": "u", "score": 2}, {"url": "none"}, {"id": "C7", "score": "x"}]
+            ),
+        },
+        {"id": "EMP_B", "skills": json.dumps("Solo"), "goals": "not json", "courses_enrolled": None,
+         "courses_recommended_json": json.dumps({"id": "C1"})},
+        {"id": "EMP_C", "skills": json.dumps(""), "goals": json.dumps([]), "courses_enrolled": json.dumps({}),
+         "courses_recommended_json": json.dumps([])},
+    ]
+    conn.executemany(
+        "INSERT INTO employee_insights (id, skills, goals, courses_enrolled, courses_recommended_json) "
+        "VALUES (:id, :skills, :goals, :courses_enrolled, :courses_recommended_json)",
+        rows,
+    )
+
+    conn.execute("DELETE FROM insights_aggregates_dirty")
+    ensure_insights_typed_storage(conn)
+
+    expected = {table: [] for table in insight_records._CHILD_INSERTS}
+    for row in rows:
+        for table, child in insight_records.child_rows(row).items():
+            expected[table].extend(child)
+    for table, child in expected.items():
+        assert sorted(map(tuple, conn.execute(f"SELECT * FROM {table}"))) == sorted(child), table
+    assert [r[0] for r in conn.execute("SELECT skill FROM insight_skills WHERE employee_id = 'EMP_A' ORDER BY position")] == [
+        "Python", "SQL", "3", "Go",
+    ]
+    assert sorted(r[0] for r in conn.execute("SELECT employee_id FROM insights_aggregates_dirty")) == [
+        "EMP_A", "EMP_B", "EMP_C",
+    ]
@@ -0,0 +1,125 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.api.v1 import analytics
+from app.core.db import close_all_managers, init_db
+from app.services import insight_records, insights_aggregates
+
+COLUMNS = (
+    "id", "name", "department_id", "role", "level", "years_with_company",
+    "skills", "goals", "courses_enrolled", "leadership_summary", "courses_recommended_json",
+)
+
+
+def _row(emp_id, role, dept, years, skills, summary, goals=(), enrolled=None, recommended=()):
+    return (
+        emp_id, emp_id.title(), dept, role, "Senior", years,
+        json.dumps(list(skills)), json.dumps(list(goals)), json.dumps(enrolled or {}),
+        summary, json.dumps([{"id": c, "title": c.title()} for c in recommended]),
+    )
+
+
+def _upsert(conn, *rows):
+    with conn:
+        insight_records.upsert_insights(conn, [dict(zip(COLUMNS, row)) for row in rows])
+
+
+def _tables(conn):
+    return {
+        "facets": sorted(conn.execute("SELECT facet, value, count FROM insights_facet_counts").fetchall()),
+        "groups": sorted(
+            (dimension, key, employees, round(skills, 6), round(years, 6), years_n, round(score, 6), score_n)
+            for dimension, key, employees, skills, years, years_n, score, score_n in conn.execute(
+                "SELECT * FROM insights_group_stats"
+            )
+        ),
+    }
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "app.db")
+    init_db(conn)
+    _upsert(
+        conn,
+        _row("ana", "Engineer", "D1", 6.5, ["Python", "SQL"], "Score 8.5 - High potential",
+             goals=["Lead a team"], enrolled={"C1": "completed"}, recommended=["c2"]),
+        _row("ben", "Engineer", "D1", 1.5, ["Python"], "3/10, low potential", recommended=["c2", "c3"]),
+        _row("cai", "Designer", "D2", 3.0, ["Figma", "UX", "Research", "Python"], "Solid, 5 overall"),
+    )
+    yield conn
+    conn.close()
+
+
+def test_overview_is_served_from_summary_tables(conn):
+    assert insights_aggregates.refresh(conn) == 3
+    overview = insights_aggregates.overview(conn)
+
+    assert overview["total_employees"] == 3
+    assert overview["roles_count"] == {"Engineer": 2, "Designer": 1}
+    assert overview["top_skills"][0] == ["Python", 3]
+    assert overview["top_recommended_courses"] == [["C2", 2], ["C3", 1]]
+    assert overview["leadership_distribution"] == {"High": 1, "Low": 1, "Mid": 1}
+    assert [e["id"] for e in overview["high_potential_employees"]] == ["ana"]
+    assert overview["high_potential_employees"][0]["leadership_score"] == 8.5
+    assert [e["id"] for e in overview["most_senior"]] == ["ana", "cai", "ben"]
+
+    engineers = next(r for r in overview["role_analytics"] if r["role"] == "Engineer")
+    assert engineers == {
+        "role": "Engineer", "count": 2, "avg_skills": 1.5,
+        "avg_leadership_score": 5.75, "avg_years": 4.0,
+    }
+    assert [r["role"] for r in overview["roles_lacking_skills"]] == ["Engineer"]
+
+
+def test_upserts_are_applied_incrementally(conn):
+    insights_aggregates.refresh(conn)
+
+    _upsert(conn, _row("ben", "Designer", "D2", 2.0, ["UX"], "High potential, 9"))
+    conn.execute("DELETE FROM employee_insights WHERE id = 'cai'")
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM insights_aggregates_dirty").fetchone()[0] == 2
+
+    assert insights_aggregates.refresh(conn) == 2
+    assert insights_aggregates.refresh(conn) == 0
+    incremental = _tables(conn)
+
+    insights_aggregates.rebuild(conn)
+    assert incremental == _tables(conn)
+    assert dict(insights_aggregates._top(conn, "role")) == {"Designer": 1, "Engineer": 1}
+    assert insights_aggregates.department_stats(conn) == [
+        {"department_id": "D1", "total_employees": 1, "avg_tenure": 6.5},
+        {"department_id": "D2", "total_employees": 1, "avg_tenure": 2.0},
+    ]
+
+
+def test_routes_read_aggregates_without_refreshing(conn, tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "app.db"))
+    insights_aggregates.refresh(conn)
+    _upsert(conn, _row("dev", "Engineer", "D1", 1.0, ["Go"], "Mid potential"))
+
+    # The queued change is left for the writer; the GET only reads
+    assert analytics.get_company_overview()["total_employees"] == 3
+    assert conn.execute("SELECT COUNT(*) FROM insights_aggregates_dirty").fetchone()[0] == 1
+    assert {r["role"]: r["total_employees"] for r in analytics.get_role_analytics()} == {
+        "Designer": 1, "Engineer": 2,
+    }
+    employees = analytics.get_employee_details()
+    assert employees[0]["id"] == "ana"
+    assert employees[0]["skills"] == ["Python", "SQL"]
+    assert employees[0]["leadership_summary"] == "Score 8.5 - High potential"
+    close_all_managers()
+
+
+def test_refresh_without_pending_changes_takes_no_write_lock(conn, tmp_path):
+    insights_aggregates.refresh(conn)
+    conn.commit()
+    other = sqlite3.connect(tmp_path / "app.db", timeout=0)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        assert insights_aggregates.refresh(conn) == 0
+    finally:
+        other.rollback()
+        other.close()
@@ -0,0 +1,133 @@
+import importlib
+import sqlite3
+import sys
+import types
+
+import pytest
+
+from app.core.db import close_all_managers
+
+PACKAGE = "app.agent.course_recommendation_agent"
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    """Import info_for_employer with the heavy agent modules stubbed out."""
+    calls = []
+    skills = {}
+
+    tools_stub = types.ModuleType(f"{PACKAGE}.tools")
+    tools_stub.get_employee_context = lambda employee_id: {
+        "profile": {"id": employee_id, "name": f"Name {employee_id}", "hire_date": "2020-01-01"},
+        "skills": skills.get(employee_id, ["python"]),
+        "goals": [],
+        "courses_enrolled": {},
+    }
+    tools_stub.get_employee_contexts = lambda ids: {
+        emp_id: tools_stub.get_employee_context(emp_id) for emp_id in ids
+    }
+    tools_stub.recommend_courses_batch = lambda ids: {emp_id: [{"title": "Course"}] for emp_id in ids}
+    tools_stub.employee_repo = types.SimpleNamespace(list_employees=lambda: [])
+
+    def leadership(employee_id):
+        calls.append(employee_id)
+        if employee_id == "EMP_BAD":
+            return {"raw_output": "not json"}
+        return {"json": {"overall_potential_score": 7}, "text_summary": "ready"}
+
+    main_stub = types.ModuleType(f"{PACKAGE}.main")
+    main_stub.DEPLOYMENT = "test-model"
+    main_stub.PROMPT_VERSIONS = {"leadership_employer": 1, "career_pathway": 1}
+    main_stub.get_leadership_potential_employer = leadership
+    main_stub.get_career_pathway = lambda employee_id: {"json": {"analysis": "a"}, "text_summary": "path"}
+
+    monkeypatch.setitem(sys.modules, f"{PACKAGE}.tools", tools_stub)
+    monkeypatch.setitem(sys.modules, f"{PACKAGE}.main", main_stub)
+    monkeypatch.delitem(sys.modules, f"{PACKAGE}.info_for_employer", raising=False)
+    module = importlib.import_module(f"{PACKAGE}.info_for_employer")
+
+    db_path = str(tmp_path / "insights.db")
+    yield types.SimpleNamespace(module=module, db_path=db_path, calls=calls, skills=skills)
+    sys.modules.pop(f"{PACKAGE}.info_for_employer", None)
+    close_all_managers()
+
+
+def _insight_ids(db_path):
+    close_all_managers()
+    with sqlite3.connect(db_path) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT id FROM employee_insights"))
+
+
+def test_pipeline_upserts_in_batches_and_resumes_failed_employees(pipeline):
+    module, db_path, calls = pipeline.module, pipeline.db_path, pipeline.calls
+    ids = ["EMP1", "EMP2", "EMP3", "EMP_BAD"]
+
+    first = module.run_pipeline(
+        employee_ids=ids, workers=3, rate_per_minute=0, batch_size=2, db_url=db_path
+    )
+
+    assert first["succeeded"] == 3
+    assert first["failed"] == 1
+    assert _insight_ids(db_path) == ["EMP1", "EMP2", "EMP3"]
+
+    calls.clear()
+    second = module.run_pipeline(
+        employee_ids=ids, workers=3, rate_per_minute=0, resume="latest", db_url=db_path
+    )
+
+    # Only the employee that failed is retried
+    assert calls == ["EMP_BAD"]
+    assert second["run_id"] == first["run_id"]
+    assert second["skipped"] == 3
+
+
+def test_fresh_run_processes_everyone_again(pipeline):
+    module, db_path, calls = pipeline.module, pipeline.db_path, pipeline.calls
+
+    module.run_pipeline(employee_ids=["EMP1"], workers=1, rate_per_minute=0, db_url=db_path)
+    summary = module.run_pipeline(employee_ids=["EMP1"], workers=1, rate_per_minute=0, db_url=db_path)
+
+    assert calls == ["EMP1", "EMP1"]
+    assert summary["skipped"] == 0
+    assert summary["succeeded"] == 1
+
+
+def test_changed_only_recomputes_changed_and_expired_rows(pipeline):
+    module, db_path, calls = pipeline.module, pipeline.db_path, pipeline.calls
+    ids = ["EMP1", "EMP2", "EMP3"]
+    module.run_pipeline(employee_ids=ids, workers=2, rate_per_minute=0, db_url=db_path)
+
+    calls.clear()
+    pipeline.skills["EMP2"] = ["python", "leadership"]
+    close_all_managers()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE employee_insights SET refreshed_at = '2000-01-01' WHERE id = 'EMP3'")
+
+    summary = module.run_pipeline(
+        employee_ids=ids + ["EMP4"], workers=2, rate_per_minute=0,
+        changed_only=True, max_age_days=30, db_url=db_path,
+    )
+
+    assert sorted(calls) == ["EMP2", "EMP3", "EMP4"]
+    assert summary["unchanged"] == 1
+
+    calls.clear()
+    summary = module.run_pipeline(
+        employee_ids=ids + ["EMP4"], workers=2, rate_per_minute=0, changed_only=True, db_url=db_path,
+    )
+    assert calls == []
+    assert summary["unchanged"] == 4
+
+
+@pytest.mark.parametrize("single_pass, per_call", [(False, 2), (True, 1)])
+def test_rate_limit_takes_a_token_per_llm_request(pipeline, monkeypatch, single_pass, per_call):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "llm_single_pass", single_pass)
+    taken = []
+    limiter = types.SimpleNamespace(acquire=taken.append)
+
+    pipeline.module.build_insight_row("EMP1", [], limiter=limiter)
+
+    # One leadership and one career pathway call
+    assert taken == [per_call, per_call]
@@ -0,0 +1,82 @@
+import json
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.core.db import close_all_managers, init_db  # noqa: E402
+from app.services import insight_records, insights_snapshot  # noqa: E402
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    url = str(tmp_path / "app.db")
+    conn = sqlite3.connect(url)
+    init_db(conn)
+    with conn:
+        conn.execute("INSERT INTO departments (id, name) VALUES ('D1', 'Engineering')")
+        conn.execute("INSERT INTO skills (id, name, category) VALUES ('SK1', 'Python', 'Technical')")
+        conn.execute("INSERT INTO employees (id, name, position_level) VALUES ('ana', 'Ana', 3)")
+        insight_records.upsert_insights(conn, [
+            {
+                "id": emp_id, "name": emp_id.title(), "department_id": dept, "role": "Engineer",
+                "years_with_company": years, "skills": json.dumps(skills), "goals": json.dumps(["Lead"]),
+                "leadership_json": json.dumps({"overall_potential_score": score, "potential_category": "Mid"}),
+                "leadership_summary": "summary",
+            }
+            for emp_id, dept, years, skills, score in (
+                ("ana", "D1", 4.0, ["Python", "SQL"], 6.5),
+                ("ben", "D2", 1.0, ["Figma"], 3.0),
+                ("cai", None, 2.0, [], 5.0),
+            )
+        ])
+    conn.close()
+    yield url
+    close_all_managers()
+
+
+def test_export_and_load_selected_columns(db_url, tmp_path):
+    root = tmp_path / "snapshots"
+    manifest = insights_snapshot.export_snapshot(db_url=db_url, root=root)
+
+    assert manifest["tables"]["insights"]["rows"] == 3
+    assert manifest["tables"]["skills"]["rows"] == 3
+    assert manifest["tables"]["courses"]["rows"] == 0
+    snapshot = insights_snapshot.latest_snapshot(root)
+    assert snapshot.name == manifest["snapshot_id"]
+    assert (snapshot / "insights" / "department_id=D1").is_dir()
+
+    frame = insights_snapshot.load_frame(
+        "insights", columns=["id", "leadership_score", "department_name", "position_level"], snapshot=snapshot
+    )
+    assert list(frame.columns) == ["id", "leadership_score", "department_name", "position_level"]
+    ana = frame.set_index("id").loc["ana"]
+    assert (ana["leadership_score"], ana["department_name"], ana["position_level"]) == (6.5, "Engineering", 3)
+
+    d1_skills = insights_snapshot.load_frame(
+        "skills", filters=[("department_id", "=", "D1")], snapshot=snapshot, arrow_dtypes=False
+    )
+    assert sorted(d1_skills["skill"]) == ["Python", "SQL"]
+    assert d1_skills.set_index("skill").loc["Python", "skill_id"] == "SK1"
+    assert insights_snapshot.load_frame("courses", snapshot=snapshot).empty
+
+
+def test_employee_details_match_and_old_snapshots_are_pruned(db_url, tmp_path):
+    root = tmp_path / "snapshots"
+    first = insights_snapshot.export_snapshot(db_url=db_url, root=root, keep=1)
+    second = insights_snapshot.export_snapshot(db_url=db_url, root=root, keep=1)
+
+    assert not (root / first["snapshot_id"]).exists()
+    assert insights_snapshot.read_manifest(root / second["snapshot_id"])["snapshot_id"] == second["snapshot_id"]
+
+    rows = insights_snapshot.employee_details(insights_snapshot.latest_snapshot(root))
+    assert [row["id"] for row in rows] == ["ana", "ben", "cai"]
+    assert rows[0]["skills"] == ["Python", "SQL"]
+    assert rows[2]["skills"] == []
+    assert rows[2]["department_id"] is None
+
+
+def test_missing_snapshot(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        insights_snapshot.latest_snapshot(tmp_path / "none")
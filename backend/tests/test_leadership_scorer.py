@@ -0,0 +1,98 @@
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from app.core.db import init_db, seed_employees
+from app.services import leadership_scorer
+
+AS_OF = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    init_db(conn)
+    conn.executemany(
+        "INSERT INTO skills (id, name, category) VALUES (?, ?, ?)",
+        [
+            ("SK_PY", "Python Programming", "Technical"),
+            ("SK_LEAD", "Leadership", "Soft Skills"),
+            ("SK_COMM", "Communication", "Soft Skills"),
+            ("SK_TEAM", "Team Collaboration", "Soft Skills"),
+        ],
+    )
+    seed_employees(conn, [
+        {
+            "id": "EMP_SENIOR", "name": "Senior", "level": "Senior", "hire_date": "2015-01-01",
+            "skills_map": json.dumps({"SK_LEAD": 5, "SK_COMM": 5, "SK_TEAM": 4, "SK_PY": 5}),
+            # Double-encoded, as some seeded rows are
+            "courses_enrolled_map": json.dumps(json.dumps(
+                {"C1": "completed", "C2": "completed", "C3": "completed", "C4": "in-progress"}
+            )),
+            "goals_set": json.dumps(["Become Tech Lead"]),
+        },
+        {
+            "id": "EMP_JUNIOR", "name": "Junior", "level": "Junior", "hire_date": "2024-07-01",
+            "skills_map": json.dumps({"SK_PY": 2}),
+            "courses_enrolled_map": json.dumps({}),
+            "goals_set": json.dumps(["Learn SQL"]),
+        },
+    ])
+    yield conn
+    conn.close()
+
+
+def test_scores_whole_workforce_in_one_frame(conn):
+    scores = leadership_scorer.score_frame(leadership_scorer.load_scoring_frame(conn), as_of=AS_OF)
+    by_id = scores.set_index("employee_id")
+
+    senior, junior = by_id.loc["EMP_SENIOR"], by_id.loc["EMP_JUNIOR"]
+    assert senior["years_with_company"] == pytest.approx(10.0, abs=0.02)
+    assert senior["completed_courses"] == 3
+    assert senior["label"] == "High"
+    assert junior["label"] == "Low"
+    assert junior["soft_skills_alignment"] == 0
+    for factor in ("experience", "learning_engagement", "soft_skills_alignment", "overall"):
+        assert 0 <= senior[factor] <= 10
+        assert senior[factor] > junior[factor]
+
+
+def test_predictions_are_persisted_per_model_version(conn):
+    predictions = leadership_scorer.predictions_for(conn)
+
+    assert {p["employee_id"] for p in predictions} == {"EMP_SENIOR", "EMP_JUNIOR"}
+    assert all(p["model_version"] == leadership_scorer.MODEL_VERSION for p in predictions)
+    assert set(predictions[0]["factors"]) >= {"experience", "learning_engagement", "soft_skills_alignment"}
+
+    # Rescoring replaces this version's rows instead of appending
+    leadership_scorer.predictions_for(conn, refresh=True)
+    count = conn.execute("SELECT COUNT(*) FROM leadership_potential_predictions").fetchone()[0]
+    assert count == 2
+
+    assert [p["employee_id"] for p in leadership_scorer.predictions_for(conn, ["EMP_JUNIOR"])] == ["EMP_JUNIOR"]
+
+
+def _created_at(conn):
+    return {row[0] for row in conn.execute("SELECT created_at FROM leadership_potential_predictions")}
+
+
+def test_unknown_employee_is_not_scored(conn):
+    assert leadership_scorer.predictions_for(conn, ["EMP_MISSING"], as_of=AS_OF) == []
+    assert conn.execute("SELECT COUNT(*) FROM leadership_potential_predictions").fetchone()[0] == 0
+
+
+def test_scores_are_recomputed_only_when_inputs_or_day_change(conn):
+    leadership_scorer.predictions_for(conn, as_of=AS_OF)
+    first = _created_at(conn)
+    assert not leadership_scorer.is_stale(conn, AS_OF)
+    leadership_scorer.predictions_for(conn, ["EMP_JUNIOR"], as_of=AS_OF)
+    assert _created_at(conn) == first
+
+    conn.execute("INSERT INTO employee_skills (employee_id, skill_id, proficiency) VALUES ('EMP_JUNIOR', 'SK_LEAD', 4)")
+    assert leadership_scorer.is_stale(conn, AS_OF)
+    junior = leadership_scorer.predictions_for(conn, ["EMP_JUNIOR"], as_of=AS_OF)[0]
+    assert junior["factors"]["soft_skills_alignment"] > 0
+
+    assert leadership_scorer.is_stale(conn, datetime(2025, 1, 2))
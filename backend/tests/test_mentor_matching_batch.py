@@ -0,0 +1,109 @@
+"""Query-count tests for batch hydration in the mentoring service."""
+import json
+import sqlite3
+
+import pytest
+
+from app.core.db import init_db
+from app.data.repositories import base
+from app.data.repositories.employee import EmployeeRepository
+from app.services.mentor_match_request_service import MentorMatchingService
+
+
+def _seed(conn: sqlite3.Connection, headcount: int) -> None:
+    cur = conn.cursor()
+    cur.execute("INSERT INTO departments (id, name) VALUES ('DEPT001', 'Engineering')")
+    cur.executemany(
+        "INSERT INTO skills (id, name, category) VALUES (?, ?, 'Tech')",
+        [("SKILL001", "Python"), ("SKILL002", "Cloud Architecture")],
+    )
+    cur.executemany(
+        """
+        INSERT INTO employees (
+            id, name, role, department_id, level, position_level, hire_date, skills_map
+        ) VALUES (?, ?, 'Engineer', 'DEPT001', 'Senior', ?, '2020-01-01', ?)
+        """,
+        [
+            (
+                f"EMP{i:05d}",
+                f"Employee {i}",
+                1 + i % 5,
+                json.dumps({"SKILL001": 3, "SKILL002": 2} if i % 2 else {"SKILL001": 4}),
+            )
+            for i in range(headcount)
+        ],
+    )
+    cur.executemany(
+        """
+        INSERT INTO mentorship_profiles (
+            employee_id, is_mentor, capacity, mentees_count, rating, personality
+        ) VALUES (?, 1, 3, 0, 4.5, '')
+        """,
+        [(f"EMP{i:05d}",) for i in range(headcount)],
+    )
+    conn.commit()
+
+
+def _count_selects(conn: sqlite3.Connection, fn) -> int:
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        fn()
+    finally:
+        conn.set_trace_callback(None)
+    return sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+
+
+@pytest.fixture
+def make_service():
+    def _make(headcount: int) -> MentorMatchingService:
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        init_db(conn)
+        _seed(conn, headcount)
+        return MentorMatchingService(conn)
+
+    return _make
+
+
+def test_list_mentors_query_count_is_independent_of_headcount(make_service) -> None:
+    small = make_service(5)
+    large = make_service(60)
+
+    small_count = _count_selects(small.conn, lambda: small.list_mentors(skill_area="Cloud"))
+    large_count = _count_selects(large.conn, lambda: large.list_mentors(skill_area="Cloud"))
+
+    assert small_count == large_count
+    mentors = large.list_mentors(skill_area="Cloud")
+    assert len(mentors) == 30
+    assert mentors[0]["department"] == "Engineering"
+    assert set(mentors[0]["expertiseAreas"]) == {"Python", "Cloud Architecture"}
+
+
+def test_list_requests_batches_profile_lookups(make_service) -> None:
+    service = make_service(40)
+    for mentee in range(0, 40, 5):
+        service.request_repo.create_request(
+            {"mentee_id": f"EMP{mentee:05d}", "mentor_id": "EMP00004", "status": "pending"}
+        )
+
+    count = _count_selects(service.conn, lambda: service.list_requests(mentor_id="EMP00004"))
+    requests = service.list_requests(mentor_id="EMP00004")
+
+    assert len(requests) == 8
+    assert requests[0]["mentorName"] == "Employee 4"
+    # Alias resolution plus one request query and one batched profile query
+    assert count <= 4
+
+
+def test_get_many_chunks_large_id_lists(make_service, monkeypatch) -> None:
+    service = make_service(12)
+    monkeypatch.setattr(base, "MAX_IN_PARAMS", 5)
+    repo = EmployeeRepository(service.conn)
+    ids = [f"EMP{i:05d}" for i in range(12)] + ["MISSING", "EMP00000"]
+
+    count = _count_selects(service.conn, lambda: repo.get_employee_profiles(ids))
+    profiles = repo.get_employee_profiles(ids)
+
+    assert count == 3
+    assert set(profiles) == {f"EMP{i:05d}" for i in range(12)}
@@ -0,0 +1,79 @@
+import json
+
+from app.agent.course_recommendation_agent.structured import (
+    CareerPathwayPayload,
+    LeadershipEmployeePayload,
+    run_single_pass,
+)
+
+STAGE = {"duration": "0-6 months", "focus": ["python"], "suggested_actions": ["course"], "expected_outcomes": "x"}
+PATHWAY = {
+    "analysis": "Solid base",
+    "career_pathway": {"short_term": STAGE, "mid_term": STAGE, "long_term": STAGE},
+    "role_transition": "Lead Engineer",
+}
+
+
+def _never_called(prompt):
+    raise AssertionError("no repair expected")
+
+
+def test_valid_envelope_needs_no_repair():
+    output = "Here you go:\n" + json.dumps({"payload": PATHWAY, "summary": "Keep going!"})
+
+    result, repairs = run_single_pass(output, CareerPathwayPayload, _never_called, lambda parsed: "")
+
+    assert repairs == 0
+    assert result == {"json": PATHWAY, "text_summary": "Keep going!"}
+
+
+def test_missing_summary_only_regenerates_summary():
+    prompts = []
+
+    def invoke(prompt):
+        prompts.append(prompt)
+        return "  A generated summary. "
+
+    output = json.dumps({"payload": PATHWAY, "summary": ""})
+    result, repairs = run_single_pass(output, CareerPathwayPayload, invoke, lambda parsed: "SUMMARY:" + parsed["analysis"])
+
+    assert repairs == 1
+    assert prompts == ["SUMMARY:Solid base"]
+    assert result["json"] == PATHWAY
+    assert result["text_summary"] == "A generated summary."
+
+
+def test_invalid_payload_is_repaired_and_summary_kept():
+    bad = {
+        "leadership_analysis": "Strong communicator",
+        "leadership_score": {
+            "experience_weight": 7,
+            "learning_engagement_weight": 6,
+            "soft_skills_alignment_weight": 8,
+            "overall_score": 14,
+        },
+        "potential_level": "High",
+        "recommendations": ["Lead a project"],
+    }
+    fixed = json.loads(json.dumps(bad))
+    fixed["leadership_score"]["overall_score"] = 7
+    prompts = []
+
+    def invoke(prompt):
+        prompts.append(prompt)
+        return json.dumps(fixed)
+
+    output = json.dumps({"payload": bad, "summary": "You are ready to lead."})
+    result, repairs = run_single_pass(output, LeadershipEmployeePayload, invoke, lambda parsed: "")
+
+    assert repairs == 1
+    assert "leadership_score.overall_score" in prompts[0]
+    assert result["json"]["leadership_score"]["overall_score"] == 7
+    assert result["text_summary"] == "You are ready to lead."
+
+
+def test_unparseable_output_is_returned_raw():
+    result, repairs = run_single_pass("not json at all", CareerPathwayPayload, _never_called, lambda parsed: "")
+
+    assert repairs == 0
+    assert result == {"raw_output": "not json at all"}